@@ -0,0 +1,121 @@
+"""
+Async-вариант API (settings.ASYNC_DB).
+
+Обработчики из app/api/routes остаются единственным источником логики:
+каждый из них оборачивается в async-эндпоинт, который получает AsyncSession
+и выполняет тело через AsyncSession.run_sync. Запросы к БД идут через async-драйвер
+(aiosqlite/asyncpg) прямо в event loop, без threadpool Starlette, поэтому
+параллелизм ограничивается пулом соединений, а не числом потоков.
+"""
+
+import functools
+import inspect
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import (
+    cached_principal,
+    credentials_exception,
+    get_current_active_user,
+    get_current_user,
+    inactive_user_exception,
+    oauth2_scheme,
+    remember_principal,
+    token_claims,
+)
+from app.db.async_session import get_async_db
+from app.db.session import get_db
+from app.models.user import User
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme),
+) -> User:
+    user_id, active = token_claims(token)
+    if active is False:
+        raise inactive_user_exception()
+
+    user = cached_principal(user_id)
+    if user is not None:
+        return user
+
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar()
+    if not user:
+        raise credentials_exception()
+    remember_principal(user)
+    return user
+
+
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    if not current_user.is_active:
+        raise inactive_user_exception()
+    return current_user
+
+
+def _db_param(endpoint) -> str | None:
+    for param in inspect.signature(endpoint).parameters.values():
+        if getattr(param.default, "dependency", None) is get_db:
+            return param.name
+    return None
+
+
+def run_in_async_session(endpoint):
+    """
+    Превращает sync-обработчик с `db: Session = Depends(get_db)` в async-эндпоинт
+    с тем же контрактом. Тело выполняется в greenlet поверх async-соединения;
+    тот же Session видят и зависимости (current_user загружен в него же).
+    Обработчики с keep_sync (потоковые ответы) остаются как есть.
+    """
+    name = _db_param(endpoint)
+    if name is None or getattr(endpoint, "keep_sync", False):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(**kwargs):
+        db: AsyncSession = kwargs.pop(name)
+        return await db.run_sync(lambda session: endpoint(**kwargs, **{name: session}))
+
+    signature = inspect.signature(endpoint)
+    wrapper.__signature__ = signature.replace(
+        parameters=[
+            p.replace(default=Depends(get_async_db)) if p.name == name else p
+            for p in signature.parameters.values()
+        ]
+    )
+    return wrapper
+
+
+def build_async_router(router: APIRouter) -> APIRouter:
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            async_router.routes.append(route)
+            continue
+        async_router.add_api_route(
+            route.path,
+            run_in_async_session(route.endpoint),
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            name=route.name,
+            response_class=route.response_class,
+        )
+    return async_router
+
+
+def install_async_api(app: FastAPI, router: APIRouter, prefix: str) -> None:
+    app.include_router(build_async_router(router), prefix=prefix)
+    app.dependency_overrides[get_current_user] = get_current_user_async
+    app.dependency_overrides[get_current_active_user] = get_current_active_user_async
@@ -0,0 +1,117 @@
+"""
+Условные GET: слабый ETag и Last-Modified по max(updated_at), числу строк
+и сумме id выборки.
+
+Валидатор считается лёгким агрегатным запросом до загрузки строк; если он
+совпал с If-None-Match (или, когда его нет, с If-Modified-Since), обработчик
+сразу отвечает 304 без чтения и сериализации данных.
+If-Modified-Since не видит удалений (max(updated_at) от них не растёт),
+поэтому клиентам лучше опираться на ETag.
+"""
+
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, NamedTuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+# Клиент может хранить ответ, но обязан перепроверять его при каждом запросе
+CACHE_CONTROL = "private, no-cache"
+
+
+class Validator(NamedTuple):
+    etag: str
+    last_modified: datetime | None
+
+
+def make_validator(*parts: Any) -> Validator:
+    """
+    parts — всё, от чего зависит ответ;
+    максимальный datetime среди них становится Last-Modified.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    stamps = [part for part in parts if isinstance(part, datetime)]
+    return Validator(f'W/"{digest}"', max(stamps) if stamps else None)
+
+
+def fingerprint(db: Session, rows) -> tuple:
+    """
+    (count, max(updated_at), sum(id)) по выборке rows — Select или Query
+    с колонками id и updated_at (с теми же фильтрами и limit, что и ответ).
+    """
+    subquery = rows.subquery()
+    return tuple(
+        db.execute(
+            select(
+                func.count(),
+                func.max(subquery.c.updated_at),
+                func.sum(subquery.c.id),
+            )
+        ).one()
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    # updated_at хранится как naive UTC
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Слабое сравнение: префикс W/ не учитывается
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime | None) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = _as_utc(parsedate_to_datetime(header))
+    except (TypeError, ValueError):
+        return False
+    # В HTTP-дате нет долей секунды
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def validator_headers(validator: Validator) -> dict[str, str]:
+    headers = {"ETag": validator.etag, "Cache-Control": CACHE_CONTROL}
+    if validator.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            _as_utc(validator.last_modified), usegmt=True
+        )
+    return headers
+
+
+def not_modified(request: Request, validator: Validator) -> Response | None:
+    """Ответ 304, если копия клиента актуальна, иначе None."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = etag_matches(if_none_match, validator.etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = bool(if_modified_since) and _not_modified_since(
+            if_modified_since, validator.last_modified
+        )
+    if not fresh:
+        return None
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(validator)
+    )
+
+
+def conditional(
+    request: Request, response: Response, validator: Validator
+) -> Response | None:
+    """
+    Для обработчиков с response_model: 304 или None; во втором случае
+    заголовки валидатора уже добавлены в response.
+    """
+    cached = not_modified(request, validator)
+    if cached is None:
+        response.headers.update(validator_headers(validator))
+    return cached
@@ -1,35 +1,92 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import decode_access_token
 from app.db.session import get_db
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
+# Снимки пользователей, уже проверенных по БД: user_id -> значения колонок.
+# Хэш пароля в кэш не попадает.
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+_PRINCIPAL_FIELDS = ("id", "email", "full_name", "is_active", "created_at")
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme),
-) -> User:
-    credentials_exception = HTTPException(
+
+def remember_principal(user: User) -> None:
+    principal_cache.set(user.id, {f: getattr(user, f) for f in _PRINCIPAL_FIELDS})
+
+
+def cached_principal(user_id: int) -> User | None:
+    """
+    User из кэша в состоянии detached: годится для чтения полей
+    (current_user.id и т.п.), запросов в БД не делает.
+    """
+    values = principal_cache.get(user_id)
+    if values is None:
+        return None
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target: User) -> None:
+    # В т.ч. деактивация: следующий запрос пойдёт в БД
+    principal_cache.pop(target.id)
+
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def inactive_user_exception() -> HTTPException:
+    return HTTPException(status_code=400, detail="Inactive user")
+
+
+def token_claims(token: str) -> tuple[int, bool | None]:
+    """
+    Возвращает (user_id, active) из токена. active = None для токенов,
+    выданных без этого claim.
+    """
     try:
         payload = decode_access_token(token)
         sub: str | None = payload.get("sub")
         if sub is None:
-            raise credentials_exception
-        user_id = int(sub)
+            raise credentials_exception()
+        return int(sub), payload.get("active")
     except Exception:
-        raise credentials_exception
+        raise credentials_exception()
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+) -> User:
+    user_id, active = token_claims(token)
+    if active is False:
+        raise inactive_user_exception()
+
+    user = cached_principal(user_id)
+    if user is not None:
+        return user
 
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
-        raise credentials_exception
+        raise credentials_exception()
+    remember_principal(user)
     return user
 
 
@@ -37,5 +94,5 @@ def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
     if not current_user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
+        raise inactive_user_exception()
     return current_user
@@ -0,0 +1,229 @@
+"""
+Потоковый разбор файлов экспорта (см. export_roadmap / export_all_roadmaps)
+для POST /roadmaps/import.
+
+Файл читается порциями, наружу отдаются записи ImportRecord по одной —
+ни весь файл, ни список milestones в памяти не собирается.
+Поддерживаются JSON, CSV и NDJSON (в т.ч. gzip, как у /roadmaps/export).
+"""
+
+import csv
+import gzip
+import io
+import itertools
+import json
+from collections.abc import Iterator
+from typing import IO, Any, NamedTuple
+
+from app.api.streaming import EXPORT_CSV_HEADER
+
+ROADMAP = "roadmap"
+MILESTONE = "milestone"
+
+_READ_SIZE = 64 * 1024
+# Предел размера одного значения JSON (roadmap, milestone) и строки NDJSON:
+# дальше файл не дочитывается, чтобы битое значение не буферизовало весь
+# остаток загрузки
+_MAX_VALUE_SIZE = 1024 * 1024
+_WHITESPACE = " \t\r\n"
+
+_FORMAT_SUFFIXES = {
+    ".json": "json",
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".ndjson.gz": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+
+class ImportFormatError(ValueError):
+    def __init__(self, message: str, position: str):
+        super().__init__(message)
+        self.position = position
+
+
+class ImportRecord(NamedTuple):
+    kind: str
+    # id roadmap в исходной системе: по нему milestones привязываются к roadmap
+    roadmap_key: Any
+    data: dict
+    position: str
+
+
+def detect_format(filename: str | None) -> str | None:
+    name = (filename or "").lower()
+    for suffix, fmt in sorted(_FORMAT_SUFFIXES.items(), key=lambda x: -len(x[0])):
+        if name.endswith(suffix):
+            return fmt
+    return None
+
+
+def _open_text(raw: IO[bytes]) -> IO[str]:
+    # gzip распознаём по сигнатуре, а не по имени файла
+    head = raw.read(2)
+    raw.seek(0)
+    if head == b"\x1f\x8b":
+        raw = gzip.GzipFile(fileobj=raw, mode="rb")
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+
+class _JsonReader:
+    """
+    Минимальный потоковый JSON-ридер: значения разбираются raw_decode
+    из скользящего буфера, который дочитывается по мере необходимости,
+    но не больше чем на _MAX_VALUE_SIZE символов на значение.
+    """
+
+    def __init__(self, stream: IO[str]):
+        self._stream = stream
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        chunk = self._stream.read(_READ_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str | None:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return None
+
+    def expect(self, char: str, position: str) -> None:
+        if self.peek() != char:
+            raise ImportFormatError(f"Expected '{char}'", position)
+        self._pos += 1
+
+    def _fill_value(self, position: str) -> bool:
+        if len(self._buf) - self._pos > _MAX_VALUE_SIZE:
+            raise ImportFormatError("JSON value is too large", position)
+        return not self._eof and self._fill()
+
+    def value(self, position: str) -> Any:
+        while True:
+            self.peek()
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill_value(position):
+                    raise ImportFormatError("Invalid JSON", position)
+                continue
+            # число у границы буфера может быть обрезано
+            if end == len(self._buf) and self._fill_value(position):
+                continue
+            self._pos = end
+            return value
+
+
+def iter_json(stream: IO[str]) -> Iterator[ImportRecord]:
+    """{"roadmap": {...}, "milestones": [...]}; roadmap должен идти первым."""
+    reader = _JsonReader(stream)
+    reader.expect("{", "document")
+    roadmap_key = None
+    roadmap_seen = False
+    while reader.peek() != "}":
+        key = reader.value("document")
+        reader.expect(":", "document")
+        if key == "roadmap":
+            data = reader.value("roadmap")
+            if not isinstance(data, dict):
+                raise ImportFormatError("roadmap must be an object", "roadmap")
+            roadmap_key, roadmap_seen = data.get("id"), True
+            yield ImportRecord(ROADMAP, roadmap_key, data, "roadmap")
+        elif key == "milestones":
+            if not roadmap_seen:
+                raise ImportFormatError("roadmap must precede milestones", "milestones")
+            reader.expect("[", "milestones")
+            index = 0
+            while reader.peek() != "]":
+                position = f"milestones[{index}]"
+                data = reader.value(position)
+                if not isinstance(data, dict):
+                    raise ImportFormatError("milestone must be an object", position)
+                yield ImportRecord(MILESTONE, roadmap_key, data, position)
+                index += 1
+                if reader.peek() == ",":
+                    reader.expect(",", position)
+                elif reader.peek() != "]":
+                    raise ImportFormatError("Expected ',' or ']'", position)
+            reader.expect("]", "milestones")
+        else:
+            reader.value(str(key))
+        if reader.peek() == ",":
+            reader.expect(",", "document")
+        elif reader.peek() != "}":
+            raise ImportFormatError("Expected ',' or '}'", "document")
+
+
+def iter_ndjson(stream: IO[str]) -> Iterator[ImportRecord]:
+    roadmap_key = None
+    for line_no in itertools.count(1):
+        # readline с пределом: огромная строка не читается в память целиком
+        line = stream.readline(_MAX_VALUE_SIZE + 1)
+        if not line:
+            return
+        position = f"line {line_no}"
+        if len(line) > _MAX_VALUE_SIZE and not line.endswith("\n"):
+            raise ImportFormatError("Line is too large", position)
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            raise ImportFormatError("Invalid JSON", position)
+        kind = data.get("type") if isinstance(data, dict) else None
+        if kind == ROADMAP:
+            roadmap_key = data.get("id")
+            yield ImportRecord(ROADMAP, roadmap_key, data, position)
+        elif kind == MILESTONE:
+            yield ImportRecord(
+                MILESTONE, data.get("roadmap_id", roadmap_key), data, position
+            )
+        else:
+            raise ImportFormatError("Unknown record type", position)
+
+
+def iter_csv(stream: IO[str]) -> Iterator[ImportRecord]:
+    reader = csv.reader(stream)
+    if next(reader, None) != EXPORT_CSV_HEADER:
+        raise ImportFormatError("Unexpected CSV header", "line 1")
+    seen_roadmaps = set()
+    for line_no, row in enumerate(reader, start=2):
+        position = f"line {line_no}"
+        if len(row) != len(EXPORT_CSV_HEADER):
+            raise ImportFormatError("Unexpected number of columns", position)
+        values = dict(zip(EXPORT_CSV_HEADER, row))
+        roadmap_key = values["roadmap_id"]
+        if roadmap_key not in seen_roadmaps:
+            seen_roadmaps.add(roadmap_key)
+            yield ImportRecord(
+                ROADMAP, roadmap_key, {"title": values["roadmap_title"]}, position
+            )
+        yield ImportRecord(
+            MILESTONE,
+            roadmap_key,
+            {
+                "title": values["milestone_title"],
+                "due_at": values["due_at"],
+                "status": values["status"],
+                "sort_order": values["sort_order"],
+            },
+            position,
+        )
+
+
+_PARSERS = {"json": iter_json, "csv": iter_csv, "ndjson": iter_ndjson}
+
+
+def iter_records(fmt: str, raw: IO[bytes]) -> Iterator[ImportRecord]:
+    return _PARSERS[fmt](_open_text(raw))
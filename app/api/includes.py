@@ -0,0 +1,193 @@
+"""
+Встраивание связанных данных в ответы roadmaps: ?include=milestones,stats.
+
+Число запросов не зависит от размера страницы. stats (счётчики по статусам,
+просроченные, ближайший дедлайн) — агрегат GROUP BY roadmap_id, присоединённый
+к самой выборке страницы: отдельного запроса нет. milestones — один пакетный
+запрос по id страницы, не больше milestones_limit на roadmap (первые по
+sort_order, id — оконная функция row_number); полный счёт — в stats.
+"""
+
+import dataclasses
+from collections.abc import Iterable
+from datetime import date
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.orm import Session
+
+from app.api.projections import (
+    MILESTONE_VIEW_COLUMNS,
+    ROADMAP_VIEW_COLUMNS,
+    MilestoneView,
+    RoadmapView,
+)
+from app.models.milestone import Milestone, MilestoneStatus, is_overdue
+from app.models.roadmap import Roadmap
+
+INCLUDE_MILESTONES = "milestones"
+INCLUDE_STATS = "stats"
+INCLUDE_OPTIONS = (INCLUDE_MILESTONES, INCLUDE_STATS)
+
+DEFAULT_EMBEDDED_MILESTONES = 20
+MAX_EMBEDDED_MILESTONES = 100
+
+# Незавершённые: только они дают next_due_at
+OPEN_STATUSES = (MilestoneStatus.PLANNED, MilestoneStatus.IN_PROGRESS)
+_STATS_COLUMNS = (
+    "total_milestones",
+    *(s.value for s in MilestoneStatus),
+    "overdue_milestones",
+    "next_due_at",
+)
+
+
+def parse_include(include: str | None) -> frozenset[str]:
+    """'milestones,stats' -> {'milestones', 'stats'}; неизвестное — 422."""
+    if not include:
+        return frozenset()
+    wanted = frozenset(part.strip() for part in include.split(",") if part.strip())
+    unknown = wanted.difference(INCLUDE_OPTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}; "
+            f"allowed: {', '.join(INCLUDE_OPTIONS)}",
+        )
+    return wanted
+
+
+def milestone_rows(roadmap_ids):
+    """id и updated_at milestones для fingerprint ответа со включениями."""
+    return select(Milestone.id, Milestone.updated_at).where(
+        Milestone.roadmap_id.in_(roadmap_ids)
+    )
+
+
+def embedded_milestones(
+    db: Session, roadmap_ids: list[int], limit: int
+) -> dict[int, list[MilestoneView]]:
+    position = (
+        func.row_number()
+        .over(
+            partition_by=Milestone.roadmap_id,
+            order_by=(Milestone.sort_order, Milestone.id),
+        )
+        .label("position")
+    )
+    ranked = (
+        select(*MILESTONE_VIEW_COLUMNS, position)
+        .where(Milestone.roadmap_id.in_(roadmap_ids))
+        .subquery()
+    )
+    rows = db.execute(
+        select(*(ranked.c[column.key] for column in MILESTONE_VIEW_COLUMNS))
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.roadmap_id, ranked.c.position)
+    )
+    milestones: dict[int, list[MilestoneView]] = {id_: [] for id_ in roadmap_ids}
+    for row in rows:
+        view = MilestoneView.from_row(row)
+        milestones[view.roadmap_id].append(view)
+    return milestones
+
+
+def _stats_subquery(roadmap_ids, today: date):
+    """
+    Сводка milestones по roadmap одним GROUP BY: счётчики по статусам,
+    просроченные (как в /stats) и ближайший дедлайн среди незавершённых.
+    """
+    is_open = Milestone.status.in_(OPEN_STATUSES)
+    return (
+        select(
+            Milestone.roadmap_id,
+            func.count().label("total_milestones"),
+            *(
+                func.count(case((Milestone.status == s, 1))).label(s.value)
+                for s in MilestoneStatus
+            ),
+            func.count(case((is_overdue(today), 1))).label("overdue_milestones"),
+            func.min(
+                case((is_open & (Milestone.due_at >= today), Milestone.due_at))
+            ).label("next_due_at"),
+        )
+        .where(Milestone.roadmap_id.in_(roadmap_ids))
+        .group_by(Milestone.roadmap_id)
+        .subquery("milestone_stats")
+    )
+
+
+def select_roadmaps(stmt: Select, include, roadmap_ids, today: date) -> Select:
+    """
+    stmt — выборка ROADMAP_VIEW_COLUMNS (с фильтрами, порядком и limit).
+    С include=stats к каждой строке присоединяется сводка её milestones —
+    тем же запросом; roadmap_ids — id строк stmt (список или подзапрос).
+    """
+    if INCLUDE_STATS not in include:
+        return stmt
+    stats = _stats_subquery(roadmap_ids, today)
+    return stmt.outerjoin(stats, stats.c.roadmap_id == Roadmap.id).add_columns(
+        *(stats.c[name] for name in _STATS_COLUMNS)
+    )
+
+
+def _stats_from_row(values) -> dict:
+    total, *by_status, overdue, next_due_at = values
+    # Roadmap без milestones: в outer join все колонки NULL
+    return {
+        "total_milestones": total or 0,
+        "milestones_by_status": {
+            s.value: count or 0 for s, count in zip(MilestoneStatus, by_status)
+        },
+        "overdue_milestones": overdue or 0,
+        "next_due_at": next_due_at,
+    }
+
+
+def read_roadmaps(db: Session, stmt: Select) -> tuple[list[RoadmapView], dict]:
+    """Строки select_roadmaps -> DTO и {roadmap_id: stats} (если stats запрошены)."""
+    width = len(ROADMAP_VIEW_COLUMNS)
+    roadmaps, stats = [], {}
+    for row in db.execute(stmt):
+        roadmap = RoadmapView.from_row(row[:width])
+        roadmaps.append(roadmap)
+        if len(row) > width:
+            stats[roadmap.id] = _stats_from_row(row[width:])
+    return roadmaps, stats
+
+
+def _fields(view) -> dict:
+    return {f.name: getattr(view, f.name) for f in dataclasses.fields(view)}
+
+
+def expand_roadmaps(
+    db: Session,
+    roadmaps: Iterable,
+    include: frozenset[str],
+    milestones_limit: int = DEFAULT_EMBEDDED_MILESTONES,
+    stats: dict | None = None,
+) -> list:
+    """
+    RoadmapView -> dict с ключами включений; без include — те же DTO.
+    Ключи добавляются только запрошенные, остальной ответ не меняется.
+    stats — из read_roadmaps (сводка уже прочитана вместе со страницей).
+    """
+    roadmaps = list(roadmaps)
+    if not include or not roadmaps:
+        return roadmaps
+    ids = [roadmap.id for roadmap in roadmaps]
+    milestones = (
+        embedded_milestones(db, ids, milestones_limit)
+        if INCLUDE_MILESTONES in include
+        else None
+    )
+
+    expanded = []
+    for roadmap in roadmaps:
+        item = _fields(roadmap)
+        if milestones is not None:
+            item[INCLUDE_MILESTONES] = milestones[roadmap.id]
+        if INCLUDE_STATS in include:
+            item[INCLUDE_STATS] = stats[roadmap.id]
+        expanded.append(item)
+    return expanded
@@ -0,0 +1,254 @@
+"""
+HTTP- и SQL-метрики для GET /metrics (текстовый формат Prometheus).
+
+MetricsMiddleware замеряет каждый запрос: гистограмма латентности по
+(method, route), счётчик ответов по статусам и число запросов в работе.
+route — шаблон пути (/roadmaps/{roadmap_id}), а не сам путь, чтобы число
+рядов не росло с числом id. SQL-запросы замеряются событиями Engine
+(все движки, включая реплики и async) и относятся к маршруту текущего
+HTTP-запроса через contextvar; вне запроса — к route="<background>".
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.api.response_cache import cache_metrics
+from app.core.metrics import DEFAULT_BUCKETS, histogram_samples, registry
+from app.db.pool import pool_snapshot
+from app.db.session import engine, replicas
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"
+BACKGROUND_ROUTE = "<background>"
+
+DURATION_BUCKETS = DEFAULT_BUCKETS
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+db_statement_seconds = registry.histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time by HTTP route.",
+    ("route",),
+    buckets=SQL_BUCKETS,
+)
+
+
+class _RouteStats:
+    __slots__ = ("durations", "statements", "statuses")
+
+    def __init__(self):
+        # Счётчики по корзинам (+Inf последней) и сумма — как в Histogram
+        self.durations = [0] * (len(DURATION_BUCKETS) + 1) + [0.0]
+        self.statements = [0] * (len(STATEMENT_BUCKETS) + 1) + [0]
+        self.statuses: dict[int, int] = {}
+
+
+class HttpMetrics:
+    """
+    Всё, что middleware пишет за запрос, под одной блокировкой: латентность,
+    статус и число SQL-запросов по (method, route), запросы в работе.
+    Отдельные Counter/Histogram стоили бы по блокировке на каждую метрику.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], _RouteStats] = {}
+        self._in_flight: dict[str, int] = {}
+
+    def started(self, method: str) -> None:
+        with self._lock:
+            self._in_flight[method] = self._in_flight.get(method, 0) + 1
+
+    def finished(
+        self, method: str, route: str, status: int, seconds: float, statements: int
+    ) -> None:
+        duration_index = bisect.bisect_left(DURATION_BUCKETS, seconds)
+        statements_index = bisect.bisect_left(STATEMENT_BUCKETS, statements)
+        with self._lock:
+            self._in_flight[method] -= 1
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = _RouteStats()
+            stats.durations[duration_index] += 1
+            stats.durations[-1] += seconds
+            stats.statements[statements_index] += 1
+            stats.statements[-1] += statements
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._in_flight = {method: n for method, n in self._in_flight.items() if n}
+
+    def collect(self):
+        with self._lock:
+            in_flight = dict(self._in_flight)
+            routes = [
+                (key, list(st.durations), list(st.statements), dict(st.statuses))
+                for key, st in self._routes.items()
+            ]
+        yield (
+            "http_requests_in_flight",
+            "gauge",
+            "HTTP requests being processed.",
+            [
+                ("http_requests_in_flight", {"method": method}, n)
+                for method, n in in_flight.items()
+            ],
+        )
+        durations, responses, statements = [], [], []
+        for (method, route), route_durations, route_statements, statuses in routes:
+            labels = {"method": method, "route": route}
+            durations += histogram_samples(
+                "http_request_duration_seconds",
+                labels,
+                DURATION_BUCKETS,
+                route_durations,
+            )
+            statements += histogram_samples(
+                "db_statements_per_request",
+                labels,
+                STATEMENT_BUCKETS,
+                route_statements,
+            )
+            responses += [
+                ("http_responses_total", {**labels, "status": str(code)}, n)
+                for code, n in statuses.items()
+            ]
+        yield (
+            "http_request_duration_seconds",
+            "histogram",
+            "HTTP request latency until the response body is sent.",
+            durations,
+        )
+        yield "http_responses", "counter", "HTTP responses by status code.", responses
+        yield (
+            "db_statements_per_request",
+            "histogram",
+            "SQL statements issued while handling one HTTP request.",
+            statements,
+        )
+
+
+http_metrics = HttpMetrics()
+
+
+class _RequestState:
+    __slots__ = ("scope", "statements")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = 0
+
+
+_current_request: ContextVar[_RequestState | None] = ContextVar(
+    "metrics_request", default=None
+)
+
+
+def route_label(scope) -> str:
+    # scope["route"] выставляет роутинг FastAPI (и кэш ответов на попадании)
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        state = _RequestState(scope)
+        token = _current_request.set(state)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_metrics.started(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_metrics.finished(
+                method,
+                route_label(scope),
+                status_code,
+                time.perf_counter() - started,
+                state.statements,
+            )
+            _current_request.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    conn.info["metrics_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _observe_statement(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("metrics_started", None)
+    if started is None:
+        return
+    state = _current_request.get()
+    if state is None:
+        route = BACKGROUND_ROUTE
+    else:
+        state.statements += 1
+        route = route_label(state.scope)
+    db_statement_seconds.observe(time.perf_counter() - started, route)
+
+
+def _pool_samples():
+    engines = [("primary", engine)] + [
+        (f"replica{i}", replica) for i, replica in enumerate(replicas.engines)
+    ]
+    snapshots = [({"engine": name}, pool_snapshot(e)) for name, e in engines]
+    for field, kind, documentation in (
+        ("checked_out", "gauge", "Connections currently checked out of the pool."),
+        ("overflow", "gauge", "Connections opened above pool_size."),
+    ):
+        name = f"db_pool_{field}"
+        samples = [
+            (name, labels, snapshot[field])
+            for labels, snapshot in snapshots
+            if field in snapshot
+        ]
+        yield name, kind, documentation, samples
+    timeouts = [
+        ("db_pool_timeouts_total", labels, snapshot["wait"]["rejected"])
+        for labels, snapshot in snapshots
+        if "wait" in snapshot
+    ]
+    yield (
+        "db_pool_timeouts_total",
+        "counter",
+        "Checkouts that timed out waiting for a connection.",
+        timeouts,
+    )
+
+
+def _response_cache_samples():
+    metrics = cache_metrics()
+    if not metrics["enabled"]:
+        return
+    for field in ("hits", "misses", "stores", "invalidations"):
+        name = f"response_cache_{field}_total"
+        yield name, "counter", f"Response cache {field}.", [(name, {}, metrics[field])]
+
+
+registry.add_collector(http_metrics.collect)
+registry.add_collector(_pool_samples)
+registry.add_collector(_response_cache_samples)
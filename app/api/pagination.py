@@ -0,0 +1,59 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Упаковывает ключ последней строки страницы в непрозрачную строку.
+    Даты/время сериализуются в ISO-формат.
+    """
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """
+    Распаковывает курсор, приводя элементы к ожидаемым типам.
+    Некорректный курсор -> 400.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("cursor shape mismatch")
+        values = []
+        for value, tp in zip(payload, types):
+            if tp in (date, datetime):
+                values.append(tp.fromisoformat(value))
+            elif tp is int and isinstance(value, int):
+                values.append(value)
+            else:
+                raise ValueError("unsupported cursor value")
+        return tuple(values)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def keyset_after(columns: tuple, values: tuple, descending: bool = False):
+    """
+    Условие "строго после курсора" для сортировки по (col1, col2, ...).
+    Раскрывается в OR/AND, чтобы индекс по тем же колонкам использовался
+    для seek, а не OFFSET.
+    """
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        prefix = [c == v for c, v in zip(columns[:i], values[:i])]
+        cmp = column < value if descending else column > value
+        clauses.append(and_(*prefix, cmp))
+    return or_(*clauses)
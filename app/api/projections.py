@@ -0,0 +1,87 @@
+"""
+Read-only проекции для ответов: строки читаются колонками и превращаются
+в лёгкие DTO (dataclass со slots), теги декодируются при сборке DTO.
+
+ORM-объекты при этом не создаются (или, для create/update, не меняются):
+в identity map и во flush ничего не попадает, а строковая колонка
+Roadmap.tags никогда не получает список. Поля DTO совпадают с RoadmapRead /
+MilestoneRead, так что их можно отдавать и через response_model (orm_mode).
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from app.api.utils import tags_string_to_list
+from app.models.milestone import Milestone, MilestoneStatus
+from app.models.roadmap import Roadmap
+
+
+@dataclass(slots=True, frozen=True)
+class RoadmapView:
+    title: str
+    description: str | None
+    tags: list[str]
+    id: int
+    owner_id: int
+    is_archived: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_row(cls, row) -> "RoadmapView":
+        title, description, tags, *rest = row
+        return cls(title, description, tags_string_to_list(tags), *rest)
+
+    @classmethod
+    def from_entity(cls, roadmap: Roadmap) -> "RoadmapView":
+        return cls.from_row(getattr(roadmap, c.key) for c in ROADMAP_VIEW_COLUMNS)
+
+
+@dataclass(slots=True, frozen=True)
+class MilestoneView:
+    title: str
+    description: str | None
+    due_at: date
+    status: MilestoneStatus
+    sort_order: int
+    id: int
+    roadmap_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_row(cls, row) -> "MilestoneView":
+        return cls(*row)
+
+
+# Колонки в порядке полей DTO
+ROADMAP_VIEW_COLUMNS = (
+    Roadmap.title,
+    Roadmap.description,
+    Roadmap.tags,
+    Roadmap.id,
+    Roadmap.owner_id,
+    Roadmap.is_archived,
+    Roadmap.created_at,
+    Roadmap.updated_at,
+)
+MILESTONE_VIEW_COLUMNS = (
+    Milestone.title,
+    Milestone.description,
+    Milestone.due_at,
+    Milestone.status,
+    Milestone.sort_order,
+    Milestone.id,
+    Milestone.roadmap_id,
+    Milestone.created_at,
+    Milestone.updated_at,
+)
+
+
+def roadmap_views(rows: Iterable) -> list[RoadmapView]:
+    return [RoadmapView.from_row(row) for row in rows]
+
+
+def milestone_views(rows: Iterable) -> list[MilestoneView]:
+    return [MilestoneView.from_row(row) for row in rows]
@@ -0,0 +1,130 @@
+"""
+Бюджет SQL-запросов на HTTP-запрос и поиск N+1 (QUERY_BUDGET_MODE).
+
+Обработчик объявляет бюджет декоратором query_budget(n) — сколько запросов
+к БД он делает с учётом зависимостей (загрузка пользователя и т.п.).
+Режимы:
+    off   — ничего не считается (по умолчанию);
+    log   — превышение бюджета и повторяющиеся «формы» запроса (тот же SQL
+            с другими параметрами — типичный N+1 от lazy-загрузки) пишутся
+            в лог;
+    raise — то же, но превышение бюджета сразу бросает QueryBudgetExceeded
+            из execute, так что тест такого маршрута падает (для CI).
+"""
+
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "log", "raise")
+
+# Плейсхолдеры всех драйверов: ?, :name, %(name)s, %s, $1
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+# IN (?, ?, ?) с любым числом элементов — одна форма
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def query_budget(max_queries: int):
+    """Объявляет, сколько SQL-запросов обработчик делает на один HTTP-запрос."""
+
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        return endpoint
+
+    return decorator
+
+
+def statement_shape(statement: str) -> str:
+    shape = _PLACEHOLDER.sub("?", _WHITESPACE.sub(" ", statement.strip()))
+    return _PLACEHOLDER_LIST.sub("(?...)", shape)
+
+
+class QueryTracker:
+    def __init__(self, scope, mode: str, repeat_threshold: int):
+        self.scope = scope
+        self.mode = mode
+        self.repeat_threshold = repeat_threshold
+        self.count = 0
+        self.shapes: Counter[str] = Counter()
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path_format", None) or self.scope["path"]
+
+    @property
+    def budget(self) -> int | None:
+        endpoint = getattr(self.scope.get("route"), "endpoint", None)
+        return getattr(endpoint, "query_budget", None)
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+        if self.shapes[shape] == self.repeat_threshold:
+            logger.warning(
+                "Possible N+1 in %s %s: statement repeated %d times: %s",
+                self.scope["method"],
+                self.route,
+                self.repeat_threshold,
+                shape,
+            )
+
+        budget = self.budget
+        if budget is None or self.count <= budget:
+            return
+        message = (
+            f"{self.scope['method']} {self.route} issued {self.count} SQL "
+            f"statements, budget is {budget}"
+        )
+        if self.mode == "raise":
+            raise QueryBudgetExceeded(f"{message}; last: {shape}")
+        if self.count == budget + 1:
+            logger.warning(message)
+
+
+_current_tracker: ContextVar[QueryTracker | None] = ContextVar(
+    "query_tracker", default=None
+)
+
+
+class QueryBudgetMiddleware:
+    def __init__(
+        self, app, mode: str | None = None, repeat_threshold: int | None = None
+    ):
+        self.app = app
+        self.mode = mode or settings.QUERY_BUDGET_MODE
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown QUERY_BUDGET_MODE: {self.mode}")
+        self.repeat_threshold = repeat_threshold or settings.QUERY_REPEAT_THRESHOLD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.mode == "off":
+            await self.app(scope, receive, send)
+            return
+        tracker = QueryTracker(scope, self.mode, self.repeat_threshold)
+        token = _current_tracker.set(tracker)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_tracker.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        tracker.record(statement)
@@ -0,0 +1,394 @@
+"""
+Серверный кэш готовых ответов GET (списки, статистика, экспорт) по пользователю.
+
+Ключ — user_id, путь и отсортированные query-параметры. Для каждого
+пользователя хранится «поколение» — случайный токен; запись валидна, только
+если записана при текущем поколении. Коммит, изменивший данные пользователя
+(Roadmap, Milestone, User), выдаёт новое поколение — все его записи
+становятся недействительными сразу, без перебора ключей. Запись, собранная
+во время параллельной записи, сохраняется со старым поколением и не будет
+выдана.
+
+Бэкенд (app/core/cache.py): память процесса или Redis-совместимое хранилище,
+общее для воркеров. Записи через Core (пакетные insert/update/delete) отмечают
+владельцев сами — mark_owners_changed; прочие коммиты в обход ORM кэш
+не сбрасывают, такие записи живут не дольше RESPONSE_CACHE_TTL_SECONDS.
+"""
+
+import itertools
+import json
+import os
+import threading
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import HTTPException
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Match
+
+from app.api.conditional import etag_matches
+from app.api.deps import token_claims
+from app.core.cache import MemoryBackend, RedisBackend
+from app.core.config import settings
+from app.models.milestone import Milestone
+from app.models.roadmap import Roadmap
+from app.models.user import User
+
+CACHE_HEADER = b"x-cache"
+# Заголовки ответа, которые отдаются при 304 из кэша
+_VALIDATOR_HEADERS = (b"etag", b"last-modified", b"cache-control")
+
+# Пользователи, чьи данные изменил текущий транзакционный контекст сессии
+_CHANGED_OWNERS = "response_cache_changed_owners"
+
+
+def cache_response(endpoint):
+    """Помечает GET-обработчик, ответы которого можно кэшировать."""
+    endpoint.response_cache = True
+    return endpoint
+
+
+class CacheStats:
+    _FIELDS = ("hits", "misses", "stores", "skipped_too_large", "invalidations")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self._FIELDS, 0)
+
+    def incr(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[field] += amount
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts["hits"] + counts["misses"]
+        counts["hit_ratio"] = counts["hits"] / lookups if lookups else 0.0
+        return counts
+
+
+def _new_generation() -> bytes:
+    return os.urandom(8).hex().encode()
+
+
+def _encode_entry(generation: bytes, status: int, headers: list, body: bytes) -> bytes:
+    meta = {
+        "g": generation.decode(),
+        "s": status,
+        "h": [
+            [name.decode("latin-1"), value.decode("latin-1")] for name, value in headers
+        ],
+    }
+    return json.dumps(meta).encode() + b"\n" + body
+
+
+def _decode_entry(raw: bytes) -> tuple[bytes, int, list, bytes]:
+    meta, _, body = raw.partition(b"\n")
+    meta = json.loads(meta)
+    headers = [
+        (name.encode("latin-1"), value.encode("latin-1")) for name, value in meta["h"]
+    ]
+    return meta["g"].encode(), meta["s"], headers, body
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl: float, max_body_bytes: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_body_bytes = max_body_bytes
+        self.stats = CacheStats()
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache | None":
+        kind = settings.RESPONSE_CACHE_BACKEND
+        if kind == "off" or settings.RESPONSE_CACHE_TTL_SECONDS <= 0:
+            return None
+        if kind == "memory":
+            backend = MemoryBackend(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES)
+        elif kind == "redis":
+            backend = RedisBackend.from_url(settings.RESPONSE_CACHE_URL)
+        else:
+            raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {kind}")
+        return cls(
+            backend,
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+            max_body_bytes=settings.RESPONSE_CACHE_MAX_BODY_BYTES,
+        )
+
+    @staticmethod
+    def _generation_key(user_id: int) -> str:
+        return f"gen:{user_id}"
+
+    # Поколение живёт дольше записей: его истечение лишь сбрасывает кэш пользователя
+    @property
+    def _generation_ttl(self) -> float:
+        return self.ttl * 10
+
+    def lookup(self, user_id: int, key: str) -> tuple[tuple | None, bytes | None]:
+        """
+        (entry, generation): entry = (status, headers, body) при попадании.
+        generation — с каким поколением сохранять ответ (None — не сохранять).
+        """
+        generation_key = self._generation_key(user_id)
+        generation, raw = self.backend.get_many([generation_key, key])
+        if generation is None:
+            generation = _new_generation()
+            if not self.backend.set(
+                generation_key, generation, ttl=self._generation_ttl, nx=True
+            ):
+                # Поколение только что создал другой запрос — не гадаем
+                self.stats.incr("misses")
+                return None, None
+        if raw is not None:
+            stored_generation, status, headers, body = _decode_entry(raw)
+            if stored_generation == generation:
+                self.stats.incr("hits")
+                return (status, headers, body), generation
+        self.stats.incr("misses")
+        return None, generation
+
+    def store(
+        self, key: str, generation: bytes, status: int, headers: list, body: bytes
+    ) -> None:
+        self.backend.set(
+            key, _encode_entry(generation, status, headers, body), ttl=self.ttl
+        )
+        self.stats.incr("stores")
+
+    def invalidate(self, user_ids) -> None:
+        for user_id in user_ids:
+            self.backend.set(
+                self._generation_key(user_id),
+                _new_generation(),
+                ttl=self._generation_ttl,
+            )
+            self.stats.incr("invalidations")
+
+    def clear(self) -> None:
+        clear = getattr(self.backend, "clear", None)
+        if clear is not None:
+            clear()
+
+
+response_cache = ResponseCache.from_settings()
+
+
+def cache_metrics() -> dict[str, Any]:
+    if response_cache is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "backend": type(response_cache.backend).__name__,
+        **response_cache.stats.snapshot(),
+    }
+
+
+def cache_key(user_id: int, scope) -> str:
+    query = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+    return f"resp:{user_id}:{scope['path']}?{urlencode(sorted(query))}"
+
+
+def _bearer_user_id(scope) -> int | None:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                user_id, active = token_claims(token)
+            except HTTPException:
+                return None
+            # Неактивных и невалидных пропускаем к обработчику — он ответит ошибкой
+            return None if active is False else user_id
+    return None
+
+
+def _header(scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _call(cache: ResponseCache, func, *args):
+    # Сетевой бэкенд блокирует — уводим вызов из event loop
+    if cache.backend.blocking:
+        return await run_in_threadpool(func, *args)
+    return func(*args)
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI-middleware: отдаёт ответы помеченных cache_response обработчиков
+    из кэша (X-Cache: HIT) и сохраняет ответы 200 (X-Cache: MISS).
+    Тело ответа пересылается клиенту по мере готовности и копируется,
+    пока не превысит max_body_bytes.
+    """
+
+    def __init__(self, app, cache: ResponseCache | None = None):
+        self.app = app
+        self.cache = cache
+        self._routes = None
+
+    def _match(self, scope) -> dict | None:
+        """child scope помеченного маршрута, совпавшего с запросом, или None."""
+        if self._routes is None:
+            self._routes = [
+                route
+                for route in scope["app"].routes
+                if getattr(getattr(route, "endpoint", None), "response_cache", False)
+            ]
+        for route in self._routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return child_scope
+        return None
+
+    async def __call__(self, scope, receive, send):
+        # По умолчанию — общий кэш модуля (его же сбрасывают события сессии)
+        cache = self.cache or response_cache
+        if (
+            cache is None
+            or scope["type"] != "http"
+            or scope["method"] != "GET"
+            or (child_scope := self._match(scope)) is None
+            or (user_id := _bearer_user_id(scope)) is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(user_id, scope)
+        entry, generation = await _call(cache, cache.lookup, user_id, key)
+        if entry is not None:
+            # Как после роутинга: внешние middleware (метрики) видят маршрут
+            scope.update(child_scope)
+            await self._send_cached(scope, send, *entry)
+            return
+
+        started: dict[str, Any] = {}
+        chunks: list[bytes] = []
+        size = 0
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                started.update(
+                    status=message["status"], headers=list(message["headers"])
+                )
+                message = {
+                    **message,
+                    "headers": [*message["headers"], (CACHE_HEADER, b"MISS")],
+                }
+                await send(message)
+                return
+            if message["type"] == "http.response.body" and generation is not None:
+                await collect(message)
+            await send(message)
+
+        async def collect(message):
+            nonlocal size, generation
+            if started.get("status") != 200:
+                generation = None
+                return
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > cache.max_body_bytes:
+                cache.stats.incr("skipped_too_large")
+                chunks.clear()
+                generation = None
+                return
+            chunks.append(chunk)
+            # Сохраняем до последнего чанка: после него StreamingResponse
+            # может отменить незавершённые await'ы обработчика
+            if not message.get("more_body", False):
+                await _call(
+                    cache,
+                    cache.store,
+                    key,
+                    generation,
+                    started["status"],
+                    started["headers"],
+                    b"".join(chunks),
+                )
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_cached(self, scope, send, status: int, headers: list, body: bytes):
+        etag = next((value for name, value in headers if name == b"etag"), None)
+        if_none_match = _header(scope, b"if-none-match")
+        if (
+            etag is not None
+            and if_none_match is not None
+            and etag_matches(if_none_match, etag.decode("latin-1"))
+        ):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [
+                        *(h for h in headers if h[0] in _VALIDATOR_HEADERS),
+                        (CACHE_HEADER, b"HIT"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [*headers, (CACHE_HEADER, b"HIT")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+# --- Инвалидация при коммите ------------------------------------------------
+
+
+def _changed_owner_ids(obj) -> set[int]:
+    # Только уже загруженные значения: в after_flush удалённую строку не догрузить
+    state = inspect(obj)
+    if isinstance(obj, User):
+        return {state.dict["id"]} if "id" in state.dict else set()
+    if not isinstance(obj, (Roadmap, Milestone)):
+        return set()
+    # history.sum() включает и прежнего владельца, если он сменился
+    return {
+        owner_id
+        for owner_id in state.attrs.owner_id.history.sum()
+        if owner_id is not None
+    }
+
+
+def mark_owners_changed(session: Session, owner_ids) -> None:
+    """
+    Для записей через Core (bulk insert/update/delete), которые after_flush
+    не видит: кэш этих пользователей сбросится при коммите сессии.
+    """
+    if response_cache is None:
+        return
+    session.info.setdefault(_CHANGED_OWNERS, set()).update(owner_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_owners(session, flush_context) -> None:
+    if response_cache is None:
+        return
+    # В after_flush new/dirty/deleted и история атрибутов ещё до-flush'евые
+    changed = session.info.setdefault(_CHANGED_OWNERS, set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        changed |= _changed_owner_ids(obj)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_owners(session) -> None:
+    changed = session.info.pop(_CHANGED_OWNERS, None)
+    if changed and response_cache is not None:
+        response_cache.invalidate(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_owners(session) -> None:
+    session.info.pop(_CHANGED_OWNERS, None)
@@ -1,15 +1,46 @@
-from datetime import date
-from typing import List
+import dataclasses
+from collections import Counter
+from datetime import date, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session
 
+from app.api.conditional import conditional, fingerprint, make_validator
 from app.api.deps import get_current_active_user
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+)
+from app.api.projections import (
+    MILESTONE_VIEW_COLUMNS,
+    MilestoneView,
+    milestone_views,
+)
+from app.api.query_budget import query_budget
+from app.api.response_cache import mark_owners_changed
+from app.api.serialization import FastJSONResponse, json_rows
+from app.db.base import utcnow
 from app.db.session import get_db
+from app.models import search as search_index
 from app.models.milestone import Milestone, MilestoneStatus
 from app.models.roadmap import Roadmap
 from app.models.user import User
-from app.schemas.milestone import MilestoneCreate, MilestoneRead, MilestoneUpdate
+from app.models.user_stats import bump_user_stats, milestone_deltas, status_column
+from app.schemas.milestone import (
+    MilestoneBatchDelete,
+    MilestoneBatchRequest,
+    MilestoneBatchResponse,
+    MilestoneBatchUpdateItem,
+    MilestoneCreate,
+    MilestoneRead,
+    MilestoneUpdate,
+)
 
 router = APIRouter(prefix="/milestones", tags=["milestones"])
 
@@ -34,13 +65,11 @@ def _get_owned_milestone_or_404(
     db: Session,
     current_user: User,
 ) -> Milestone:
-    # join с Roadmap для проверки владельца
     milestone = (
         db.query(Milestone)
-        .join(Roadmap, Milestone.roadmap_id == Roadmap.id)
         .filter(
             Milestone.id == milestone_id,
-            Roadmap.owner_id == current_user.id,
+            Milestone.owner_id == current_user.id,
         )
         .first()
     )
@@ -49,20 +78,81 @@ def _get_owned_milestone_or_404(
     return milestone
 
 
-@router.get("/", response_model=List[MilestoneRead])
+def _owned_roadmaps(
+    roadmap_ids: set[int],
+    db: Session,
+    current_user: User,
+) -> dict[int, Roadmap]:
+    if not roadmap_ids:
+        return {}
+    roadmaps = (
+        db.query(Roadmap)
+        .filter(Roadmap.id.in_(roadmap_ids), Roadmap.owner_id == current_user.id)
+        .all()
+    )
+    return {roadmap.id: roadmap for roadmap in roadmaps}
+
+
+def _owned_milestone_views(
+    milestone_ids: set[int],
+    db: Session,
+    current_user: User,
+) -> dict[int, tuple[MilestoneView, datetime]]:
+    # Колонками, вместе с датой создания roadmap (нужна для проверки due_at)
+    rows = db.execute(
+        select(*MILESTONE_VIEW_COLUMNS, Roadmap.created_at.label("roadmap_created_at"))
+        .join(Roadmap, Roadmap.id == Milestone.roadmap_id)
+        .where(
+            Milestone.id.in_(milestone_ids),
+            Milestone.owner_id == current_user.id,
+        )
+    )
+    return {
+        row.id: (MilestoneView.from_row(row[:-1]), row.roadmap_created_at)
+        for row in rows
+    }
+
+
+def _due_at_error(
+    due_at: date, roadmap_created_at: datetime, check_past: bool
+) -> str | None:
+    # Дедлайн не раньше даты создания roadmap и (при обновлении) не в прошлом
+    if due_at < roadmap_created_at.date():
+        return "Milestone due_at cannot be earlier than roadmap creation date"
+    if check_past and due_at < date.today():
+        return "Milestone due_at cannot be in the past"
+    return None
+
+
+def _apply_update(milestone: Milestone, milestone_in: MilestoneUpdate) -> None:
+    # Обновляем только заданные поля
+    if milestone_in.title is not None:
+        milestone.title = milestone_in.title
+    if milestone_in.description is not None:
+        milestone.description = milestone_in.description
+    if milestone_in.due_at is not None:
+        milestone.due_at = milestone_in.due_at
+    if milestone_in.status is not None:
+        milestone.status = milestone_in.status
+    if milestone_in.sort_order is not None:
+        milestone.sort_order = milestone_in.sort_order
+
+
+@router.get("/", response_model=list[MilestoneRead])
+@query_budget(3)
 def list_milestones(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     status_filter: MilestoneStatus | None = Query(None, alias="status"),
     due_before: date | None = Query(None),
     due_after: date | None = Query(None),
     roadmap_id: int | None = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
 ):
-    query = (
-        db.query(Milestone)
-        .join(Roadmap, Milestone.roadmap_id == Roadmap.id)
-        .filter(Roadmap.owner_id == current_user.id)
-    )
+    query = db.query(Milestone).filter(Milestone.owner_id == current_user.id)
 
     if status_filter is not None:
         query = query.filter(Milestone.status == status_filter)
@@ -73,8 +163,26 @@ def list_milestones(
     if roadmap_id is not None:
         query = query.filter(Milestone.roadmap_id == roadmap_id)
 
-    milestones = query.order_by(Milestone.due_at).all()
-    return milestones
+    # Keyset-пагинация по (due_at, id) вместо OFFSET
+    if cursor:
+        after = decode_cursor(cursor, date, int)
+        query = query.filter(keyset_after((Milestone.due_at, Milestone.id), after))
+
+    page = query.order_by(Milestone.due_at, Milestone.id).limit(limit + 1)
+    # 304 по агрегату страницы — до загрузки и сериализации строк
+    rows = page.with_entities(Milestone.id, Milestone.updated_at)
+    validator = make_validator(current_user.id, *fingerprint(db, rows))
+    cached = conditional(request, response, validator)
+    if cached is not None:
+        return cached
+
+    # Колонки вместо ORM-объектов: без identity map и повторной валидации
+    milestones = milestone_views(page.with_entities(*MILESTONE_VIEW_COLUMNS))
+    if len(milestones) > limit:
+        milestones = milestones[:limit]
+        last = milestones[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.due_at, last.id)
+    return json_rows(milestones, response.headers)
 
 
 @router.post("/", response_model=MilestoneRead, status_code=status.HTTP_201_CREATED)
@@ -86,11 +194,9 @@ def create_milestone(
     roadmap = _ensure_roadmap_owned(milestone_in.roadmap_id, db, current_user)
 
     # Дополнительная валидация: дедлайн не раньше даты создания roadmap
-    if milestone_in.due_at < roadmap.created_at.date():
-        raise HTTPException(
-            status_code=400,
-            detail="Milestone due_at cannot be earlier than roadmap creation date",
-        )
+    error = _due_at_error(milestone_in.due_at, roadmap.created_at, check_past=False)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
 
     milestone = Milestone(
         title=milestone_in.title,
@@ -99,6 +205,7 @@ def create_milestone(
         status=milestone_in.status,
         sort_order=milestone_in.sort_order,
         roadmap_id=milestone_in.roadmap_id,
+        owner_id=roadmap.owner_id,
     )
     db.add(milestone)
     db.commit()
@@ -106,12 +213,231 @@ def create_milestone(
     return milestone
 
 
+def _result(
+    index: int,
+    status: int,
+    id: int | None = None,
+    milestone: MilestoneView | None = None,
+    error=None,
+) -> dict:
+    # Поля MilestoneBatchItemResult; milestone — DTO только что записанной строки
+    return {
+        "index": index,
+        "status": status,
+        "id": id,
+        "milestone": milestone,
+        "error": error,
+    }
+
+
+def _batch_response(results: list[dict]) -> FastJSONResponse:
+    # Без повторной валидации MilestoneRead: просроченный дедлайн уже
+    # сохранённого milestone не должен ронять ответ на весь пакет
+    failed = sum(1 for r in results if r["status"] >= 400)
+    return FastJSONResponse(
+        {"succeeded": len(results) - failed, "failed": failed, "results": results}
+    )
+
+
+def _parse_batch_items(items: list[dict], schema, results: list) -> list[tuple]:
+    parsed = []
+    for index, item in enumerate(items):
+        try:
+            parsed.append((index, schema.parse_obj(item)))
+        except ValidationError as e:
+            results[index] = _result(index, 422, error=e.errors())
+    return parsed
+
+
+def _index_milestones(connection, owner_id: int, views: list[MilestoneView]) -> None:
+    search_index.index_documents(
+        connection,
+        search_index.KIND_MILESTONE,
+        ((v.id, owner_id, v.roadmap_id, v.title, v.description) for v in views),
+    )
+
+
+@router.post("/batch", response_model=MilestoneBatchResponse)
+@query_budget(8)
+def create_milestones_batch(
+    batch: MilestoneBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Пакетное создание: владение всеми roadmaps проверяется одним запросом,
+    корректные элементы вставляются одним INSERT (executemany) в одной
+    транзакции, счётчики /stats и поисковый индекс обновляются один раз
+    на пакет. Для каждого элемента возвращается свой статус.
+    """
+    results: list = [None] * len(batch.items)
+    parsed = _parse_batch_items(batch.items, MilestoneCreate, results)
+    roadmaps = _owned_roadmaps({m.roadmap_id for _, m in parsed}, db, current_user)
+
+    now = utcnow()
+    rows, indexes = [], []
+    for index, milestone_in in parsed:
+        roadmap = roadmaps.get(milestone_in.roadmap_id)
+        if roadmap is None:
+            results[index] = _result(index, 404, error="Roadmap not found")
+            continue
+        error = _due_at_error(milestone_in.due_at, roadmap.created_at, check_past=False)
+        if error:
+            results[index] = _result(index, 400, error=error)
+            continue
+        rows.append(
+            {
+                **milestone_in.dict(),
+                "owner_id": roadmap.owner_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        indexes.append(index)
+
+    if rows:
+        # ORM-события на строку (счётчики, индекс) для bulk insert не вызываются.
+        # id выдаются в порядке VALUES — сортировка по id возвращает порядок
+        # элементов (sort_by_parameter_order на SQLite вставлял бы по строке)
+        created = sorted(
+            milestone_views(
+                db.execute(insert(Milestone).returning(*MILESTONE_VIEW_COLUMNS), rows)
+            ),
+            key=lambda milestone: milestone.id,
+        )
+        connection = db.connection()
+        bump_user_stats(
+            connection, current_user.id, milestone_deltas(v.status for v in created)
+        )
+        _index_milestones(connection, current_user.id, created)
+        mark_owners_changed(db, {current_user.id})
+        for index, milestone in zip(indexes, created):
+            results[index] = _result(index, 201, milestone.id, milestone)
+    db.commit()
+    return _batch_response(results)
+
+
+@router.patch("/batch", response_model=MilestoneBatchResponse)
+@query_budget(8)
+def update_milestones_batch(
+    batch: MilestoneBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Пакетное обновление: один SELECT по id, затем UPDATE по первичному ключу
+    (executemany на каждый набор изменённых полей).
+    """
+    results: list = [None] * len(batch.items)
+    parsed = _parse_batch_items(batch.items, MilestoneBatchUpdateItem, results)
+    current = _owned_milestone_views({m.id for _, m in parsed}, db, current_user)
+
+    now = utcnow()
+    changes: dict[int, dict] = {}
+    status_deltas: Counter = Counter()
+    for index, milestone_in in parsed:
+        found = current.get(milestone_in.id)
+        if found is None:
+            results[index] = _result(
+                index, 404, milestone_in.id, error="Milestone not found"
+            )
+            continue
+        view, roadmap_created_at = found
+        if milestone_in.due_at is not None:
+            error = _due_at_error(milestone_in.due_at, roadmap_created_at, True)
+            if error:
+                results[index] = _result(index, 400, view.id, error=error)
+                continue
+        # Обновляем только заданные поля — как _apply_update
+        values = milestone_in.dict(exclude={"id"}, exclude_none=True)
+        updated = dataclasses.replace(view, **values, updated_at=now)
+        if updated.status != view.status:
+            status_deltas[status_column(view.status).name] -= 1
+            status_deltas[status_column(updated.status).name] += 1
+        # Повтор id в пакете применяется поверх предыдущего
+        current[view.id] = (updated, roadmap_created_at)
+        changes.setdefault(view.id, {"id": view.id}).update(values, updated_at=now)
+        results[index] = _result(index, 200, view.id, updated)
+
+    if changes:
+        # Строки с одинаковым набором полей подряд — один executemany на набор
+        rows = sorted(changes.values(), key=lambda row: sorted(row))
+        db.execute(update(Milestone), rows)
+        connection = db.connection()
+        bump_user_stats(connection, current_user.id, status_deltas)
+        _index_milestones(
+            connection,
+            current_user.id,
+            [
+                current[row["id"]][0]
+                for row in rows
+                if "title" in row or "description" in row
+            ],
+        )
+        mark_owners_changed(db, {current_user.id})
+    db.commit()
+    return _batch_response(results)
+
+
+@router.delete("/batch", response_model=MilestoneBatchResponse)
+@query_budget(8)
+def delete_milestones_batch(
+    batch: MilestoneBatchDelete,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    current = _owned_milestone_views(set(batch.ids), db, current_user)
+
+    results, deleted = [], []
+    for index, milestone_id in enumerate(batch.ids):
+        found = current.pop(milestone_id, None)
+        if found is None:
+            results.append(
+                _result(index, 404, milestone_id, error="Milestone not found")
+            )
+            continue
+        deleted.append(found[0])
+        results.append(_result(index, 204, milestone_id))
+
+    if deleted:
+        ids = [milestone.id for milestone in deleted]
+        db.execute(
+            delete(Milestone)
+            .where(Milestone.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        connection = db.connection()
+        bump_user_stats(
+            connection,
+            current_user.id,
+            milestone_deltas((m.status for m in deleted), sign=-1),
+        )
+        search_index.unindex_documents(connection, search_index.KIND_MILESTONE, ids)
+        mark_owners_changed(db, {current_user.id})
+    db.commit()
+    return _batch_response(results)
+
+
 @router.get("/{milestone_id}", response_model=MilestoneRead)
+@query_budget(3)
 def get_milestone(
     milestone_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
+    updated_at = (
+        db.query(Milestone.updated_at)
+        .filter(Milestone.id == milestone_id, Milestone.owner_id == current_user.id)
+        .scalar()
+    )
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Milestone not found")
+    cached = conditional(request, response, make_validator(current_user.id, updated_at))
+    if cached is not None:
+        return cached
+
     milestone = _get_owned_milestone_or_404(milestone_id, db, current_user)
     return milestone
 
@@ -125,28 +451,14 @@ def update_milestone(
 ):
     milestone = _get_owned_milestone_or_404(milestone_id, db, current_user)
 
-    if milestone_in.title is not None:
-        milestone.title = milestone_in.title
-    if milestone_in.description is not None:
-        milestone.description = milestone_in.description
     if milestone_in.due_at is not None:
         # Повторная валидация (могут двигать в прошлое или до создания roadmap)
-        roadmap = db.query(Roadmap).filter(Roadmap.id == milestone.roadmap_id).first()
-        if milestone_in.due_at < roadmap.created_at.date():
-            raise HTTPException(
-                status_code=400,
-                detail="Milestone due_at cannot be earlier than roadmap creation date",
-            )
-        if milestone_in.due_at < date.today():
-            raise HTTPException(
-                status_code=400,
-                detail="Milestone due_at cannot be in the past",
-            )
-        milestone.due_at = milestone_in.due_at
-    if milestone_in.status is not None:
-        milestone.status = milestone_in.status
-    if milestone_in.sort_order is not None:
-        milestone.sort_order = milestone_in.sort_order
+        error = _due_at_error(
+            milestone_in.due_at, milestone.roadmap.created_at, check_past=True
+        )
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+    _apply_update(milestone, milestone_in)
 
     db.add(milestone)
     db.commit()
@@ -163,4 +475,3 @@ def delete_milestone(
     milestone = _get_owned_milestone_or_404(milestone_id, db, current_user)
     db.delete(milestone)
     db.commit()
-    return None
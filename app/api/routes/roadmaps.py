@@ -1,47 +1,197 @@
-from typing import List
+import itertools
+import json
+import time
+from datetime import date, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.orm import Session
 
+from app.api.conditional import (
+    conditional,
+    fingerprint,
+    make_validator,
+    not_modified,
+    validator_headers,
+)
 from app.api.deps import get_current_active_user
-from app.api.utils import tags_list_to_string, tags_string_to_list
+from app.api.importing import ROADMAP as IMPORT_ROADMAP
+from app.api.importing import ImportFormatError, detect_format, iter_records
+from app.api.includes import (
+    DEFAULT_EMBEDDED_MILESTONES,
+    INCLUDE_STATS,
+    MAX_EMBEDDED_MILESTONES,
+    expand_roadmaps,
+    milestone_rows,
+    parse_include,
+    read_roadmaps,
+    select_roadmaps,
+)
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+)
+from app.api.projections import (
+    ROADMAP_VIEW_COLUMNS,
+    RoadmapView,
+)
+from app.api.query_budget import query_budget
+from app.api.response_cache import cache_response, mark_owners_changed
+from app.api.serialization import FastJSONResponse, json_rows
+from app.api.streaming import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_CSV_HEADER,
+    batched,
+    csv_chunks,
+    gzip_chunks,
+    json_array_chunks,
+    keep_sync,
+    ndjson_chunks,
+    stream_partitions,
+    zip_chunks,
+)
+from app.api.utils import sync_roadmap_tags, tags_list_to_string, tags_string_to_list
+from app.db.base import utcnow
 from app.db.session import get_db
+from app.models import search as search_index
+from app.models.milestone import Milestone
 from app.models.roadmap import Roadmap
+from app.models.roadmap_tag import RoadmapTag
 from app.models.user import User
-from app.schemas.roadmap import RoadmapCreate, RoadmapRead, RoadmapUpdate
+from app.models.user_stats import bump_user_stats, milestone_deltas
+from app.schemas.milestone import MilestoneCreate
+from app.schemas.roadmap import (
+    RoadmapCreate,
+    RoadmapExpanded,
+    RoadmapImportError,
+    RoadmapImportReport,
+    RoadmapRead,
+    RoadmapUpdate,
+)
 
 router = APIRouter(prefix="/roadmaps", tags=["roadmaps"])
 
 
-@router.get("/", response_model=List[RoadmapRead])
+@router.get("/", response_model=list[RoadmapExpanded])
+@cache_response
+# пользователь, поиск по q, валидатор страницы, страница (со stats);
+# с include — ещё fingerprint milestones страницы и milestones
+@query_budget(6)
 def list_roadmaps(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-    q: str | None = Query(None, description="Search in title"),
+    q: str | None = Query(None, description="Full-text search in title/description"),
     tag: str | None = Query(None, description="Filter by tag (single)"),
+    tags: list[str] | None = Query(None, description="Filter by several tags"),
+    tags_match: str = Query("all", regex="^(all|any)$"),
     is_archived: bool | None = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    include: str | None = Query(None, description="Comma-separated: milestones,stats"),
+    milestones_limit: int = Query(
+        DEFAULT_EMBEDDED_MILESTONES, ge=1, le=MAX_EMBEDDED_MILESTONES
+    ),
 ):
+    include = parse_include(include)
     query = db.query(Roadmap).filter(Roadmap.owner_id == current_user.id)
 
-    if q:
-        like = f"%{q}%"
-        query = query.filter(Roadmap.title.ilike(like))
+    # Поиск через полнотекстовый индекс вместо ILIKE '%q%';
+    # q без слов (одна пунктуация) фильтром не считается
+    matched = (
+        search_index.matching_ids(db, current_user.id, q, search_index.KIND_ROADMAP)
+        if q
+        else None
+    )
+    if matched is not None:
+        query = query.filter(Roadmap.id.in_(matched))
 
-    if tag:
-        tag_lower = tag.strip().lower()
-        # Простая фильтрация по LIKE
-        like = f"%{tag_lower}%"
-        query = query.filter(Roadmap.tags.ilike(like))
+    # tag и tags объединяются и нормализуются так же, как при записи
+    wanted = tags_string_to_list(tags_list_to_string([tag or "", *(tags or [])]))
+    if wanted:
+        # Seek по индексу (tag, roadmap_id) в roadmap_tags вместо LIKE по строке
+        tagged = select(RoadmapTag.roadmap_id).where(RoadmapTag.tag.in_(wanted))
+        if tags_match == "all" and len(wanted) > 1:
+            tagged = tagged.group_by(RoadmapTag.roadmap_id).having(
+                func.count(RoadmapTag.tag) == len(wanted)
+            )
+        query = query.filter(Roadmap.id.in_(tagged))
 
     if is_archived is not None:
         query = query.filter(Roadmap.is_archived == is_archived)
 
-    roadmaps = query.order_by(Roadmap.created_at.desc()).all()
+    # Keyset-пагинация по (created_at, id) вместо OFFSET
+    if cursor:
+        after = decode_cursor(cursor, datetime, int)
+        query = query.filter(
+            keyset_after((Roadmap.created_at, Roadmap.id), after, descending=True)
+        )
+
+    page = query.order_by(Roadmap.created_at.desc(), Roadmap.id.desc()).limit(limit + 1)
+    # 304 по агрегату страницы — до загрузки и сериализации строк
+    rows = page.with_entities(Roadmap.id, Roadmap.updated_at)
+    validator = make_validator(
+        current_user.id,
+        *fingerprint(db, rows),
+        *_include_validator_parts(
+            db, include, milestones_limit, page.with_entities(Roadmap.id).statement
+        ),
+    )
+    cached = conditional(request, response, validator)
+    if cached is not None:
+        return cached
 
-    # Преобразуем tags к списку для схем
-    for rm in roadmaps:
-        rm.tags = tags_string_to_list(rm.tags)
-    return roadmaps
+    # Колонки вместо ORM-объектов: без identity map и повторной валидации;
+    # сводка milestones (include=stats) присоединяется к этой же выборке
+    roadmaps, stats = read_roadmaps(
+        db,
+        select_roadmaps(
+            page.with_entities(*ROADMAP_VIEW_COLUMNS).statement,
+            include,
+            page.with_entities(Roadmap.id).statement,
+            date.today(),
+        ),
+    )
+    if len(roadmaps) > limit:
+        roadmaps = roadmaps[:limit]
+        last = roadmaps[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return json_rows(
+        expand_roadmaps(db, roadmaps, include, milestones_limit, stats),
+        response.headers,
+    )
+
+
+def _include_validator_parts(
+    db: Session, include: frozenset[str], milestones_limit: int, roadmap_ids
+) -> tuple:
+    """Части валидатора, от которых зависят включения (milestones и stats)."""
+    if not include:
+        return ()
+    return (
+        sorted(include),
+        milestones_limit,
+        # просроченные и next_due_at меняются со сменой дня
+        date.today() if INCLUDE_STATS in include else None,
+        *fingerprint(db, milestone_rows(roadmap_ids)),
+    )
 
 
 @router.post("/", response_model=RoadmapRead, status_code=status.HTTP_201_CREATED)
@@ -56,11 +206,304 @@ def create_roadmap(
         tags=tags_list_to_string(roadmap_in.tags),
         owner_id=current_user.id,
     )
+    sync_roadmap_tags(roadmap, roadmap.tags)
     db.add(roadmap)
     db.commit()
     db.refresh(roadmap)
-    roadmap.tags = tags_string_to_list(roadmap.tags)
-    return roadmap
+    return RoadmapView.from_entity(roadmap)
+
+
+_MILESTONE_EXPORT_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "due_at",
+    "status",
+    "sort_order",
+)
+
+_MILESTONE_IMPORT_FIELDS = ("title", "description", "due_at", "status", "sort_order")
+
+_BULK_EXPORT_ROADMAP_BATCH = 200
+
+
+def _roadmap_export_dict(roadmap) -> dict:
+    return {
+        "id": roadmap.id,
+        "title": roadmap.title,
+        "description": roadmap.description,
+        "tags": tags_string_to_list(roadmap.tags),
+        "created_at": roadmap.created_at.isoformat(),
+        "updated_at": roadmap.updated_at.isoformat(),
+    }
+
+
+def _milestone_export_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "due_at": row.due_at.isoformat(),
+        "status": row.status.value,
+        "sort_order": row.sort_order,
+    }
+
+
+def _csv_row(roadmap_data: dict, row) -> list:
+    return [
+        roadmap_data["id"],
+        roadmap_data["title"],
+        row.id,
+        row.title,
+        row.due_at.isoformat(),
+        row.status.value,
+        row.sort_order,
+    ]
+
+
+def _iter_owned_roadmaps(bind, owner_id: int):
+    """
+    (roadmap_data, итератор строк milestones) для всех roadmaps пользователя.
+    На пачку из _BULK_EXPORT_ROADMAP_BATCH roadmaps — один запрос за roadmaps
+    и один потоковый запрос за их milestones, без запроса на каждый roadmap.
+    """
+    with Session(bind=bind) as session:
+        last_id = 0
+        while True:
+            roadmaps = session.execute(
+                select(
+                    Roadmap.id,
+                    Roadmap.title,
+                    Roadmap.description,
+                    Roadmap.tags,
+                    Roadmap.created_at,
+                    Roadmap.updated_at,
+                )
+                .where(Roadmap.owner_id == owner_id, Roadmap.id > last_id)
+                .order_by(Roadmap.id)
+                .limit(_BULK_EXPORT_ROADMAP_BATCH)
+            ).all()
+            if not roadmaps:
+                return
+            last_id = roadmaps[-1].id
+
+            rows = session.execute(
+                select(
+                    Milestone.roadmap_id,
+                    *(getattr(Milestone, c) for c in _MILESTONE_EXPORT_COLUMNS),
+                )
+                .where(Milestone.roadmap_id.in_([rm.id for rm in roadmaps]))
+                .order_by(Milestone.roadmap_id, Milestone.sort_order, Milestone.id)
+                .execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            groups = itertools.groupby(rows, key=lambda row: row.roadmap_id)
+            current = next(groups, None)
+            for rm in roadmaps:
+                if current is not None and current[0] == rm.id:
+                    yield _roadmap_export_dict(rm), current[1]
+                    current = next(groups, None)
+                else:
+                    yield _roadmap_export_dict(rm), iter(())
+
+
+@router.get("/export")
+@keep_sync
+@cache_response
+def export_all_roadmaps(
+    format: str = Query("ndjson", regex="^(ndjson|zip)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Все roadmaps пользователя одним архивом: gzip-NDJSON (format=ndjson)
+    или zip с CSV на каждый roadmap (format=zip). Сжатие идёт на лету.
+    """
+    roadmaps = _iter_owned_roadmaps(db.get_bind(), current_user.id)
+
+    if format == "ndjson":
+
+        def ndjson_body():
+            for roadmap_data, rows in roadmaps:
+                yield json.dumps({"type": "roadmap", **roadmap_data}) + "\n"
+                yield from ndjson_chunks(
+                    [
+                        {
+                            "type": "milestone",
+                            "roadmap_id": roadmap_data["id"],
+                            **_milestone_export_dict(row),
+                        }
+                        for row in batch
+                    ]
+                    for batch in batched(rows, EXPORT_BATCH_SIZE)
+                )
+
+        return StreamingResponse(
+            gzip_chunks(ndjson_body()),
+            media_type="application/gzip",
+            headers={
+                "Content-Disposition": 'attachment; filename="roadmaps.ndjson.gz"'
+            },
+        )
+
+    files = (
+        (
+            f"roadmap_{roadmap_data['id']}.csv",
+            csv_chunks(
+                EXPORT_CSV_HEADER,
+                (
+                    [_csv_row(roadmap_data, row) for row in batch]
+                    for batch in batched(rows, EXPORT_BATCH_SIZE)
+                ),
+            ),
+        )
+        for roadmap_data, rows in roadmaps
+    )
+    return StreamingResponse(
+        zip_chunks(files),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="roadmaps.zip"'},
+    )
+
+
+IMPORT_CHUNK_SIZE = 500
+MAX_IMPORT_ERRORS = 1000
+
+_IMPORTED_MILESTONE_COLUMNS = (
+    Milestone.id,
+    Milestone.roadmap_id,
+    Milestone.title,
+    Milestone.description,
+    Milestone.status,
+)
+
+
+def _insert_imported_milestones(db: Session, owner_id: int, rows: list[dict]) -> None:
+    """
+    Вставляет порцию milestones одним INSERT (executemany). ORM-события для
+    bulk insert не вызываются: счётчики /stats, поисковый индекс и кэш ответов
+    обновляются здесь, один раз на порцию.
+    """
+    if not rows:
+        return
+    created = db.execute(
+        insert(Milestone).returning(*_IMPORTED_MILESTONE_COLUMNS), rows
+    ).all()
+    connection = db.connection()
+    bump_user_stats(connection, owner_id, milestone_deltas(m.status for m in created))
+    search_index.index_documents(
+        connection,
+        search_index.KIND_MILESTONE,
+        ((m.id, owner_id, m.roadmap_id, m.title, m.description) for m in created),
+    )
+    mark_owners_changed(db, {owner_id})
+
+
+@router.post("/import", response_model=RoadmapImportReport)
+@keep_sync
+def import_roadmaps(
+    file: UploadFile = File(...),
+    format: str | None = Query(None, regex="^(json|csv|ndjson)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Импорт файла в формате /roadmaps/{id}/export или /roadmaps/export.
+    Файл разбирается потоково, строки проверяются правилами RoadmapCreate /
+    MilestoneCreate, milestones вставляются одним INSERT на IMPORT_CHUNK_SIZE
+    строк, каждая порция — своя транзакция.
+    Ошибочные строки пропускаются и попадают в отчёт.
+    """
+    fmt = format or detect_format(file.filename)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Cannot detect import format")
+
+    started = time.perf_counter()
+    errors: list[RoadmapImportError] = []
+    failed = 0
+    aborted = False
+    roadmaps_created = 0
+    milestones_created = 0
+    # id roadmap в файле -> id созданного roadmap (None, если он не прошёл проверку)
+    roadmap_ids: dict = {}
+    pending: list[dict] = []
+
+    def fail(position: str, error) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_IMPORT_ERRORS:
+            errors.append(RoadmapImportError(position=position, error=error))
+
+    try:
+        for record in iter_records(fmt, file.file):
+            if record.kind == IMPORT_ROADMAP:
+                try:
+                    roadmap_in = RoadmapCreate.parse_obj(record.data)
+                except ValidationError as e:
+                    roadmap_ids[record.roadmap_key] = None
+                    fail(record.position, e.errors())
+                    continue
+                roadmap = Roadmap(
+                    title=roadmap_in.title,
+                    description=roadmap_in.description,
+                    tags=tags_list_to_string(roadmap_in.tags),
+                    owner_id=current_user.id,
+                )
+                sync_roadmap_tags(roadmap, roadmap.tags)
+                db.add(roadmap)
+                db.flush()
+                roadmap_ids[record.roadmap_key] = roadmap.id
+                roadmaps_created += 1
+                continue
+
+            roadmap_id = roadmap_ids.get(record.roadmap_key)
+            if roadmap_id is None:
+                fail(record.position, "Roadmap for milestone was not imported")
+                continue
+            try:
+                fields = {
+                    k: record.data[k]
+                    for k in _MILESTONE_IMPORT_FIELDS
+                    if record.data.get(k) is not None
+                }
+                milestone_in = MilestoneCreate.parse_obj(
+                    {**fields, "roadmap_id": roadmap_id}
+                )
+            except ValidationError as e:
+                fail(record.position, e.errors())
+                continue
+            now = utcnow()
+            pending.append(
+                {
+                    **milestone_in.dict(),
+                    "owner_id": current_user.id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            milestones_created += 1
+            if len(pending) >= IMPORT_CHUNK_SIZE:
+                _insert_imported_milestones(db, current_user.id, pending)
+                db.commit()
+                pending = []
+    except ImportFormatError as e:
+        # Уже разобранное сохраняем, дальше файл прочитать нельзя
+        aborted = True
+        fail(e.position, str(e))
+    _insert_imported_milestones(db, current_user.id, pending)
+    db.commit()
+
+    elapsed = time.perf_counter() - started
+    rows = roadmaps_created + milestones_created + failed
+    return RoadmapImportReport(
+        format=fmt,
+        roadmaps_created=roadmaps_created,
+        milestones_created=milestones_created,
+        failed=failed,
+        errors=errors,
+        aborted=aborted,
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(rows / elapsed, 1) if elapsed else 0.0,
+    )
 
 
 def _get_owned_roadmap_or_404(
@@ -81,15 +524,61 @@ def _get_owned_roadmap_or_404(
     return roadmap
 
 
-@router.get("/{roadmap_id}", response_model=RoadmapRead)
+def _owned_roadmap_updated_at(
+    roadmap_id: int,
+    db: Session,
+    current_user: User,
+) -> datetime:
+    updated_at = (
+        db.query(Roadmap.updated_at)
+        .filter(Roadmap.id == roadmap_id, Roadmap.owner_id == current_user.id)
+        .scalar()
+    )
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Roadmap not found")
+    return updated_at
+
+
+@router.get("/{roadmap_id}", response_model=RoadmapExpanded)
+# пользователь, валидатор, строка (со stats); с include — как у list_roadmaps
+@query_budget(5)
 def get_roadmap(
     roadmap_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    include: str | None = Query(None, description="Comma-separated: milestones,stats"),
+    milestones_limit: int = Query(
+        DEFAULT_EMBEDDED_MILESTONES, ge=1, le=MAX_EMBEDDED_MILESTONES
+    ),
 ):
-    roadmap = _get_owned_roadmap_or_404(roadmap_id, db, current_user)
-    roadmap.tags = tags_string_to_list(roadmap.tags)
-    return roadmap
+    include = parse_include(include)
+    validator = make_validator(
+        current_user.id,
+        _owned_roadmap_updated_at(roadmap_id, db, current_user),
+        *_include_validator_parts(db, include, milestones_limit, [roadmap_id]),
+    )
+    cached = conditional(request, response, validator)
+    if cached is not None:
+        return cached
+
+    roadmaps, stats = read_roadmaps(
+        db,
+        select_roadmaps(
+            select(*ROADMAP_VIEW_COLUMNS).where(
+                Roadmap.id == roadmap_id, Roadmap.owner_id == current_user.id
+            ),
+            include,
+            [roadmap_id],
+            date.today(),
+        ),
+    )
+    if not roadmaps:
+        raise HTTPException(status_code=404, detail="Roadmap not found")
+    # Как у списков: DTO (или dict с включениями) сразу в JSON
+    (roadmap,) = expand_roadmaps(db, roadmaps, include, milestones_limit, stats)
+    return FastJSONResponse(roadmap, headers=dict(response.headers))
 
 
 @router.put("/{roadmap_id}", response_model=RoadmapRead)
@@ -108,106 +597,127 @@ def update_roadmap(
         roadmap.description = roadmap_in.description
     if roadmap_in.tags is not None:
         roadmap.tags = tags_list_to_string(roadmap_in.tags)
+        sync_roadmap_tags(roadmap, roadmap.tags)
     if roadmap_in.is_archived is not None:
         roadmap.is_archived = roadmap_in.is_archived
 
     db.add(roadmap)
     db.commit()
     db.refresh(roadmap)
-    roadmap.tags = tags_string_to_list(roadmap.tags)
-    return roadmap
+    return RoadmapView.from_entity(roadmap)
 
 
 @router.delete("/{roadmap_id}", status_code=status.HTTP_204_NO_CONTENT)
+# пользователь, roadmap, milestones пакетом (DELETE, счётчики, индекс),
+# теги и сам roadmap — не зависит от числа milestones
+@query_budget(11)
 def delete_roadmap(
     roadmap_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
+    """
+    Milestones удаляются одним DELETE ... RETURNING до удаления roadmap:
+    каскад ORM удалял бы их по одному, со сдвигом счётчиков и снятием
+    с индекса на каждую строку.
+    """
     roadmap = _get_owned_roadmap_or_404(roadmap_id, db, current_user)
+    deleted = db.execute(
+        delete(Milestone)
+        .where(Milestone.roadmap_id == roadmap.id)
+        .returning(Milestone.id, Milestone.status)
+        .execution_options(synchronize_session=False)
+    ).all()
+    connection = db.connection()
+    bump_user_stats(
+        connection,
+        current_user.id,
+        milestone_deltas((m.status for m in deleted), sign=-1),
+    )
+    search_index.unindex_documents(
+        connection, search_index.KIND_MILESTONE, [m.id for m in deleted]
+    )
     db.delete(roadmap)
     db.commit()
-    return None
 
 
 @router.get("/{roadmap_id}/export")
+@keep_sync
+@cache_response
 def export_roadmap(
     roadmap_id: int,
-    format: str = Query("json", regex="^(json|csv)$"),
+    request: Request,
+    format: str = Query("json", regex="^(json|csv|ndjson)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    from fastapi.responses import JSONResponse, PlainTextResponse
-
-    from app.models.milestone import Milestone
+    validator = make_validator(
+        current_user.id,
+        format,
+        _owned_roadmap_updated_at(roadmap_id, db, current_user),
+        *fingerprint(
+            db,
+            select(Milestone.id, Milestone.updated_at).where(
+                Milestone.roadmap_id == roadmap_id
+            ),
+        ),
+    )
+    cached = not_modified(request, validator)
+    if cached is not None:
+        return cached
+    headers = validator_headers(validator)
 
     roadmap = _get_owned_roadmap_or_404(roadmap_id, db, current_user)
-    roadmap.tags = tags_string_to_list(roadmap.tags)
+    roadmap_data = _roadmap_export_dict(roadmap)
 
-    milestones = (
-        db.query(Milestone)
-        .filter(Milestone.roadmap_id == roadmap.id)
-        .order_by(Milestone.sort_order)
-        .all()
+    # Milestones читаются порциями уже во время отправки ответа
+    stmt = (
+        select(*(getattr(Milestone, c) for c in _MILESTONE_EXPORT_COLUMNS))
+        .where(Milestone.roadmap_id == roadmap.id)
+        .order_by(Milestone.sort_order, Milestone.id)
     )
+    batches = stream_partitions(db.get_bind(), stmt)
 
     if format == "json":
-        data = {
-            "roadmap": {
-                "id": roadmap.id,
-                "title": roadmap.title,
-                "description": roadmap.description,
-                "tags": roadmap.tags,
-                "created_at": roadmap.created_at.isoformat(),
-                "updated_at": roadmap.updated_at.isoformat(),
+
+        def json_body():
+            yield '{"roadmap":' + json.dumps(roadmap_data) + ',"milestones":['
+            yield from json_array_chunks(
+                [_milestone_export_dict(row) for row in batch] for batch in batches
+            )
+            yield "]}"
+
+        return StreamingResponse(
+            json_body(), media_type="application/json", headers=headers
+        )
+
+    if format == "ndjson":
+
+        def ndjson_body():
+            yield json.dumps({"type": "roadmap", **roadmap_data}) + "\n"
+            yield from ndjson_chunks(
+                [{"type": "milestone", **_milestone_export_dict(row)} for row in batch]
+                for batch in batches
+            )
+
+        return StreamingResponse(
+            ndjson_body(),
+            media_type="application/x-ndjson",
+            headers={
+                **headers,
+                "Content-Disposition": (
+                    f'attachment; filename="roadmap_{roadmap.id}.ndjson"'
+                ),
             },
-            "milestones": [
-                {
-                    "id": m.id,
-                    "title": m.title,
-                    "description": m.description,
-                    "due_at": m.due_at.isoformat(),
-                    "status": m.status.value,
-                    "sort_order": m.sort_order,
-                }
-                for m in milestones
-            ],
-        }
-        return JSONResponse(content=data)
+        )
 
     # CSV формат: одна строка на milestone
-    import csv
-    from io import StringIO
-
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow(
-        [
-            "roadmap_id",
-            "roadmap_title",
-            "milestone_id",
-            "milestone_title",
-            "due_at",
-            "status",
-            "sort_order",
-        ]
-    )
-    for m in milestones:
-        writer.writerow(
-            [
-                roadmap.id,
-                roadmap.title,
-                m.id,
-                m.title,
-                m.due_at.isoformat(),
-                m.status.value,
-                m.sort_order,
-            ]
-        )
-    return PlainTextResponse(
-        content=output.getvalue(),
+    rows = ([_csv_row(roadmap_data, row) for row in batch] for batch in batches)
+    return StreamingResponse(
+        csv_chunks(EXPORT_CSV_HEADER, rows),
         media_type="text/csv",
         headers={
-            "Content-Disposition": f'attachment; filename="roadmap_{roadmap.id}.csv"'
+            **headers,
+            "Content-Disposition": f'attachment; filename="roadmap_{roadmap.id}.csv"',
         },
     )
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_active_user
+from app.api.query_budget import query_budget
+from app.db.session import get_db
+from app.models import search as search_index
+from app.models.user import User
+from app.schemas.search import SearchHit
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/", response_model=list[SearchHit])
+@query_budget(3)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: str | None = Query(None, regex="^(roadmap|milestone)$"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    rows = search_index.search(db, current_user.id, q, kind=kind, limit=limit)
+    return [SearchHit.from_orm(row) for row in rows]
@@ -1,87 +1,75 @@
 from datetime import date, timedelta
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user
+from app.api.query_budget import query_budget
+from app.api.response_cache import cache_response
+from app.db.routing import use_primary
 from app.db.session import get_db
-from app.models.milestone import Milestone, MilestoneStatus
-from app.models.roadmap import Roadmap
+from app.models.milestone import Milestone, MilestoneStatus, is_overdue
 from app.models.user import User
+from app.models.user_stats import UserStats, create_user_stats, status_column
 from app.schemas.stats import StatsResponse
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
 
+def _rebuild_user_stats(db: Session, user_id: int) -> UserStats:
+    """
+    Полный пересчёт счётчиков пользователя. Нужен один раз — когда строки
+    в user_stats ещё нет; дальше её поддерживают ORM-события.
+    """
+    use_primary(db)
+    # Пересчёт и вставка — один INSERT ... SELECT: параллельная запись
+    # либо уже видна пересчёту, либо ждёт его коммита и сдвигает счётчики
+    create_user_stats(db.connection(), user_id)
+    db.commit()
+    return db.get(UserStats, user_id)
+
+
 @router.get("/", response_model=StatsResponse)
+@cache_response
+# обычно 3; первый запрос ещё и пересчитывает user_stats
+@query_budget(8)
 def get_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    # Всего roadmaps
-    total_roadmaps = (
-        db.query(func.count(Roadmap.id))
-        .filter(Roadmap.owner_id == current_user.id)
-        .scalar()
-    )
-
-    # Всего milestones
-    total_milestones = (
-        db.query(func.count(Milestone.id))
-        .join(Roadmap, Milestone.roadmap_id == Roadmap.id)
-        .filter(Roadmap.owner_id == current_user.id)
-        .scalar()
-    )
-
-    # По статусам
-    rows = (
-        db.query(Milestone.status, func.count(Milestone.id))
-        .join(Roadmap, Milestone.roadmap_id == Roadmap.id)
-        .filter(Roadmap.owner_id == current_user.id)
-        .group_by(Milestone.status)
-        .all()
-    )
+    # Всего roadmaps / milestones и по статусам — готовые счётчики
+    stats = db.get(UserStats, current_user.id)
+    if stats is None:
+        stats = _rebuild_user_stats(db, current_user.id)
 
     milestones_by_status: dict[MilestoneStatus, int] = {
-        status: 0 for status in MilestoneStatus
+        status: getattr(stats, status_column(status).name) for status in MilestoneStatus
     }
-    for status, cnt in rows:
-        milestones_by_status[status] = cnt
 
     today = date.today()
     upcoming_limit = today + timedelta(days=7)
 
-    # Просроченные
-    overdue_milestones = (
-        db.query(func.count(Milestone.id))
-        .join(Roadmap, Milestone.roadmap_id == Roadmap.id)
-        .filter(
-            Roadmap.owner_id == current_user.id,
-            Milestone.due_at < today,
-            Milestone.status != MilestoneStatus.DONE,
-        )
-        .scalar()
+    # Просроченные и ближайшие 7 дней — один range-запрос по due_at
+    is_upcoming = (Milestone.due_at >= today) & Milestone.status.in_(
+        [MilestoneStatus.PLANNED, MilestoneStatus.IN_PROGRESS]
     )
-
-    # Ближайшие 7 дней
-    upcoming_milestones_7d = (
-        db.query(func.count(Milestone.id))
-        .join(Roadmap, Milestone.roadmap_id == Roadmap.id)
+    overdue_milestones, upcoming_milestones_7d = (
+        db.query(
+            func.coalesce(func.sum(case((is_overdue(today), 1), else_=0)), 0),
+            func.coalesce(func.sum(case((is_upcoming, 1), else_=0)), 0),
+        )
         .filter(
-            Roadmap.owner_id == current_user.id,
-            Milestone.due_at >= today,
+            Milestone.owner_id == current_user.id,
             Milestone.due_at <= upcoming_limit,
-            Milestone.status.in_(
-                [MilestoneStatus.PLANNED, MilestoneStatus.IN_PROGRESS]
-            ),
+            Milestone.status != MilestoneStatus.DONE,
         )
-        .scalar()
+        .one()
     )
 
     return StatsResponse(
-        total_roadmaps=total_roadmaps,
-        total_milestones=total_milestones,
+        total_roadmaps=stats.total_roadmaps,
+        total_milestones=stats.total_milestones,
         milestones_by_status=milestones_by_status,
         overdue_milestones=overdue_milestones,
         upcoming_milestones_7d=upcoming_milestones_7d,
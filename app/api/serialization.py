@@ -0,0 +1,57 @@
+"""
+Быстрый путь для ответов-списков.
+
+Строки читаются колонками в DTO (app/api/projections.py) и отдаются без
+повторной валидации pydantic — данные только что прочитаны из БД — через
+orjson, если он установлен (иначе стандартным json).
+response_model у обработчиков остаётся для OpenAPI: поля и их формат
+совпадают с RoadmapRead / MilestoneRead.
+"""
+
+import dataclasses
+import enum
+import json
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # orjson необязателен
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # То же представление, что у jsonable_encoder
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if dataclasses.is_dataclass(value):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_rows(rows: list, headers: Mapping[str, str] | None = None) -> FastJSONResponse:
+    """
+    Готовый ответ со списком; headers — заголовки, уже выставленные
+    обработчиком на Response-параметре (ETag, X-Next-Cursor).
+    """
+    return FastJSONResponse(rows, headers=dict(headers or {}))
@@ -0,0 +1,132 @@
+"""
+Вспомогательные функции для потоковых ответов (экспорт).
+
+Строки из БД читаются порциями (yield_per) в отдельной сессии, которая живёт
+столько же, сколько генератор ответа, и сразу сериализуются в чанки —
+весь результат в памяти не собирается.
+"""
+
+import csv
+import io
+import itertools
+import json
+import zipfile
+import zlib
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+EXPORT_BATCH_SIZE = 500
+
+# Колонки CSV-экспорта: одна строка на milestone
+EXPORT_CSV_HEADER = [
+    "roadmap_id",
+    "roadmap_title",
+    "milestone_id",
+    "milestone_title",
+    "due_at",
+    "status",
+    "sort_order",
+]
+
+
+def keep_sync(endpoint):
+    """
+    Помечает обработчик, который должен остаться sync и в async-режиме
+    (см. app/api/async_routes.py): потоковое тело итерируется в threadpool
+    и читает БД через обычный sync-движок.
+    """
+    endpoint.keep_sync = True
+    return endpoint
+
+
+def stream_partitions(
+    bind: Engine, stmt: Select, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[list]:
+    """Порции строк stmt; сессия закрывается, когда генератор исчерпан или закрыт."""
+    with Session(bind=bind) as session:
+        result = session.execute(stmt.execution_options(yield_per=batch_size))
+        yield from result.partitions()
+
+
+def batched(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+class _Echo:
+    def write(self, value: str) -> str:
+        return value
+
+
+def csv_chunks(header: list[str], batches: Iterable[Iterable[list]]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for batch in batches:
+        yield "".join(writer.writerow(row) for row in batch)
+
+
+def ndjson_chunks(batches: Iterable[Iterable[dict[str, Any]]]) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(json.dumps(item) + "\n" for item in batch)
+
+
+def json_array_chunks(batches: Iterable[Iterable[dict[str, Any]]]) -> Iterator[str]:
+    """Элементы JSON-массива без скобок, с запятыми между ними."""
+    first = True
+    for batch in batches:
+        parts = [json.dumps(item) for item in batch]
+        if not parts:
+            continue
+        yield ("" if first else ",") + ",".join(parts)
+        first = False
+
+
+def gzip_chunks(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+    """Сжимает текстовые чанки в gzip на лету."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Несикаемый приёмник для ZipFile: накапливает байты до очередного drain()."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def zip_chunks(files: Iterable[tuple[str, Iterable[str]]]) -> Iterator[bytes]:
+    """
+    Zip-архив из пар (имя файла, текстовые чанки) без буферизации архива:
+    ZipFile пишет в несикаемый поток (размеры — в data descriptor),
+    готовые байты отдаются после каждого чанка.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, chunks in files:
+            with archive.open(name, mode="w") as entry:
+                for chunk in chunks:
+                    entry.write(chunk.encode())
+                    data = sink.drain()
+                    if data:
+                        yield data
+    yield sink.drain()
@@ -1,3 +1,7 @@
+from app.models.roadmap import Roadmap
+from app.models.roadmap_tag import RoadmapTag
+
+
 def tags_list_to_string(tags: list[str]) -> str | None:
     """
     Преобразует список тегов в нормализованную строку:
@@ -8,7 +12,7 @@ def tags_list_to_string(tags: list[str]) -> str | None:
     """
     if not tags:
         return None
-    normalized = sorted(set(t.strip().lower() for t in tags if t.strip()))
+    normalized = sorted({t.strip().lower() for t in tags if t.strip()})
     return ",".join(normalized) if normalized else None
 
 
@@ -19,3 +23,17 @@ def tags_string_to_list(tags_str: str | None) -> list[str]:
     if not tags_str:
         return []
     return [t for t in tags_str.split(",") if t]
+
+
+def sync_roadmap_tags(roadmap: Roadmap, tags_str: str | None) -> None:
+    """
+    Приводит строки roadmap_tags в соответствие с нормализованной строкой тегов.
+    Лишние строки удаляются (delete-orphan), недостающие добавляются.
+    """
+    wanted = set(tags_string_to_list(tags_str))
+    current = {row.tag: row for row in roadmap.tag_rows}
+    for tag, row in current.items():
+        if tag not in wanted:
+            roadmap.tag_rows.remove(row)
+    for tag in sorted(wanted - current.keys()):
+        roadmap.tag_rows.append(RoadmapTag(tag=tag))
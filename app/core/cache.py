@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Потокобезопасный LRU-кэш с ограничением по размеру и времени жизни записи.
+    ttl <= 0 отключает кэш: get всегда промахивается, set ничего не хранит.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """ttl — время жизни этой записи вместо общего self.ttl."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key: Hashable, value: Any, ttl: float | None = None) -> bool:
+        """Записывает значение, только если ключа нет (или он истёк)."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return False
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING and item[0] > time.monotonic():
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MemoryBackend:
+    """Хранилище кэша ответов в памяти процесса (у каждого воркера своё)."""
+
+    # Вызовы не блокируют event loop
+    blocking = False
+
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=0)
+
+    def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return [self._cache.get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: float, nx: bool = False) -> bool:
+        if nx:
+            return self._cache.add(key, value, ttl=ttl)
+        self._cache.set(key, value, ttl=ttl)
+        return True
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class RedisBackend:
+    """
+    Redis-совместимое хранилище, общее для всех воркеров и реплик.
+    client — объект с методами mget(keys) и set(key, value, ex=, nx=),
+    как у redis.Redis.
+    """
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "roadmaps:"):
+        self._client = client
+        self._prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        # redis нужен только с этим бэкендом
+        import redis
+
+        return cls(redis.Redis.from_url(url))
+
+    def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return self._client.mget([self._prefix + key for key in keys])
+
+    def set(self, key: str, value: bytes, ttl: float, nx: bool = False) -> bool:
+        ex = max(int(ttl), 1)
+        return bool(self._client.set(self._prefix + key, value, ex=ex, nx=nx))
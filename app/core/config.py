@@ -14,8 +14,76 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     ALGORITHM: str = "HS256"
 
+    # Кэш аутентифицированных пользователей: сколько секунд можно не ходить
+    # в БД за пользователем из токена (0 — выключить) и сколько записей держать.
+    # Деактивация пользователя в этом процессе сбрасывает запись сразу,
+    # в других репликах — не позже чем через AUTH_CACHE_TTL_SECONDS.
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_SIZE: int = 10000
+
+    # pbkdf2 выполняется в отдельном пуле процессов (0 — в текущем потоке).
+    # Если ожидающих задач больше PASSWORD_HASH_MAX_PENDING, login/register
+    # сразу отвечают 503, не занимая потоки остальных запросов.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+
+    # HTTP- и SQL-метрики в формате Prometheus на GET /metrics
+    METRICS_ENABLED: bool = True
+
+    # Бюджет SQL-запросов на HTTP-запрос (см. app/api/query_budget.py):
+    # off, log — писать превышения и повторы запроса в лог,
+    # raise — падать при превышении бюджета (тесты/CI).
+    # QUERY_REPEAT_THRESHOLD — с какого повтора одной формы SQL подозревать N+1.
+    QUERY_BUDGET_MODE: str = "off"
+    QUERY_REPEAT_THRESHOLD: int = 5
+
+    # Серверный кэш ответов GET (списки, статистика, экспорт) по пользователю:
+    # memory — в процессе, redis — общий (RESPONSE_CACHE_URL), off — выключен.
+    # Запись сбрасывается коммитом, изменившим данные пользователя,
+    # и в любом случае живёт не дольше RESPONSE_CACHE_TTL_SECONDS.
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    RESPONSE_CACHE_MAX_BODY_BYTES: int = 1024 * 1024
+
     # База данных
     DATABASE_URL: AnyUrl | str = "sqlite:///./app.db"
+    # Read-реплики через запятую: GET/HEAD читают с них по кругу,
+    # запись и чтение после записи в том же запросе — с primary.
+    DATABASE_REPLICA_URLS: str = ""
+    # При старте сверять версию схемы с последней ревизией Alembic
+    # и не запускаться, если миграции не применены.
+    DB_SCHEMA_CHECK: bool = True
+
+    # Пул соединений (для PostgreSQL и файловой SQLite).
+    # DB_POOL_RECYCLE — пересоздавать соединения старше N секунд (-1 — никогда),
+    # DB_POOL_PRE_PING — проверять соединение перед выдачей из пула.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # PRAGMA для каждого нового соединения SQLite. WAL позволяет читать
+    # во время записи, busy_timeout — ждать блокировку вместо "database is locked".
+    # cache_size < 0 — в КиБ, mmap_size — в байтах.
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -64000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+
+    # Async-стек (AsyncSession, async-обработчики) — включается явно.
+    # Если ASYNC_DATABASE_URL не задан, драйвер выводится из DATABASE_URL:
+    # sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg.
+    ASYNC_DB: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+
+    @property
+    def replica_urls(self) -> list[str]:
+        urls = self.DATABASE_REPLICA_URLS.split(",")
+        return [url.strip() for url in urls if url.strip()]
 
     class Config:
         env_file = ".env"
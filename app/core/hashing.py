@@ -0,0 +1,75 @@
+"""
+Пул процессов для pbkdf2: хэширование и проверка паролей не занимают
+ни event loop, ни потоки Starlette дольше, чем нужно на ожидание результата.
+
+Число одновременно ожидающих задач ограничено; при переполнении сразу
+выбрасывается HashingPoolBusy (роуты превращают его в 503).
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any
+
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from app.core.config import settings
+from app.core.metrics import password_hash_rejected, password_hash_seconds
+
+
+class HashingPoolBusy(Exception):
+    pass
+
+
+class HashingPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Выполняет fn(*args) в пуле и ждёт результат. Внутри AsyncSession.run_sync
+        ожидание уступает event loop, в обычном потоке — блокирует только его.
+        workers=0 — выполнять на месте (dev/тесты без дочерних процессов).
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                password_hash_rejected.inc()
+                raise HashingPoolBusy("Password hashing pool is saturated")
+            self._pending += 1
+
+        started = time.perf_counter()
+        try:
+            if self.workers <= 0:
+                return fn(*args)
+            future: Future = self._get_executor().submit(fn, *args)
+            if in_greenlet():
+                return await_only(asyncio.wrap_future(future))
+            return future.result()
+        finally:
+            password_hash_seconds.observe(time.perf_counter() - started)
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_pool = HashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
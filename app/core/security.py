@@ -1,10 +1,11 @@
-from datetime import datetime, timedelta
-from typing import Any, Union
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.hashing import hashing_pool
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
@@ -12,22 +13,34 @@ JWT_SECRET_KEY: str = settings.SECRET_KEY.get_secret_value()
 JWT_ALGORITHM: str = settings.ALGORITHM
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _verify(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return hashing_pool.run(_verify, plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    return hashing_pool.run(_hash, password)
+
+
 def create_access_token(
-    subject: Union[str, int],
+    subject: str | int,
     expires_delta: timedelta | None = None,
+    is_active: bool | None = None,
 ) -> str:
     if expires_delta is None:
         expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    expire = datetime.utcnow() + expires_delta
+    expire = datetime.now(UTC) + expires_delta
     to_encode: dict[str, Any] = {"sub": str(subject), "exp": expire}
+    if is_active is not None:
+        # Статус на момент выдачи: неактивный токен отсекается без запроса в БД
+        to_encode["active"] = is_active
 
     encoded_jwt = jwt.encode(
         to_encode,
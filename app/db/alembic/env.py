@@ -0,0 +1,41 @@
+"""
+Окружение Alembic. URL базы — settings.DATABASE_URL (или engine,
+переданный через app.db.schema.alembic_config). Офлайн-режим (--sql)
+не поддерживается: ревизии читают данные (батчевые backfill).
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.db.schema import include_object
+from app.models import Base
+
+if context.config.config_file_name is not None:
+    fileConfig(context.config.config_file_name, disable_existing_loggers=False)
+
+
+def run_migrations() -> None:
+    engine = context.config.attributes.get("engine")
+    if engine is None:
+        engine = create_engine(str(settings.DATABASE_URL))
+
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=Base.metadata,
+            include_object=include_object,
+            # SQLite не умеет большинство ALTER TABLE
+            render_as_batch=connection.dialect.name == "sqlite",
+            transaction_per_migration=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        connection.commit()
+
+
+if context.is_offline_mode():
+    raise SystemExit("Offline (--sql) migrations are not supported")
+run_migrations()
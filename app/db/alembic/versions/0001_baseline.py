@@ -0,0 +1,82 @@
+"""Базовая схема — как её создавал Base.metadata.create_all до перехода на Alembic
+
+Существующую базу, созданную create_all, помечают этой ревизией
+(`alembic stamp 0001_baseline`) и затем обновляют до head: таблицы и индексы,
+появившиеся позже, и их данные добавляют следующие ревизии.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+milestone_status = sa.Enum(
+    "PLANNED", "IN_PROGRESS", "DONE", "CANCELLED", name="milestone_status"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(255), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "roadmaps",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "owner_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("tags", sa.String(), nullable=True),
+        sa.Column("is_archived", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_roadmaps_id", "roadmaps", ["id"])
+    op.create_index("ix_roadmaps_title", "roadmaps", ["title"])
+
+    op.create_table(
+        "milestones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "roadmap_id",
+            sa.Integer(),
+            sa.ForeignKey("roadmaps.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("due_at", sa.Date(), nullable=False),
+        sa.Column("status", milestone_status, nullable=False),
+        sa.Column("sort_order", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_milestones_id", "milestones", ["id"])
+    op.create_index("ix_milestones_title", "milestones", ["title"])
+
+
+def downgrade() -> None:
+    op.drop_table("milestones")
+    op.drop_table("roadmaps")
+    op.drop_table("users")
+    milestone_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,179 @@
+"""user_stats, roadmap_tags, полнотекстовый индекс и индекс списка roadmaps
+
+Таблицы появились после перехода от create_all; в базе, помеченной
+0001_baseline, их нет. Ревизия создаёт их и заполняет по существующим данным:
+счётчики /stats — одним INSERT ... SELECT с GROUP BY по владельцам, теги —
+разбором строки roadmaps.tags, поисковый индекс — INSERT ... SELECT батчами
+по id. milestones.owner_id ещё нет (ревизия 0004) — владелец берётся из roadmaps.
+
+Revision ID: 0002_stats_tags_search
+Revises: 0001_baseline
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.api.utils import tags_string_to_list
+from app.db import online_ops
+from app.models import search
+from app.models.milestone import MilestoneStatus
+
+revision = "0002_stats_tags_search"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+# Длина roadmap_tags.tag; более длинные теги в фильтр не попадают
+_MAX_TAG_LENGTH = 50
+
+_STATS_BY_STATUS = ", ".join(
+    f"sum(CASE WHEN milestones.status = '{s.name}' THEN 1 ELSE 0 END) AS {s.value}"
+    for s in MilestoneStatus
+)
+
+_STATS_BACKFILL = f"""
+    INSERT INTO user_stats (
+        user_id, total_roadmaps, total_milestones,
+        {", ".join(f"milestones_{s.value}" for s in MilestoneStatus)}, updated_at
+    )
+    SELECT
+        users.id, coalesce(r.total, 0), coalesce(m.total, 0),
+        {", ".join(f"coalesce(m.{s.value}, 0)" for s in MilestoneStatus)},
+        CURRENT_TIMESTAMP
+    FROM users
+    LEFT JOIN (
+        SELECT owner_id, count(*) AS total FROM roadmaps GROUP BY owner_id
+    ) AS r ON r.owner_id = users.id
+    LEFT JOIN (
+        SELECT roadmaps.owner_id, count(*) AS total, {_STATS_BY_STATUS}
+        FROM milestones JOIN roadmaps ON roadmaps.id = milestones.roadmap_id
+        GROUP BY roadmaps.owner_id
+    ) AS m ON m.owner_id = users.id
+"""
+
+# kind -> (таблица-источник, FROM, object_id, owner_id, roadmap_id, title, description)
+_DOCUMENTS = {
+    search.KIND_ROADMAP: (
+        "roadmaps",
+        "roadmaps",
+        "roadmaps.id",
+        "roadmaps.owner_id",
+        "roadmaps.id",
+        "roadmaps.title",
+        "roadmaps.description",
+    ),
+    search.KIND_MILESTONE: (
+        "milestones",
+        "milestones JOIN roadmaps ON roadmaps.id = milestones.roadmap_id",
+        "milestones.id",
+        "roadmaps.owner_id",
+        "milestones.roadmap_id",
+        "milestones.title",
+        "milestones.description",
+    ),
+}
+
+
+def _create_user_stats() -> None:
+    op.create_table(
+        "user_stats",
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("total_roadmaps", sa.Integer(), nullable=False),
+        sa.Column("total_milestones", sa.Integer(), nullable=False),
+        sa.Column("milestones_planned", sa.Integer(), nullable=False),
+        sa.Column("milestones_in_progress", sa.Integer(), nullable=False),
+        sa.Column("milestones_done", sa.Integer(), nullable=False),
+        sa.Column("milestones_cancelled", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.execute(_STATS_BACKFILL)
+
+
+def _create_roadmap_tags() -> None:
+    op.create_table(
+        "roadmap_tags",
+        sa.Column(
+            "roadmap_id",
+            sa.Integer(),
+            sa.ForeignKey("roadmaps.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("tag", sa.String(_MAX_TAG_LENGTH), primary_key=True),
+    )
+    op.create_index(
+        "ix_roadmap_tags_tag_roadmap", "roadmap_tags", ["tag", "roadmap_id"]
+    )
+
+    select = sa.text(
+        "SELECT id, tags FROM roadmaps WHERE id > :last_id AND tags <> '' "
+        "ORDER BY id LIMIT :limit"
+    )
+    insert = sa.text(
+        "INSERT INTO roadmap_tags (roadmap_id, tag) VALUES (:roadmap_id, :tag)"
+    )
+    last_id = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while rows := bind.execute(
+            select, {"last_id": last_id, "limit": online_ops.BATCH_SIZE}
+        ).all():
+            last_id = rows[-1].id
+            values = [
+                {"roadmap_id": row.id, "tag": tag}
+                for row in rows
+                for tag in dict.fromkeys(tags_string_to_list(row.tags))
+                if len(tag) <= _MAX_TAG_LENGTH
+            ]
+            if values:
+                bind.execute(insert, values)
+
+
+def _create_search_index() -> None:
+    bind = op.get_bind()
+    search.create_search_index(None, bind)
+    for kind, document in _DOCUMENTS.items():
+        source, from_, object_id, owner_id, roadmap_id, title, description = document
+        if bind.dialect.name == "postgresql":
+            table = "search_documents"
+            columns = ["kind", "object_id", "owner_id", "roadmap_id"]
+            values = [f"'{kind}'", object_id, owner_id, roadmap_id]
+        else:
+            # rowid = id * 2 + смещение вида (search._rowid)
+            table = "search_fts"
+            columns = ["rowid", "kind", "object_id", "owner_id", "roadmap_id"]
+            values = [
+                f"{object_id} * 2 + {search._KIND_OFFSET[kind]}",
+                f"'{kind}'",
+                object_id,
+                owner_id,
+                roadmap_id,
+            ]
+            description = f"coalesce({description}, '')"
+        online_ops.batched_insert(
+            table,
+            columns + ["title", "description"],
+            f"SELECT {', '.join(values)}, {title}, {description} FROM {from_}",
+            source,
+        )
+
+
+def upgrade() -> None:
+    online_ops.create_index(
+        "ix_roadmaps_owner_created_id", "roadmaps", ["owner_id", "created_at", "id"]
+    )
+    _create_user_stats()
+    _create_roadmap_tags()
+    _create_search_index()
+
+
+def downgrade() -> None:
+    search.drop_search_index(None, op.get_bind())
+    op.drop_table("roadmap_tags")
+    op.drop_table("user_stats")
+    online_ops.drop_index("ix_roadmaps_owner_created_id", "roadmaps")
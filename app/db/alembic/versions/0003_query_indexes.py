@@ -0,0 +1,40 @@
+"""Индексы под запросы API вместо индексов по title и дублей PK
+
+Revision ID: 0003_query_indexes
+Revises: 0002_stats_tags_search
+Create Date: 2026-10-17
+"""
+
+from app.db import online_ops
+
+revision = "0003_query_indexes"
+down_revision = "0002_stats_tags_search"
+branch_labels = None
+depends_on = None
+
+_CREATED = [
+    ("ix_roadmaps_owner_id_id", "roadmaps", ["owner_id", "id"]),
+    ("ix_milestones_roadmap_sort", "milestones", ["roadmap_id", "sort_order", "id"]),
+]
+
+_DROPPED = [
+    ("ix_roadmaps_id", "roadmaps", ["id"]),
+    ("ix_roadmaps_title", "roadmaps", ["title"]),
+    ("ix_milestones_id", "milestones", ["id"]),
+    ("ix_milestones_title", "milestones", ["title"]),
+]
+
+
+def upgrade() -> None:
+    # Сначала новые индексы, потом удаление старых — запросы не остаются без индекса
+    for name, table, columns in _CREATED:
+        online_ops.create_index(name, table, columns)
+    for name, table, _ in _DROPPED:
+        online_ops.drop_index(name, table)
+
+
+def downgrade() -> None:
+    for name, table, columns in _DROPPED:
+        online_ops.create_index(name, table, columns)
+    for name, table, _ in _CREATED:
+        online_ops.drop_index(name, table)
@@ -0,0 +1,55 @@
+"""milestones.owner_id — копия владельца roadmap для проверок без join
+
+Колонка добавляется nullable, заполняется батчами, затем получает
+NOT NULL и внешний ключ.
+
+Revision ID: 0004_milestone_owner_id
+Revises: 0003_query_indexes
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import online_ops
+
+revision = "0004_milestone_owner_id"
+down_revision = "0003_query_indexes"
+branch_labels = None
+depends_on = None
+
+_ROADMAP_OWNER = (
+    "(SELECT owner_id FROM roadmaps WHERE roadmaps.id = milestones.roadmap_id)"
+)
+
+
+def upgrade() -> None:
+    online_ops.add_nullable_column(
+        "milestones", sa.Column("owner_id", sa.Integer(), nullable=True)
+    )
+    online_ops.batched_update(
+        "milestones",
+        f"owner_id = {_ROADMAP_OWNER}",
+        where=f"owner_id IS NULL OR owner_id <> {_ROADMAP_OWNER}",
+    )
+    online_ops.set_not_null("milestones", "owner_id", existing_type=sa.Integer())
+    online_ops.add_foreign_key(
+        "milestones_owner_id_fkey",
+        "milestones",
+        "users",
+        ["owner_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    online_ops.create_index(
+        "ix_milestones_owner_due_id_status",
+        "milestones",
+        ["owner_id", "due_at", "id", "status"],
+    )
+
+
+def downgrade() -> None:
+    online_ops.drop_index("ix_milestones_owner_due_id_status", "milestones")
+    with op.batch_alter_table("milestones") as batch:
+        batch.drop_constraint("milestones_owner_id_fkey", type_="foreignkey")
+        batch.drop_column("owner_id")
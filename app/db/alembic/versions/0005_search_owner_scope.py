@@ -0,0 +1,65 @@
+"""search_fts: owner_id и kind — индексируемые колонки FTS5
+
+Условие на владельца входит в MATCH, и поиск читает вхождения только его
+документов. Колонку FTS5 изменить нельзя: таблица пересоздаётся и
+заполняется из roadmaps и milestones одним INSERT ... SELECT на вид.
+PostgreSQL (search_documents) не меняется.
+
+Revision ID: 0005_search_owner_scope
+Revises: 0004_milestone_owner_id
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+from app.models import search
+
+revision = "0005_search_owner_scope"
+down_revision = "0004_milestone_owner_id"
+branch_labels = None
+depends_on = None
+
+_DDL = """
+    CREATE VIRTUAL TABLE search_fts USING fts5(
+        title,
+        description,
+        kind{scope},
+        object_id UNINDEXED,
+        owner_id{scope},
+        roadmap_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+
+# rowid = id * 2 + смещение вида (search._rowid)
+_REFILL = [
+    (
+        "INSERT INTO search_fts "
+        "(rowid, title, description, kind, object_id, owner_id, roadmap_id) "
+        "SELECT id * 2, title, coalesce(description, ''), "
+        f"'{search.KIND_ROADMAP}', id, owner_id, id FROM roadmaps"
+    ),
+    (
+        "INSERT INTO search_fts "
+        "(rowid, title, description, kind, object_id, owner_id, roadmap_id) "
+        "SELECT id * 2 + 1, title, coalesce(description, ''), "
+        f"'{search.KIND_MILESTONE}', id, owner_id, roadmap_id FROM milestones"
+    ),
+]
+
+
+def _recreate(scope: str) -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute("DROP TABLE IF EXISTS search_fts")
+    op.execute(_DDL.format(scope=scope))
+    for statement in _REFILL:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _recreate(scope="")
+
+
+def downgrade() -> None:
+    _recreate(scope=" UNINDEXED")
@@ -0,0 +1,25 @@
+"""Индекс (roadmap_id, due_at, status) под сводку milestones по roadmap
+
+Revision ID: 0006_roadmap_due_status
+Revises: 0005_search_owner_scope
+Create Date: 2026-10-17
+"""
+
+from app.db import online_ops
+
+revision = "0006_roadmap_due_status"
+down_revision = "0005_search_owner_scope"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    online_ops.create_index(
+        "ix_milestones_roadmap_due_status",
+        "milestones",
+        ["roadmap_id", "due_at", "status"],
+    )
+
+
+def downgrade() -> None:
+    online_ops.drop_index("ix_milestones_roadmap_due_status", "milestones")
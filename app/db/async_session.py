@@ -0,0 +1,53 @@
+from collections.abc import AsyncIterator
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.pool import engine_options, install_sqlite_pragmas
+from app.db.routing import ReplicaSet, RoutingSession, reads_from_replica
+
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    sqlite:///./app.db -> sqlite+aiosqlite:///./app.db и т.п.
+    URL, где драйвер уже указан явно, возвращается как есть.
+    """
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def _create_async_engine(url: str):
+    engine = create_async_engine(url, **engine_options(url, is_async=True))
+    install_sqlite_pragmas(engine.sync_engine)
+    return engine
+
+
+async_engine = _create_async_engine(
+    settings.ASYNC_DATABASE_URL or async_database_url(str(settings.DATABASE_URL))
+)
+
+# RoutingSession работает с sync-движками, под которыми лежат async-движки реплик
+async_replicas = ReplicaSet(
+    _create_async_engine(async_database_url(url)).sync_engine
+    for url in settings.replica_urls
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=True,
+    replicas=async_replicas,
+)
+
+
+async def get_async_db(request: Request) -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal(use_replicas=reads_from_replica(request)) as db:
+        yield db
@@ -1,3 +1,10 @@
+from datetime import UTC, datetime
+
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+
+def utcnow() -> datetime:
+    # Колонки DateTime хранят naive UTC
+    return datetime.now(UTC).replace(tzinfo=None)
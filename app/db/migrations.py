@@ -0,0 +1,188 @@
+"""
+Разовые операции над данными: backfill, пересборка индекса поиска,
+проверки согласованности. Каждая функция идемпотентна и запускается вручную:
+
+    python -m app.db.migrations backfill_roadmap_tags
+
+Схема (таблицы, колонки, индексы) — только в ревизиях Alembic, см. app/db/schema.py.
+"""
+
+import sys
+
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.engine import Engine
+
+from app.api.utils import tags_string_to_list
+from app.models import search as search_index
+from app.models.milestone import Milestone
+from app.models.roadmap import Roadmap
+from app.models.roadmap_tag import RoadmapTag
+
+BATCH_SIZE = 1000
+
+
+def backfill_roadmap_tags(engine: Engine, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Заполняет roadmap_tags из строковой колонки Roadmap.tags.
+    Идёт батчами по id, чтобы не держать длинную транзакцию;
+    уже существующие пары (roadmap_id, tag) пропускаются.
+    """
+    inserted = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(Roadmap.id, Roadmap.tags)
+                .where(Roadmap.id > last_id)
+                .order_by(Roadmap.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            ids = [row.id for row in rows]
+            existing = set(
+                conn.execute(
+                    select(RoadmapTag.roadmap_id, RoadmapTag.tag).where(
+                        RoadmapTag.roadmap_id.in_(ids)
+                    )
+                ).all()
+            )
+            values = [
+                {"roadmap_id": row.id, "tag": tag}
+                for row in rows
+                for tag in tags_string_to_list(row.tags)
+                if (row.id, tag) not in existing
+            ]
+            if values:
+                conn.execute(insert(RoadmapTag), values)
+                inserted += len(values)
+    return inserted
+
+
+def rebuild_search_index(engine: Engine, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Создаёт полнотекстовый индекс (если его нет) и переиндексирует
+    все roadmaps и milestones батчами по id.
+    """
+    with engine.begin() as conn:
+        search_index.create_search_index(None, conn)
+
+    queries = [
+        (
+            search_index.KIND_ROADMAP,
+            select(
+                Roadmap.id,
+                Roadmap.owner_id,
+                Roadmap.id.label("roadmap_id"),
+                Roadmap.title,
+                Roadmap.description,
+            ),
+            Roadmap.id,
+        ),
+        (
+            search_index.KIND_MILESTONE,
+            select(
+                Milestone.id,
+                Milestone.owner_id,
+                Milestone.roadmap_id,
+                Milestone.title,
+                Milestone.description,
+            ),
+            Milestone.id,
+        ),
+    ]
+
+    indexed = 0
+    for kind, query, id_column in queries:
+        last_id = 0
+        while True:
+            with engine.begin() as conn:
+                rows = conn.execute(
+                    query.where(id_column > last_id)
+                    .order_by(id_column)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                search_index.index_documents(conn, kind, rows)
+                indexed += len(rows)
+    return indexed
+
+
+def _roadmap_owner():
+    return (
+        select(Roadmap.owner_id)
+        .where(Roadmap.id == Milestone.roadmap_id)
+        .scalar_subquery()
+    )
+
+
+def _owner_mismatch():
+    owner = _roadmap_owner()
+    return or_(Milestone.owner_id.is_(None), Milestone.owner_id != owner)
+
+
+def backfill_milestone_owner_id(engine: Engine, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Исправляет расхождения, найденные check_milestone_owner_id:
+    переписывает owner_id из roadmaps.owner_id батчами по диапазонам id.
+    Колонку добавляет ревизия 0004_milestone_owner_id.
+    """
+    with engine.connect() as conn:
+        max_id = conn.execute(select(func.max(Milestone.id))).scalar() or 0
+
+    updated = 0
+    for start in range(0, max_id, batch_size):
+        with engine.begin() as conn:
+            updated += conn.execute(
+                update(Milestone.__table__)
+                .where(
+                    Milestone.id > start,
+                    Milestone.id <= start + batch_size,
+                    _owner_mismatch(),
+                )
+                .values(owner_id=_roadmap_owner())
+            ).rowcount
+    return updated
+
+
+def check_milestone_owner_id(engine: Engine, limit: int = 1000) -> list[int]:
+    """
+    Проверка согласованности: id milestones (не больше limit), у которых
+    owner_id пуст или не совпадает с владельцем roadmap.
+    Исправляются повторным запуском backfill_milestone_owner_id.
+    """
+    with engine.connect() as conn:
+        return list(
+            conn.execute(
+                select(Milestone.id)
+                .where(_owner_mismatch())
+                .order_by(Milestone.id)
+                .limit(limit)
+            ).scalars()
+        )
+
+
+# Порядок важен при запуске без аргументов: индекс поиска читает milestones.owner_id
+MIGRATIONS = {
+    "backfill_roadmap_tags": backfill_roadmap_tags,
+    "backfill_milestone_owner_id": backfill_milestone_owner_id,
+    "rebuild_search_index": rebuild_search_index,
+    "check_milestone_owner_id": check_milestone_owner_id,
+}
+
+
+def main(argv: list[str]) -> None:
+    from app.db.session import engine
+
+    names = argv or list(MIGRATIONS)
+    for name in names:
+        result = MIGRATIONS[name](engine)
+        print(f"{name}: {result}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,151 @@
+"""
+Операции для ревизий Alembic, которые можно выполнять на больших таблицах
+под нагрузкой.
+
+PostgreSQL: индексы строятся CONCURRENTLY вне транзакции миграции,
+внешние ключи и NOT NULL ставятся через NOT VALID + VALIDATE (без долгой
+ACCESS EXCLUSIVE блокировки), данные переносятся батчами по диапазонам id —
+каждый батч отдельной транзакцией.
+SQLite: те же операции в обычном виде (ALTER через batch-режим Alembic).
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+BATCH_SIZE = 1000
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def has_column(table: str, column: str) -> bool:
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    return any(c["name"] == column for c in columns)
+
+
+def has_index(table: str, name: str) -> bool:
+    return any(
+        ix["name"] == name for ix in sa.inspect(op.get_bind()).get_indexes(table)
+    )
+
+
+def create_index(name: str, table: str, columns: list[str]) -> None:
+    if has_index(table, name):
+        return
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+    else:
+        op.create_index(name, table, columns)
+
+
+def drop_index(name: str, table: str) -> None:
+    if not has_index(table, name):
+        return
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    else:
+        op.drop_index(name, table_name=table)
+
+
+def add_nullable_column(table: str, column: sa.Column) -> None:
+    """Nullable-колонка без default — без перезаписи таблицы."""
+    if not has_column(table, column.name):
+        op.add_column(table, column)
+
+
+def batched_update(
+    table: str,
+    values: str,
+    where: str = "1 = 1",
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """
+    UPDATE table SET values WHERE where — по диапазонам id,
+    каждый диапазон коммитится отдельно. Повторный запуск безопасен,
+    если where отбирает только ещё не обработанные строки.
+    """
+    max_id = op.get_bind().execute(sa.text(f"SELECT max(id) FROM {table}")).scalar()
+    stmt = sa.text(
+        f"UPDATE {table} SET {values} WHERE id > :low AND id <= :high AND ({where})"
+    )
+    updated = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for low in range(0, max_id or 0, batch_size):
+            updated += bind.execute(
+                stmt, {"low": low, "high": low + batch_size}
+            ).rowcount
+    return updated
+
+
+def batched_insert(
+    table: str,
+    columns: list[str],
+    select: str,
+    source: str,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """
+    INSERT INTO table (columns) select — по диапазонам source.id, каждый
+    диапазон коммитится отдельно. select — SELECT ... FROM source без WHERE.
+    """
+    max_id = op.get_bind().execute(sa.text(f"SELECT max(id) FROM {source}")).scalar()
+    stmt = sa.text(
+        f"INSERT INTO {table} ({', '.join(columns)}) {select} "
+        f"WHERE {source}.id > :low AND {source}.id <= :high"
+    )
+    inserted = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for low in range(0, max_id or 0, batch_size):
+            inserted += bind.execute(
+                stmt, {"low": low, "high": low + batch_size}
+            ).rowcount
+    return inserted
+
+
+def set_not_null(table: str, column: str, existing_type) -> None:
+    if not _is_postgres():
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(column, existing_type=existing_type, nullable=False)
+        return
+    # Проверенный CHECK позволяет SET NOT NULL не сканировать таблицу (PG 12+)
+    check = f"{table}_{column}_not_null"
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {check} "
+            f"CHECK ({column} IS NOT NULL) NOT VALID"
+        )
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {check}")
+    op.alter_column(table, column, existing_type=existing_type, nullable=False)
+    op.drop_constraint(check, table, type_="check")
+
+
+def add_foreign_key(
+    name: str,
+    table: str,
+    referent: str,
+    local_cols: list[str],
+    remote_cols: list[str],
+    ondelete: str | None = None,
+) -> None:
+    if not _is_postgres():
+        with op.batch_alter_table(table) as batch:
+            batch.create_foreign_key(
+                name, referent, local_cols, remote_cols, ondelete=ondelete
+            )
+        return
+    with op.get_context().autocommit_block():
+        op.create_foreign_key(
+            name,
+            table,
+            referent,
+            local_cols,
+            remote_cols,
+            ondelete=ondelete,
+            postgresql_not_valid=True,
+        )
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
@@ -0,0 +1,66 @@
+"""
+Маршрутизация запросов между primary и read-репликами (DATABASE_REPLICA_URLS).
+
+Сессия read-only HTTP-запроса (GET/HEAD) читает с одной реплики, выбранной
+по кругу. Первая запись (flush или DML) переключает сессию на primary до конца
+запроса, так что чтение после записи видит свои изменения.
+"""
+
+import itertools
+from collections.abc import Iterable
+
+from fastapi import Request
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+
+class ReplicaSet:
+    def __init__(self, engines: Iterable[Engine] = ()):
+        self.engines = list(engines)
+        self._counter = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def next(self) -> Engine:
+        return self.engines[next(self._counter) % len(self.engines)]
+
+
+def reads_from_replica(request: Request) -> bool:
+    return request.method in READ_ONLY_METHODS
+
+
+def use_primary(db: Session) -> None:
+    """Чтение, результат которого будет записан, не должно идти с отстающей реплики."""
+    if isinstance(db, RoutingSession):
+        db.use_primary()
+
+
+class RoutingSession(Session):
+    def __init__(
+        self,
+        *args,
+        replicas: ReplicaSet | None = None,
+        use_replicas: bool = False,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._replicas = replicas
+        self._use_replicas = bool(use_replicas and replicas)
+        self._replica: Engine | None = None
+
+    def use_primary(self) -> None:
+        """Все дальнейшие запросы сессии — на primary."""
+        self._use_replicas = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._use_replicas and (self._flushing or getattr(clause, "is_dml", False)):
+            self.use_primary()
+        if not self._use_replicas:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        # Одна реплика на сессию — согласованное чтение в пределах запроса
+        if self._replica is None:
+            self._replica = self._replicas.next()
+        return self._replica
@@ -0,0 +1,93 @@
+"""
+Версия схемы БД. Схема создаётся и меняется только ревизиями Alembic
+(app/db/alembic/versions); приложение при старте лишь сверяет версию.
+
+    alembic upgrade head                  # из корня проекта (alembic.ini)
+    python -m app.db.schema upgrade       # то же без alembic.ini
+    python -m app.db.schema stamp 0001_baseline   # база от create_all
+"""
+
+import sys
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Engine
+
+SCRIPT_LOCATION = Path(__file__).with_name("alembic")
+
+# Полнотекстовый индекс создаётся собственным DDL (app/models/search.py)
+# и не описан в metadata — autogenerate его не трогает.
+_UNMANAGED_PREFIXES = ("search_fts", "search_documents")
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    return not (type_ == "table" and name.startswith(_UNMANAGED_PREFIXES))
+
+
+def alembic_config(engine: Engine | None = None) -> Config:
+    config = Config()
+    config.set_main_option("script_location", str(SCRIPT_LOCATION))
+    if engine is not None:
+        # env.py возьмёт готовый engine вместо settings.DATABASE_URL
+        config.attributes["engine"] = engine
+    return config
+
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(engine: Engine) -> str | None:
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+
+def verify_schema(engine: Engine) -> None:
+    """Бросает SchemaVersionError, если база не на последней ревизии."""
+    current, head = current_revision(engine), head_revision()
+    if current != head:
+        raise SchemaVersionError(
+            f"Database schema is at revision {current}, expected {head}. "
+            "Run `alembic upgrade head` before starting the application."
+        )
+
+
+def upgrade(engine: Engine, revision: str = "head") -> None:
+    command.upgrade(alembic_config(engine), revision)
+
+
+def downgrade(engine: Engine, revision: str) -> None:
+    command.downgrade(alembic_config(engine), revision)
+
+
+def stamp(engine: Engine, revision: str) -> None:
+    """Помечает базу ревизией без выполнения миграций."""
+    command.stamp(alembic_config(engine), revision)
+
+
+def main(argv: list[str]) -> None:
+    from app.db.session import engine
+
+    action, *rest = argv or ["upgrade"]
+    if action == "upgrade":
+        upgrade(engine, *rest)
+    elif action == "downgrade":
+        downgrade(engine, *rest)
+    elif action == "stamp":
+        stamp(engine, *rest)
+    elif action == "check":
+        verify_schema(engine)
+    else:
+        raise SystemExit(f"Unknown action: {action}")
+    print(f"schema revision: {current_revision(engine)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
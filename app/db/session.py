@@ -1,28 +1,35 @@
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.pool import engine_options, install_sqlite_pragmas
+from app.db.routing import ReplicaSet, RoutingSession, reads_from_replica
 
-connect_args = {}
-if str(settings.DATABASE_URL).startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
 
-engine = create_engine(
-    str(settings.DATABASE_URL),
-    connect_args=connect_args,
-    future=True,
-)
+def _create_engine(url: str):
+    engine = create_engine(url, future=True, **engine_options(url))
+    install_sqlite_pragmas(engine)
+    return engine
+
+
+engine = _create_engine(str(settings.DATABASE_URL))
+
+replicas = ReplicaSet(_create_engine(url) for url in settings.replica_urls)
 
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     bind=engine,
     future=True,
+    replicas=replicas,
 )
 
 
-def get_db() -> Session:
-    db = SessionLocal()
+def get_db(request: Request) -> Session:
+    # GET/HEAD читают с реплики (если они настроены), запись — на primary
+    db = SessionLocal(use_replicas=reads_from_replica(request))
     try:
         yield db
     finally:
@@ -1,23 +1,72 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 from app.api import api_router
+from app.api.metrics import CONTENT_TYPE, MetricsMiddleware
+from app.api.query_budget import QueryBudgetMiddleware
+from app.api.response_cache import ResponseCacheMiddleware, cache_metrics
 from app.core.config import settings
-from app.db.session import engine
-from app.models import Base
+from app.core.hashing import hashing_pool
+from app.core.metrics import registry
+from app.db.pool import pool_snapshot
+from app.db.schema import verify_schema
+from app.db.session import engine, replicas
 
 
-def create_app() -> FastAPI:
+def create_app(async_db: bool | None = None) -> FastAPI:
     app = FastAPI(title=settings.PROJECT_NAME)
+    app.add_middleware(ResponseCacheMiddleware)
+    if settings.QUERY_BUDGET_MODE != "off":
+        app.add_middleware(QueryBudgetMiddleware)
+    if settings.METRICS_ENABLED:
+        # Внешний слой: замеряет и ответы из кэша
+        app.add_middleware(MetricsMiddleware)
 
     @app.on_event("startup")
     def on_startup():
-        Base.metadata.create_all(bind=engine)
+        # Схему создают и меняют только миграции (alembic upgrade head)
+        if settings.DB_SCHEMA_CHECK:
+            verify_schema(engine)
+
+    @app.on_event("shutdown")
+    def on_shutdown():
+        hashing_pool.shutdown()
 
     @app.get("/healthz")
     def healthz():
         return {"status": "ok"}
 
-    app.include_router(api_router, prefix=settings.API_V1_PREFIX)
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
+    @app.get("/metrics/response-cache")
+    def response_cache_metrics():
+        return cache_metrics()
+
+    @app.get("/metrics/db-pool")
+    def db_pool_metrics():
+        metrics = {
+            "primary": pool_snapshot(engine),
+            "replicas": [pool_snapshot(replica) for replica in replicas.engines],
+        }
+        if async_db:
+            from app.db.async_session import async_engine, async_replicas
+
+            metrics["async"] = pool_snapshot(async_engine.sync_engine)
+            metrics["async_replicas"] = [
+                pool_snapshot(replica) for replica in async_replicas.engines
+            ]
+        return metrics
+
+    if async_db is None:
+        async_db = settings.ASYNC_DB
+    if async_db:
+        # aiosqlite/asyncpg нужны только в async-режиме
+        from app.api.async_routes import install_async_api
+
+        install_async_api(app, api_router, prefix=settings.API_V1_PREFIX)
+    else:
+        app.include_router(api_router, prefix=settings.API_V1_PREFIX)
     return app
 
 
@@ -1,6 +1,9 @@
 from app.db.base import Base
+from app.models import search  # noqa: F401  (DDL и синхронизация FTS-индекса)
 from app.models.milestone import Milestone
 from app.models.roadmap import Roadmap
+from app.models.roadmap_tag import RoadmapTag
 from app.models.user import User
+from app.models.user_stats import UserStats
 
-__all__ = ["Base", "Milestone", "Roadmap", "User"]
+__all__ = ["Base", "Milestone", "Roadmap", "RoadmapTag", "User", "UserStats"]
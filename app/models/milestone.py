@@ -1,10 +1,24 @@
 import enum
-from datetime import datetime
+from datetime import date
 
-from sqlalchemy import Column, Date, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    event,
+    inspect,
+    select,
+    update,
+)
 from sqlalchemy.orm import relationship
 
-from app.db.base import Base
+from app.db.base import Base, utcnow
+from app.models.roadmap import Roadmap
 
 
 class MilestoneStatus(str, enum.Enum):
@@ -17,12 +31,17 @@ class MilestoneStatus(str, enum.Enum):
 class Milestone(Base):
     __tablename__ = "milestones"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     roadmap_id = Column(
         Integer, ForeignKey("roadmaps.id", ondelete="CASCADE"), nullable=False
     )
+    # Копия Roadmap.owner_id: проверка владельца без join с roadmaps.
+    # Заполняется и поддерживается событиями ниже.
+    owner_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
 
-    title = Column(String(255), nullable=False, index=True)
+    title = Column(String(255), nullable=False)
     description = Column(String, nullable=True)
 
     due_at = Column(Date, nullable=False)
@@ -34,12 +53,69 @@ class Milestone(Base):
 
     sort_order = Column(Integer, default=0, nullable=False)
 
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
     updated_at = Column(
         DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        default=utcnow,
+        onupdate=utcnow,
         nullable=False,
     )
 
     roadmap = relationship("Roadmap", back_populates="milestones")
+
+    __table_args__ = (
+        # list_milestones: owner_id = ? ORDER BY due_at, id (+ keyset);
+        # /stats: owner_id = ? AND due_at <= ? — status берётся из индекса
+        Index(
+            "ix_milestones_owner_due_id_status", "owner_id", "due_at", "id", "status"
+        ),
+        # экспорт и Roadmap.milestones: roadmap_id = ? ORDER BY sort_order, id
+        Index("ix_milestones_roadmap_sort", "roadmap_id", "sort_order", "id"),
+        # include=stats: roadmap_id IN (...) GROUP BY roadmap_id со счётчиками
+        # по status и due_at — покрывающий индекс, строки таблицы не читаются
+        Index("ix_milestones_roadmap_due_status", "roadmap_id", "due_at", "status"),
+    )
+
+
+def is_overdue(today: date):
+    """
+    Условие «просрочен»: дедлайн раньше today и статус не done. Одно
+    определение для /stats и сводки roadmap (include=stats).
+    """
+    return (Milestone.status != MilestoneStatus.DONE) & (Milestone.due_at < today)
+
+
+def _roadmap_owner_id(connection, target: Milestone) -> int | None:
+    # Если roadmap уже загружен в сессию (пакетные операции), обходимся без запроса
+    roadmap = inspect(target).dict.get("roadmap")
+    if roadmap is not None and roadmap.id == target.roadmap_id:
+        return roadmap.owner_id
+    return connection.execute(
+        select(Roadmap.owner_id).where(Roadmap.id == target.roadmap_id)
+    ).scalar()
+
+
+@event.listens_for(Milestone, "before_insert")
+def _fill_owner_id(mapper, connection, target: Milestone) -> None:
+    if target.owner_id is None:
+        target.owner_id = _roadmap_owner_id(connection, target)
+
+
+@event.listens_for(Milestone, "before_update")
+def _follow_roadmap(mapper, connection, target: Milestone) -> None:
+    if inspect(target).attrs.roadmap_id.history.has_changes():
+        target.owner_id = _roadmap_owner_id(connection, target)
+
+
+@event.listens_for(Roadmap, "after_update")
+def _roadmap_owner_changed(mapper, connection, target: Roadmap) -> None:
+    # Массовый query.update(owner_id) это событие не вызывает —
+    # расхождения находит check_milestone_owner_id (app/db/migrations.py)
+    if not inspect(target).attrs.owner_id.history.has_changes():
+        return
+    table = Milestone.__table__
+    connection.execute(
+        update(table)
+        .where(table.c.roadmap_id == target.id)
+        .values(owner_id=target.owner_id)
+    )
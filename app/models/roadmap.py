@@ -1,30 +1,28 @@
-from datetime import datetime
-
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 
 class Roadmap(Base):
     __tablename__ = "roadmaps"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     owner_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
 
-    title = Column(String(255), nullable=False, index=True)
+    title = Column(String(255), nullable=False)
     description = Column(String, nullable=True)
 
     tags = Column(String, nullable=True)
 
     is_archived = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
     updated_at = Column(
         DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        default=utcnow,
+        onupdate=utcnow,
         nullable=False,
     )
 
@@ -35,3 +33,14 @@ class Roadmap(Base):
         cascade="all, delete-orphan",
         order_by="Milestone.sort_order",
     )
+    tag_rows = relationship(
+        "RoadmapTag",
+        cascade="all, delete-orphan",
+    )
+
+    __table_args__ = (
+        # list_roadmaps: owner_id = ? ORDER BY created_at DESC, id DESC (+ keyset)
+        Index("ix_roadmaps_owner_created_id", "owner_id", "created_at", "id"),
+        # экспорт всех roadmaps и проверки владения: owner_id = ? AND id > ?
+        Index("ix_roadmaps_owner_id_id", "owner_id", "id"),
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+
+from app.db.base import Base
+
+
+class RoadmapTag(Base):
+    """
+    Нормализованные теги: одна строка на пару (roadmap, tag).
+    Roadmap.tags остаётся источником для чтения, эта таблица — для фильтрации.
+    """
+
+    __tablename__ = "roadmap_tags"
+
+    roadmap_id = Column(
+        Integer,
+        ForeignKey("roadmaps.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    tag = Column(String(50), primary_key=True)
+
+    __table_args__ = (
+        # фильтр по тегу — seek по (tag, roadmap_id)
+        Index("ix_roadmap_tags_tag_roadmap", "tag", "roadmap_id"),
+    )
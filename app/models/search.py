@@ -0,0 +1,337 @@
+"""
+Полнотекстовый индекс по title/description roadmaps и milestones.
+
+SQLite: виртуальная таблица FTS5 `search_fts`, rowid кодирует (kind, id).
+owner_id и kind — индексируемые колонки: условие на них входит в MATCH,
+и поиск читает списки вхождений только одного владельца.
+PostgreSQL: таблица `search_documents` с сгенерированным tsvector и GIN-индексом.
+
+Индекс поддерживается ORM-событиями в той же транзакции, что и запись.
+"""
+
+import re
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import Integer, bindparam, event, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.milestone import Milestone
+from app.models.roadmap import Roadmap
+
+KIND_ROADMAP = "roadmap"
+KIND_MILESTONE = "milestone"
+
+_KIND_OFFSET = {KIND_ROADMAP: 0, KIND_MILESTONE: 1}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+        title,
+        description,
+        kind,
+        object_id UNINDEXED,
+        owner_id,
+        roadmap_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+# Веса колонок: title, description, kind, object_id, owner_id, roadmap_id
+_SQLITE_BM25 = "bm25(search_fts, 10.0, 1.0, 0.0, 0.0, 0.0, 0.0)"
+
+_POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS search_documents (
+        kind VARCHAR(16) NOT NULL,
+        object_id INTEGER NOT NULL,
+        owner_id INTEGER NOT NULL,
+        roadmap_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        document TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+        ) STORED,
+        PRIMARY KEY (kind, object_id)
+    )
+    """,
+    (
+        "CREATE INDEX IF NOT EXISTS ix_search_documents_document "
+        "ON search_documents USING GIN (document)"
+    ),
+    (
+        "CREATE INDEX IF NOT EXISTS ix_search_documents_owner "
+        "ON search_documents (owner_id)"
+    ),
+]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_search_index(target, connection, **kw) -> None:
+    ddl = _POSTGRES_DDL if connection.dialect.name == "postgresql" else _SQLITE_DDL
+    for statement in ddl:
+        connection.execute(text(statement))
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def drop_search_index(target, connection, **kw) -> None:
+    table = (
+        "search_documents" if connection.dialect.name == "postgresql" else "search_fts"
+    )
+    connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+
+def _rowid(kind: str, object_id: int) -> int:
+    return object_id * 2 + _KIND_OFFSET[kind]
+
+
+def index_documents(connection, kind: str, documents: Iterable[Sequence]) -> None:
+    """
+    Индексирует пакет документов одного вида одним executemany (на SQLite —
+    DELETE и INSERT). documents: (object_id, owner_id, roadmap_id, title,
+    description) — так же, как аргументы index_document.
+    """
+    params = [
+        {
+            "kind": kind,
+            "object_id": object_id,
+            "owner_id": owner_id,
+            "roadmap_id": roadmap_id,
+            "title": title,
+            "description": description or "",
+            "rowid": _rowid(kind, object_id),
+        }
+        for object_id, owner_id, roadmap_id, title, description in documents
+    ]
+    if not params:
+        return
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            text(
+                "INSERT INTO search_documents "
+                "(kind, object_id, owner_id, roadmap_id, title, description) "
+                "VALUES (:kind, :object_id, :owner_id, :roadmap_id, "
+                ":title, :description) "
+                "ON CONFLICT (kind, object_id) DO UPDATE SET "
+                "owner_id = excluded.owner_id, roadmap_id = excluded.roadmap_id, "
+                "title = excluded.title, description = excluded.description"
+            ),
+            params,
+        )
+        return
+
+    # В FTS5 нет upsert: удаляем по rowid (seek) и вставляем заново
+    _delete_rowids(connection, [p["rowid"] for p in params])
+    connection.execute(
+        text(
+            "INSERT INTO search_fts "
+            "(rowid, title, description, kind, object_id, owner_id, roadmap_id) "
+            "VALUES (:rowid, :title, :description, :kind, :object_id, "
+            ":owner_id, :roadmap_id)"
+        ),
+        params,
+    )
+
+
+def index_document(
+    connection,
+    kind: str,
+    object_id: int,
+    owner_id: int,
+    roadmap_id: int,
+    title: str,
+    description: str | None,
+) -> None:
+    index_documents(
+        connection, kind, [(object_id, owner_id, roadmap_id, title, description)]
+    )
+
+
+def _delete_rowids(connection, rowids: list[int]) -> None:
+    connection.execute(
+        text("DELETE FROM search_fts WHERE rowid IN :rowids").bindparams(
+            bindparam("rowids", expanding=True)
+        ),
+        {"rowids": rowids},
+    )
+
+
+def unindex_documents(connection, kind: str, object_ids: Iterable[int]) -> None:
+    object_ids = list(object_ids)
+    if not object_ids:
+        return
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            text(
+                "DELETE FROM search_documents "
+                "WHERE kind = :kind AND object_id IN :object_ids"
+            ).bindparams(bindparam("object_ids", expanding=True)),
+            {"kind": kind, "object_ids": object_ids},
+        )
+        return
+    _delete_rowids(connection, [_rowid(kind, object_id) for object_id in object_ids])
+
+
+def unindex_document(connection, kind: str, object_id: int) -> None:
+    unindex_documents(connection, kind, [object_id])
+
+
+def _document_changed(target, *attrs: str) -> bool:
+    # Документ хранит title, description и ключи фильтра (owner_id, roadmap_id)
+    state = inspect(target).attrs
+    return any(
+        state[attr].history.has_changes() for attr in ("title", "description", *attrs)
+    )
+
+
+@event.listens_for(Roadmap, "after_insert")
+def _roadmap_inserted(mapper, connection, target: Roadmap) -> None:
+    index_document(
+        connection,
+        KIND_ROADMAP,
+        target.id,
+        target.owner_id,
+        target.id,
+        target.title,
+        target.description,
+    )
+
+
+@event.listens_for(Roadmap, "after_update")
+def _roadmap_updated(mapper, connection, target: Roadmap) -> None:
+    if _document_changed(target, "owner_id"):
+        _roadmap_inserted(mapper, connection, target)
+    if inspect(target).attrs.owner_id.history.has_changes():
+        # Документы milestones несут owner_id roadmap — переиндексируем их
+        # вслед за roadmap одним пакетом
+        table = Milestone.__table__
+        index_documents(
+            connection,
+            KIND_MILESTONE,
+            (
+                (row.id, target.owner_id, row.roadmap_id, row.title, row.description)
+                for row in connection.execute(
+                    select(
+                        table.c.id,
+                        table.c.roadmap_id,
+                        table.c.title,
+                        table.c.description,
+                    ).where(table.c.roadmap_id == target.id)
+                )
+            ),
+        )
+
+
+@event.listens_for(Roadmap, "after_delete")
+def _roadmap_deleted(mapper, connection, target: Roadmap) -> None:
+    unindex_document(connection, KIND_ROADMAP, target.id)
+
+
+@event.listens_for(Milestone, "after_insert")
+def _milestone_inserted(mapper, connection, target: Milestone) -> None:
+    index_document(
+        connection,
+        KIND_MILESTONE,
+        target.id,
+        target.owner_id,
+        target.roadmap_id,
+        target.title,
+        target.description,
+    )
+
+
+@event.listens_for(Milestone, "after_update")
+def _milestone_updated(mapper, connection, target: Milestone) -> None:
+    if _document_changed(target, "owner_id", "roadmap_id"):
+        _milestone_inserted(mapper, connection, target)
+
+
+@event.listens_for(Milestone, "after_delete")
+def _milestone_deleted(mapper, connection, target: Milestone) -> None:
+    unindex_document(connection, KIND_MILESTONE, target.id)
+
+
+def _tokens(q: str) -> list[str]:
+    return [t.lower() for t in _TOKEN_RE.findall(q)]
+
+
+def _sqlite_match(tokens: list[str], owner_id: int, kind: str | None = None) -> str:
+    # Каждый токен — префиксный поиск по title/description, токены через AND;
+    # владелец и вид — точные токены своих колонок
+    terms = " ".join(f'"{t}"*' for t in tokens)
+    scope = f'{{owner_id}} : "{int(owner_id)}"'
+    if kind:
+        scope += f' AND {{kind}} : "{kind}"'
+    return f"{scope} AND {{title description}} : ({terms})"
+
+
+def _postgres_tsquery(tokens: list[str]) -> str:
+    return " & ".join(f"{t}:*" for t in tokens)
+
+
+def matching_ids(db: Session, owner_id: int, q: str, kind: str):
+    """
+    Подзапрос с id объектов заданного вида, подходящих под q.
+    Для пустого после токенизации q возвращает None.
+    """
+    tokens = _tokens(q)
+    if not tokens:
+        return None
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = text(
+            "SELECT object_id FROM search_documents "
+            "WHERE document @@ to_tsquery('simple', :query) "
+            "AND kind = :kind AND owner_id = :owner_id"
+        ).bindparams(query=_postgres_tsquery(tokens), kind=kind, owner_id=owner_id)
+    else:
+        stmt = text(
+            "SELECT object_id FROM search_fts WHERE search_fts MATCH :query"
+        ).bindparams(query=_sqlite_match(tokens, owner_id, kind))
+    return stmt.columns(object_id=Integer)
+
+
+def search(
+    db: Session,
+    owner_id: int,
+    q: str,
+    kind: str | None = None,
+    limit: int = 20,
+) -> list:
+    """
+    Ранжированный поиск по roadmaps и milestones пользователя.
+    Строки: kind, id, roadmap_id, title, snippet, rank (больше — релевантнее).
+    """
+    tokens = _tokens(q)
+    if not tokens:
+        return []
+    params = {"owner_id": owner_id, "kind": kind, "limit": limit}
+    if db.get_bind().dialect.name == "postgresql":
+        params["query"] = _postgres_tsquery(tokens)
+        kind_filter = "AND kind = :kind " if kind else ""
+        stmt = text(
+            "SELECT kind, object_id AS id, roadmap_id, title, "
+            "ts_headline('simple', title || ' ' || coalesce(description, ''), "
+            "to_tsquery('simple', :query)) AS snippet, "
+            "ts_rank(document, to_tsquery('simple', :query)) AS rank "
+            "FROM search_documents "
+            "WHERE document @@ to_tsquery('simple', :query) "
+            f"AND owner_id = :owner_id {kind_filter}"
+            "ORDER BY rank DESC LIMIT :limit"
+        )
+    else:
+        params["query"] = _sqlite_match(tokens, owner_id, kind)
+        # bm25 тем меньше, чем релевантнее; заголовок весит больше описания,
+        # токены владельца и вида в ранжировании не участвуют
+        stmt = text(
+            "SELECT kind, CAST(object_id AS INTEGER) AS id, "
+            "CAST(roadmap_id AS INTEGER) AS roadmap_id, title, "
+            "snippet(search_fts, -1, '[', ']', '…', 12) AS snippet, "
+            f"-{_SQLITE_BM25} AS rank "
+            "FROM search_fts WHERE search_fts MATCH :query "
+            f"ORDER BY {_SQLITE_BM25} LIMIT :limit"
+        )
+    return db.execute(stmt, params).all()
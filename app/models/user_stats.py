@@ -0,0 +1,243 @@
+from collections import Counter
+from collections.abc import Iterable
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    event,
+    func,
+    inspect,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, object_session
+
+from app.db.base import Base, utcnow
+from app.models.milestone import Milestone, MilestoneStatus
+from app.models.roadmap import Roadmap
+
+
+class UserStats(Base):
+    """
+    Инкрементальные счётчики для /stats: одна строка на пользователя.
+    Поддерживаются ORM-событиями ниже в той же транзакции, что и запись.
+    Строки ещё нет — она создаётся пересчётом один раз после flush.
+    """
+
+    __tablename__ = "user_stats"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    total_roadmaps = Column(Integer, default=0, nullable=False)
+    total_milestones = Column(Integer, default=0, nullable=False)
+
+    milestones_planned = Column(Integer, default=0, nullable=False)
+    milestones_in_progress = Column(Integer, default=0, nullable=False)
+    milestones_done = Column(Integer, default=0, nullable=False)
+    milestones_cancelled = Column(Integer, default=0, nullable=False)
+
+    updated_at = Column(
+        DateTime,
+        default=utcnow,
+        onupdate=utcnow,
+        nullable=False,
+    )
+
+
+def status_column(status: MilestoneStatus) -> Column:
+    return UserStats.__table__.c[f"milestones_{MilestoneStatus(status).value}"]
+
+
+def _recount(user_id: int):
+    """SELECT строки user_stats, посчитанной заново по данным пользователя."""
+    milestones = Milestone.__table__
+
+    def count(table, *criteria):
+        return (
+            select(func.count())
+            .select_from(table)
+            .where(table.c.owner_id == user_id, *criteria)
+            .scalar_subquery()
+        )
+
+    return select(
+        literal(user_id),
+        count(Roadmap.__table__),
+        count(milestones),
+        *(count(milestones, milestones.c.status == s) for s in MilestoneStatus),
+        literal(utcnow()),
+    )
+
+
+_RECOUNT_COLUMNS = (
+    "user_id",
+    "total_roadmaps",
+    "total_milestones",
+    *(f"milestones_{s.value}" for s in MilestoneStatus),
+    "updated_at",
+)
+
+
+def create_user_stats(connection, user_id: int, deltas: dict | None = None) -> None:
+    """
+    Создаёт строку полным пересчётом (INSERT ... SELECT count(*)).
+    Пересчёт идёт в транзакции вызывающего и уже учитывает её запись.
+    Если строку успела создать параллельная транзакция, вставка ждёт её
+    коммита и вместо пересчёта сдвигает готовые счётчики на deltas.
+    """
+    table = UserStats.__table__
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(table).from_select(_RECOUNT_COLUMNS, _recount(user_id))
+    if deltas:
+        values = {name: table.c[name] + delta for name, delta in deltas.items()}
+        values["updated_at"] = utcnow()
+        stmt = stmt.on_conflict_do_update(index_elements=["user_id"], set_=values)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=["user_id"])
+    connection.execute(stmt)
+
+
+# session.info: {user_id: Counter} — сдвиги flush для пользователей без строки
+_PENDING = "user_stats_pending"
+
+
+def _bump(connection, user_id: int, deltas: dict, session: Session | None) -> None:
+    """
+    Атомарно сдвигает счётчики (col = col + delta). Строки ещё нет —
+    её создаёт пересчёт: для записи через Core сразу (запись уже выполнена),
+    для ORM — в after_flush, когда записаны все строки flush. Пересчёт
+    посреди flush уже видел бы соседние строки, и их сдвиги легли бы сверху.
+    """
+    table = UserStats.__table__
+    values = {table.c[name]: table.c[name] + delta for name, delta in deltas.items()}
+    values[table.c.updated_at] = utcnow()
+    updated = connection.execute(
+        update(table).where(table.c.user_id == user_id).values(values)
+    )
+    if updated.rowcount:
+        return
+    if session is None:
+        create_user_stats(connection, user_id, deltas)
+        return
+    pending = session.info.setdefault(_PENDING, {})
+    pending.setdefault(user_id, Counter()).update(deltas)
+
+
+@event.listens_for(Session, "before_flush")
+def _reset_pending(session: Session, flush_context, instances) -> None:
+    # Остатки flush, упавшего с ошибкой, не переносятся в следующий
+    session.info.pop(_PENDING, None)
+
+
+@event.listens_for(Session, "after_flush")
+def _create_pending_user_stats(session: Session, flush_context) -> None:
+    """
+    Создаёт строки для пользователей, у которых их не было: пересчёт уже
+    учитывает весь flush. Сдвиги flush применяются, только если строку
+    успела создать параллельная транзакция.
+    """
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    connection = session.connection()
+    for user_id, deltas in pending.items():
+        create_user_stats(
+            connection, user_id, {name: n for name, n in deltas.items() if n}
+        )
+
+
+def milestone_deltas(statuses: Iterable, sign: int = 1) -> dict:
+    """Сдвиги счётчиков для вставленных (sign=1) или удалённых (-1) milestones."""
+    counts = Counter(MilestoneStatus(status) for status in statuses)
+    deltas = {status_column(s).name: sign * n for s, n in counts.items()}
+    deltas["total_milestones"] = sign * sum(counts.values())
+    return deltas
+
+
+def bump_user_stats(connection, user_id: int, deltas: dict) -> None:
+    """
+    Один сдвиг счётчиков за пакетную запись через Core (insert/update/delete
+    по списку строк): ORM-события ниже для неё не вызываются.
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if deltas:
+        _bump(connection, user_id, deltas, session=None)
+
+
+# Массовые query.update()/query.delete() в обход unit of work
+# эти события не вызывают — для них bump_user_stats или пересчёт.
+
+
+@event.listens_for(Roadmap, "after_insert")
+def _roadmap_inserted(mapper, connection, target: Roadmap) -> None:
+    _bump(connection, target.owner_id, {"total_roadmaps": 1}, object_session(target))
+
+
+@event.listens_for(Roadmap, "after_delete")
+def _roadmap_deleted(mapper, connection, target: Roadmap) -> None:
+    _bump(connection, target.owner_id, {"total_roadmaps": -1}, object_session(target))
+
+
+@event.listens_for(Milestone, "after_insert")
+def _milestone_inserted(mapper, connection, target: Milestone) -> None:
+    _bump(
+        connection,
+        target.owner_id,
+        {"total_milestones": 1, status_column(target.status).name: 1},
+        object_session(target),
+    )
+
+
+@event.listens_for(Milestone, "after_update")
+def _milestone_updated(mapper, connection, target: Milestone) -> None:
+    history = inspect(target).attrs.status.history
+    if not history.deleted or not history.added:
+        return
+    old_status, new_status = history.deleted[0], history.added[0]
+    if old_status == new_status:
+        return
+    _bump(
+        connection,
+        target.owner_id,
+        {status_column(old_status).name: -1, status_column(new_status).name: 1},
+        object_session(target),
+    )
+
+
+@event.listens_for(Milestone, "after_delete")
+def _milestone_deleted(mapper, connection, target: Milestone) -> None:
+    _bump(
+        connection,
+        target.owner_id,
+        {"total_milestones": -1, status_column(target.status).name: -1},
+        object_session(target),
+    )
+
+
+@event.listens_for(Roadmap, "after_update")
+def _roadmap_owner_changed(mapper, connection, target: Roadmap) -> None:
+    # roadmap и его milestones переходят к другому пользователю целиком
+    history = inspect(target).attrs.owner_id.history
+    if not history.deleted or not history.added:
+        return
+    old_owner, new_owner = history.deleted[0], history.added[0]
+    if old_owner == new_owner:
+        return
+    milestones = Milestone.__table__
+    by_status = connection.execute(
+        select(milestones.c.status, func.count())
+        .where(milestones.c.roadmap_id == target.id)
+        .group_by(milestones.c.status)
+    ).all()
+    deltas = {"total_roadmaps": 1, "total_milestones": sum(n for _, n in by_status)}
+    for status, n in by_status:
+        deltas[status_column(status).name] = n
+    session = object_session(target)
+    _bump(connection, old_owner, {name: -n for name, n in deltas.items()}, session)
+    _bump(connection, new_owner, deltas, session)
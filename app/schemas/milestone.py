@@ -1,14 +1,14 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import Any
 
-from pydantic import BaseModel, constr, validator
+from pydantic import BaseModel, conlist, constr, validator
 
 from app.models.milestone import MilestoneStatus
 
 
 class MilestoneBase(BaseModel):
     title: constr(strip_whitespace=True, min_length=1, max_length=255)
-    description: Optional[str] = None
+    description: str | None = None
     due_at: date
     status: MilestoneStatus = MilestoneStatus.PLANNED
     sort_order: int = 0
@@ -41,3 +41,34 @@ class MilestoneRead(MilestoneBase):
 
     class Config:
         orm_mode = True
+
+
+MAX_BATCH_SIZE = 1000
+
+
+class MilestoneBatchUpdateItem(MilestoneUpdate):
+    id: int
+
+
+class MilestoneBatchRequest(BaseModel):
+    # Элементы валидируются по одному в обработчике, чтобы ошибка
+    # в одном элементе не отклоняла весь пакет
+    items: conlist(dict, min_items=1, max_items=MAX_BATCH_SIZE)
+
+
+class MilestoneBatchDelete(BaseModel):
+    ids: conlist(int, min_items=1, max_items=MAX_BATCH_SIZE)
+
+
+class MilestoneBatchItemResult(BaseModel):
+    index: int
+    status: int
+    id: int | None = None
+    milestone: MilestoneRead | None = None
+    error: Any | None = None
+
+
+class MilestoneBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[MilestoneBatchItemResult]
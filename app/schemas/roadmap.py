@@ -1,13 +1,19 @@
-from datetime import datetime
-from typing import List
+from datetime import date, datetime
+from typing import Any
 
 from pydantic import BaseModel, constr
 
+from app.models.milestone import MilestoneStatus
+from app.schemas.milestone import MilestoneRead
+
+# RoadmapTag.tag — String(50)
+Tag = constr(strip_whitespace=True, min_length=1, max_length=50)
+
 
 class RoadmapBase(BaseModel):
     title: constr(strip_whitespace=True, min_length=1, max_length=255)
     description: str | None = None
-    tags: List[constr(strip_whitespace=True, min_length=1, max_length=50)] = []
+    tags: list[Tag] = []
 
 
 class RoadmapCreate(RoadmapBase):
@@ -17,7 +23,7 @@ class RoadmapCreate(RoadmapBase):
 class RoadmapUpdate(BaseModel):
     title: constr(strip_whitespace=True, min_length=1, max_length=255) | None = None
     description: str | None = None
-    tags: list[str] | None = None
+    tags: list[Tag] | None = None
     is_archived: bool | None = None
 
 
@@ -30,3 +36,35 @@ class RoadmapRead(RoadmapBase):
 
     class Config:
         orm_mode = True
+
+
+class RoadmapMilestoneStats(BaseModel):
+    total_milestones: int
+    milestones_by_status: dict[MilestoneStatus, int]
+    # due_at < today и status != done — как в /stats (is_overdue)
+    overdue_milestones: int
+    # ближайший дедлайн среди незавершённых (planned, in_progress)
+    next_due_at: date | None
+
+
+class RoadmapExpanded(RoadmapRead):
+    # Только при ?include=milestones / ?include=stats
+    milestones: list[MilestoneRead] | None = None
+    stats: RoadmapMilestoneStats | None = None
+
+
+class RoadmapImportError(BaseModel):
+    position: str
+    error: Any
+
+
+class RoadmapImportReport(BaseModel):
+    format: str
+    roadmaps_created: int
+    milestones_created: int
+    failed: int
+    # Ошибки по строкам; в ответ попадают первые MAX_IMPORT_ERRORS
+    errors: list[RoadmapImportError]
+    aborted: bool = False
+    elapsed_seconds: float
+    rows_per_second: float
@@ -0,0 +1,15 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    kind: Literal["roadmap", "milestone"]
+    id: int
+    roadmap_id: int
+    title: str
+    snippet: str | None = None
+    rank: float
+
+    class Config:
+        orm_mode = True
@@ -1,5 +1,3 @@
-from typing import Dict
-
 from pydantic import BaseModel
 
 from app.models.milestone import MilestoneStatus
@@ -8,6 +6,6 @@ from app.models.milestone import MilestoneStatus
 class StatsResponse(BaseModel):
     total_roadmaps: int
     total_milestones: int
-    milestones_by_status: Dict[MilestoneStatus, int]
+    milestones_by_status: dict[MilestoneStatus, int]
     overdue_milestones: int
     upcoming_milestones_7d: int
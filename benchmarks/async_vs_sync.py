@@ -0,0 +1,146 @@
+"""
+Сравнение sync- и async-стека на одних и тех же данных.
+
+Оба приложения работают in-process через httpx.ASGITransport поверх одного
+SQLite-файла; нагрузка — N запросов с фиксированным числом одновременных.
+
+    python -m benchmarks.async_vs_sync --requests 2000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.security import create_access_token
+from app.db.async_session import async_database_url, get_async_db
+from app.db.base import Base
+from app.db.session import get_db
+from app.main import create_app
+from app.models import Milestone, Roadmap, User
+
+
+def seed(database_url: str, roadmaps: int, milestones_per_roadmap: int) -> int:
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        user = User(email="bench@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.flush()
+        due = date.today() + timedelta(days=1)
+        for i in range(roadmaps):
+            roadmap = Roadmap(title=f"Roadmap {i}", owner_id=user.id)
+            roadmap.milestones = [
+                Milestone(title=f"Milestone {i}.{j}", due_at=due)
+                for j in range(milestones_per_roadmap)
+            ]
+            db.add(roadmap)
+        db.commit()
+        user_id = user.id
+    engine.dispose()
+    return user_id
+
+
+def build_sync_app(database_url: str):
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    SessionLocal = sessionmaker(autoflush=False, bind=engine)
+    app = create_app(async_db=False)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def build_async_app(database_url: str):
+    engine = create_async_engine(async_database_url(database_url))
+    AsyncSessionLocal = async_sessionmaker(bind=engine, autoflush=False)
+    app = create_app(async_db=True)
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+async def run_load(app, path: str, headers: dict, requests: int, concurrency: int):
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                resp = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                resp.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--roadmaps", type=int, default=200)
+    parser.add_argument("--milestones", type=int, default=10)
+    parser.add_argument("--path", default="/roadmaps/?limit=50")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        user_id = seed(database_url, args.roadmaps, args.milestones)
+        headers = {"Authorization": f"Bearer {create_access_token(subject=user_id)}"}
+
+        print(f"{'stack':<6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+        for name, build in (("sync", build_sync_app), ("async", build_async_app)):
+            result = asyncio.run(
+                run_load(
+                    build(database_url),
+                    args.path,
+                    headers,
+                    args.requests,
+                    args.concurrency,
+                )
+            )
+            print(
+                f"{name:<6} {result['rps']:>9.1f} "
+                f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pytest
+from sqlalchemy.orm import Session
+
+from benchmarks.data import PROFILES, generate, make_engine
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    # Без плагина нет фикстуры benchmark — микробенчмарки не собираем
+    collect_ignore_glob = ["test_*.py"]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-size",
+        choices=list(PROFILES),
+        default="medium",
+        help="data profile for query benchmarks (benchmarks/data.py)",
+    )
+
+
+@pytest.fixture(scope="session")
+def bench_engine(tmp_path_factory):
+    engine = make_engine(f"sqlite:///{tmp_path_factory.mktemp('bench') / 'bench.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def dataset(request, bench_engine):
+    return generate(bench_engine, PROFILES[request.config.getoption("bench_size")])
+
+
+@pytest.fixture()
+def session(bench_engine, dataset):
+    with Session(bench_engine) as session:
+        yield session
@@ -0,0 +1,257 @@
+"""
+Нагрузочный прогон горячих маршрутов in-process (httpx.ASGITransport):
+N запросов с фиксированным числом одновременных на сценарий, p50/p99 и req/s.
+
+Без --database-url данные генерируются во временную SQLite (--size);
+с ним используется уже заполненная база (python -m benchmarks.data),
+а пустая заполняется. Результаты пишутся в JSON, который можно сравнить
+с прогоном прошлого релиза:
+
+    python -m benchmarks.load --size medium --output results/1.4.json
+    python -m benchmarks.load --size medium --baseline results/1.4.json
+
+Кэш ответов по умолчанию выключен: меряются обработчики и SQL,
+а не попадания в кэш (--response-cache включает его).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from app.api import response_cache
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.session import get_db
+from app.main import create_app
+from benchmarks.data import (
+    BENCH_EMAIL,
+    BENCH_PASSWORD,
+    PROFILES,
+    describe,
+    generate,
+    make_engine,
+)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    path: str  # {roadmap_id} — по кругу из roadmaps пользователя
+    authenticated: bool = True
+    form: dict | None = None
+    # доля от --requests и потолок одновременных запросов
+    share: float = 1.0
+    max_concurrency: int | None = None
+
+
+SCENARIOS = (
+    Scenario("list_roadmaps", "GET", "/roadmaps/?limit=50"),
+    Scenario("list_milestones", "GET", "/milestones/?limit=50"),
+    Scenario("get_stats", "GET", "/stats/"),
+    Scenario("export_roadmap", "GET", "/roadmaps/{roadmap_id}/export"),
+    # pbkdf2 на порядки дороже остальных маршрутов; больше
+    # PASSWORD_HASH_MAX_PENDING одновременных получили бы 503, а не латентность
+    Scenario(
+        "login",
+        "POST",
+        "/auth/token",
+        authenticated=False,
+        form={"username": BENCH_EMAIL, "password": BENCH_PASSWORD},
+        share=0.1,
+        max_concurrency=settings.PASSWORD_HASH_MAX_PENDING,
+    ),
+)
+
+
+def build_app(engine):
+    SessionLocal = sessionmaker(autoflush=False, bind=engine)
+    app = create_app(async_db=False)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    app, scenario: Scenario, headers: dict, roadmap_ids, requests: int, concurrency
+) -> dict:
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    # Исключение обработчика (например, таймаут пула) — ответ 500 и ошибка в отчёте
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one(i: int):
+            path = scenario.path.format(roadmap_id=roadmap_ids[i % len(roadmap_ids)])
+            async with semaphore:
+                started = time.perf_counter()
+                resp = await client.request(
+                    scenario.method,
+                    path,
+                    headers=headers if scenario.authenticated else None,
+                    data=scenario.form,
+                )
+                latencies.append(time.perf_counter() - started)
+            statuses[str(resp.status_code)] = statuses.get(str(resp.status_code), 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(n for code, n in statuses.items() if not code.startswith("2")),
+        "statuses": statuses,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict, baseline: dict | None) -> None:
+    header = f"{'scenario':<16} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    print(header + ("   Δreq/s    Δp99" if baseline else ""))
+    for name, r in results.items():
+        line = (
+            f"{name:<16} {r['rps']:>9.1f} {r['p50_ms']:>9.2f} "
+            f"{r['p99_ms']:>9.2f} {r['errors']:>7}"
+        )
+        before = (baseline or {}).get(name)
+        if before:
+            rps = (r["rps"] / before["rps"] - 1) * 100
+            p99 = (r["p99_ms"] / before["p99_ms"] - 1) * 100
+            line += f"  {rps:>+7.1f}% {p99:>+6.1f}%"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="default: temporary SQLite file")
+    parser.add_argument("--size", choices=PROFILES, default="medium")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(s.name for s in SCENARIOS),
+        help="comma-separated subset of scenarios",
+    )
+    parser.add_argument("--response-cache", action="store_true")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON from a previous run to compare with")
+    args = parser.parse_args()
+
+    wanted = set(args.scenarios.split(","))
+    unknown = wanted - {s.name for s in SCENARIOS}
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if not args.response_cache:
+        # Middleware и события сессии читают кэш модуля при каждом запросе
+        response_cache.response_cache = None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = make_engine(database_url)
+        dataset = describe(engine) or generate(engine, PROFILES[args.size])
+        app = build_app(engine)
+        token = create_access_token(subject=dataset.bench_user_id)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        results = {}
+        for scenario in SCENARIOS:
+            if scenario.name not in wanted:
+                continue
+            concurrency = min(args.concurrency, scenario.max_concurrency or sys.maxsize)
+            # Первый прогон — прогрев: пул соединений, user_stats, кэши SQLite
+            for total in (args.warmup, args.requests):
+                results[scenario.name] = asyncio.run(
+                    run_scenario(
+                        app,
+                        scenario,
+                        headers,
+                        dataset.bench_roadmap_ids,
+                        max(1, int(total * scenario.share)),
+                        concurrency,
+                    )
+                )
+        engine.dispose()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+
+    if args.output:
+        report = {
+            "meta": {
+                "revision": _git_revision(),
+                "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "database": engine.dialect.name,
+                "dataset": {
+                    "users": dataset.users,
+                    "roadmaps": dataset.roadmaps,
+                    "milestones": dataset.milestones,
+                    "bench_user_roadmaps": len(dataset.bench_roadmap_ids),
+                },
+                "response_cache": args.response_cache,
+            },
+            "results": results,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
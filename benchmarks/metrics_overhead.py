@@ -0,0 +1,69 @@
+"""
+Накладные расходы сбора метрик: MetricsMiddleware вокруг пустого
+ASGI-приложения и пара SQL-хуков на один запрос к БД.
+
+    python -m benchmarks.metrics_overhead [--requests 100000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.api import metrics
+
+
+class _Route:
+    path_format = "/roadmaps/{roadmap_id}"
+
+
+async def _app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message):
+    pass
+
+
+async def _run(app, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        scope = {"type": "http", "method": "GET", "path": "/roadmaps/1"}
+        await app(scope, _receive, _send)
+    return time.perf_counter() - started
+
+
+class _Conn:
+    def __init__(self):
+        self.info = {}
+
+
+def _sql_hooks(statements: int) -> float:
+    conn = _Conn()
+    started = time.perf_counter()
+    for _ in range(statements):
+        metrics._start_statement(conn, None, "SELECT 1", (), None, False)
+        metrics._observe_statement(conn, None, "SELECT 1", (), None, False)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.requests
+
+    bare = asyncio.run(_run(_app, n))
+    instrumented = asyncio.run(_run(metrics.MetricsMiddleware(_app), n))
+    sql = _sql_hooks(n)
+    print(f"middleware overhead: {(instrumented - bare) / n * 1e6:.2f} us/request")
+    print(f"sql hooks:           {sql / n * 1e6:.2f} us/statement")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Стоимость сериализации одной строки списка: ORM-объекты + валидация
+response_model + stdlib json (прежний путь FastAPI) против колонок Row +
+DTO + orjson (app/api/projections.py, app/api/serialization.py).
+
+    python -m benchmarks.serialization [--rows 5000] [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+from datetime import date, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.api import projections, serialization
+from app.api.utils import tags_string_to_list
+from app.db.base import Base
+from app.models.milestone import Milestone
+from app.models.roadmap import Roadmap
+from app.models.user import User
+from app.schemas.milestone import MilestoneRead
+from app.schemas.roadmap import RoadmapRead
+
+
+def seed(session: Session, rows: int) -> None:
+    user = User(email="bench@example.com", hashed_password="x", is_active=True)
+    session.add(user)
+    session.flush()
+    roadmaps = [
+        Roadmap(
+            title=f"Roadmap {i}",
+            description="Quarterly platform roadmap",
+            tags="backend,infra,q3",
+            owner_id=user.id,
+        )
+        for i in range(rows)
+    ]
+    session.add_all(roadmaps)
+    session.flush()
+    today = date.today()
+    session.add_all(
+        Milestone(
+            title=f"Milestone {i}",
+            description="Ship it",
+            due_at=today + timedelta(days=i % 365),
+            roadmap_id=rm.id,
+            owner_id=user.id,
+        )
+        for i, rm in enumerate(roadmaps)
+    )
+    session.commit()
+
+
+def _roadmap_model(rm: Roadmap) -> RoadmapRead:
+    data = {field: getattr(rm, field) for field in RoadmapRead.__fields__}
+    data["tags"] = tags_string_to_list(data["tags"])
+    return RoadmapRead(**data)
+
+
+def models_path(session: Session, entity) -> bytes:
+    """ORM-объекты -> валидация response_model -> jsonable_encoder -> json."""
+    session.expunge_all()
+    if entity is Roadmap:
+        items = [_roadmap_model(rm) for rm in session.query(Roadmap)]
+    else:
+        items = [MilestoneRead.from_orm(m) for m in session.query(Milestone)]
+    return json.dumps(jsonable_encoder(items)).encode()
+
+
+def rows_path(session: Session, entity) -> bytes:
+    """Колонки -> DTO -> orjson (или stdlib json без orjson)."""
+    if entity is Roadmap:
+        items = projections.roadmap_views(
+            session.query(*projections.ROADMAP_VIEW_COLUMNS)
+        )
+    else:
+        items = projections.milestone_views(
+            session.query(*projections.MILESTONE_VIEW_COLUMNS)
+        )
+    return serialization.dumps(items)
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    encoder = "orjson" if serialization.orjson is not None else "json"
+    print(f"rows={args.rows} encoder={encoder}")
+    with Session(engine) as session:
+        seed(session, args.rows)
+        for entity, name in ((Roadmap, "RoadmapRead"), (Milestone, "MilestoneRead")):
+            old = best_of(lambda e=entity: models_path(session, e), args.repeat)
+            new = best_of(lambda e=entity: rows_path(session, e), args.repeat)
+            per_row = 1e6 / args.rows
+            print(
+                f"{name:14} models+json {old * per_row:7.2f} us/row   "
+                f"rows+{encoder} {new * per_row:7.2f} us/row   x{old / new:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
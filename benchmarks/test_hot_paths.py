@@ -0,0 +1,155 @@
+"""
+Микробенчмарки горячих путей (pytest-benchmark): сериализация, теги, запросы
+списков/статистики/экспорта на данных из benchmarks/data.py.
+
+    pytest benchmarks/ --bench-size medium --benchmark-json results/micro.json
+    pytest benchmarks/ --benchmark-compare  # с прошлым --benchmark-autosave
+"""
+
+import json
+from dataclasses import asdict
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+
+from app.api import serialization
+from app.api.conditional import fingerprint
+from app.api.projections import (
+    MILESTONE_VIEW_COLUMNS,
+    ROADMAP_VIEW_COLUMNS,
+    milestone_views,
+    roadmap_views,
+)
+from app.api.streaming import stream_partitions
+from app.api.utils import tags_list_to_string, tags_string_to_list
+from app.models import search as search_index
+from app.models.milestone import Milestone
+from app.models.roadmap import Roadmap
+from app.schemas.roadmap import RoadmapRead
+
+PAGE = 50
+
+
+def _roadmap_page(session, owner_id: int):
+    return (
+        session.query(*ROADMAP_VIEW_COLUMNS)
+        .filter(Roadmap.owner_id == owner_id)
+        .order_by(Roadmap.created_at.desc(), Roadmap.id.desc())
+        .limit(PAGE + 1)
+    )
+
+
+def _milestone_page(session, owner_id: int):
+    return (
+        session.query(*MILESTONE_VIEW_COLUMNS)
+        .filter(Milestone.owner_id == owner_id)
+        .order_by(Milestone.due_at, Milestone.id)
+        .limit(PAGE + 1)
+    )
+
+
+# Сериализация
+
+
+def test_serialize_roadmap_page_rows(benchmark, session, dataset):
+    views = roadmap_views(_roadmap_page(session, dataset.bench_user_id))
+    benchmark.group = "serialize roadmap page"
+    body = benchmark(serialization.dumps, views)
+    assert len(json.loads(body)) == len(views)
+
+
+def test_serialize_roadmap_page_models(benchmark, session, dataset):
+    # Прежний путь FastAPI: response_model + jsonable_encoder + json
+    views = roadmap_views(_roadmap_page(session, dataset.bench_user_id))
+    benchmark.group = "serialize roadmap page"
+
+    def models():
+        items = [RoadmapRead(**asdict(view)) for view in views]
+        return json.dumps(jsonable_encoder(items)).encode()
+
+    body = benchmark(models)
+    assert len(json.loads(body)) == len(views)
+
+
+def test_serialize_milestone_page_rows(benchmark, session, dataset):
+    views = milestone_views(_milestone_page(session, dataset.bench_user_id))
+    benchmark.group = "serialize milestone page"
+    benchmark(serialization.dumps, views)
+
+
+# Теги
+
+
+def test_tags_list_to_string(benchmark):
+    benchmark.group = "tags"
+    tags = [" Backend", "infra ", "Q3", "backend", "", "security"]
+    assert benchmark(tags_list_to_string, tags) == "backend,infra,q3,security"
+
+
+def test_tags_string_to_list(benchmark):
+    benchmark.group = "tags"
+    assert benchmark(tags_string_to_list, "backend,infra,q3") == [
+        "backend",
+        "infra",
+        "q3",
+    ]
+
+
+# Запросы
+
+
+def test_query_roadmap_page(benchmark, session, dataset):
+    benchmark.group = "queries"
+    views = benchmark(
+        lambda: roadmap_views(_roadmap_page(session, dataset.bench_user_id))
+    )
+    assert 0 < len(views) <= PAGE + 1
+
+
+def test_query_roadmap_page_fingerprint(benchmark, session, dataset):
+    # Валидатор ETag страницы (conditional GET) — до загрузки строк
+    benchmark.group = "queries"
+    page = _roadmap_page(session, dataset.bench_user_id)
+    rows = page.with_entities(Roadmap.id, Roadmap.updated_at)
+    benchmark(fingerprint, session, rows)
+
+
+def test_query_milestone_page(benchmark, session, dataset):
+    benchmark.group = "queries"
+    views = benchmark(
+        lambda: milestone_views(_milestone_page(session, dataset.bench_user_id))
+    )
+    assert len(views) <= PAGE + 1
+
+
+def test_query_stats_by_status(benchmark, session, dataset):
+    # Полный пересчёт /stats (первый запрос пользователя)
+    benchmark.group = "queries"
+    query = (
+        session.query(Milestone.status, func.count(Milestone.id))
+        .filter(Milestone.owner_id == dataset.bench_user_id)
+        .group_by(Milestone.status)
+    )
+    counts = benchmark(query.all)
+    assert counts
+
+
+def test_query_export_roadmap(benchmark, bench_engine, dataset):
+    benchmark.group = "queries"
+    roadmap_id = dataset.bench_roadmap_ids[0]
+    stmt = (
+        select(Milestone.id, Milestone.title, Milestone.due_at, Milestone.status)
+        .where(Milestone.roadmap_id == roadmap_id)
+        .order_by(Milestone.sort_order, Milestone.id)
+    )
+
+    def export():
+        return [row for batch in stream_partitions(bench_engine, stmt) for row in batch]
+
+    benchmark(export)
+
+
+def test_query_search(benchmark, session, dataset):
+    benchmark.group = "queries"
+    hits = benchmark(search_index.search, session, dataset.bench_user_id, "launch api")
+    assert hits
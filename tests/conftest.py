@@ -10,6 +10,9 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.api.deps import principal_cache
+from app.api.response_cache import response_cache
+from app.core.config import settings
 from app.core.security import create_access_token, get_password_hash
 from app.db.base import Base
 from app.db.session import get_db
@@ -18,6 +21,9 @@ from app.models.user import User
 
 TEST_DATABASE_URL = "sqlite:///./test.db"
 
+# Маршрут, превысивший объявленный query_budget, роняет тест
+settings.QUERY_BUDGET_MODE = "raise"
+
 
 @pytest.fixture(scope="function", autouse=True)
 def setup_test_db():
@@ -41,6 +47,10 @@ def setup_test_db():
 
     # Создание таблиц
     Base.metadata.create_all(bind=engine)
+    # id пользователей повторяются между тестами — кэш должен быть пустым
+    principal_cache.clear()
+    if response_cache is not None:
+        response_cache.clear()
 
     # Переопределение get_db для приложения
     app = create_app()
@@ -109,3 +119,37 @@ def test_user(db_session):
 def auth_headers(test_user):
     token = create_access_token(subject=test_user.id)
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture()
+def async_client(setup_test_db):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.db.async_session import async_database_url, get_async_db
+
+    # NullPool: TestClient может открывать новый event loop на каждый запрос
+    async_engine = create_async_engine(
+        async_database_url(TEST_DATABASE_URL), poolclass=NullPool
+    )
+    AsyncTestingSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+
+    _, TestingSessionLocal = setup_test_db
+    app = create_app(async_db=True)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    # Потоковые обработчики (keep_sync) и в async-режиме ходят через get_db
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = override_get_db
+
+    return TestClient(app)
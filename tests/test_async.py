@@ -0,0 +1,92 @@
+import inspect
+from datetime import date, timedelta
+
+from fastapi import status
+
+
+def test_async_crud_and_stats(async_client, auth_headers):
+    resp = async_client.post(
+        "/roadmaps/",
+        json={"title": "Async RM", "description": None, "tags": ["Async"]},
+        headers=auth_headers,
+    )
+    assert resp.status_code == status.HTTP_201_CREATED
+    roadmap_id = resp.json()["id"]
+    assert resp.json()["tags"] == ["async"]
+
+    resp = async_client.post(
+        "/milestones/",
+        json={
+            "title": "MS",
+            "due_at": (date.today() + timedelta(days=2)).isoformat(),
+            "roadmap_id": roadmap_id,
+        },
+        headers=auth_headers,
+    )
+    assert resp.status_code == status.HTTP_201_CREATED
+    milestone_id = resp.json()["id"]
+
+    resp = async_client.put(
+        f"/milestones/{milestone_id}",
+        json={"status": "in_progress"},
+        headers=auth_headers,
+    )
+    assert resp.json()["status"] == "in_progress"
+
+    resp = async_client.get("/roadmaps/?tag=async", headers=auth_headers)
+    assert [item["id"] for item in resp.json()] == [roadmap_id]
+
+    data = async_client.get("/stats/", headers=auth_headers).json()
+    assert data["total_milestones"] == 1
+    assert data["upcoming_milestones_7d"] == 1
+
+    resp = async_client.delete(f"/roadmaps/{roadmap_id}", headers=auth_headers)
+    assert resp.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_async_register_login_and_auth(async_client):
+    resp = async_client.post(
+        "/auth/register",
+        json={"email": "async@example.com", "password": "strongpassword"},
+    )
+    assert resp.status_code == status.HTTP_201_CREATED
+
+    resp = async_client.post(
+        "/auth/token",
+        data={"username": "async@example.com", "password": "strongpassword"},
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    token = resp.json()["access_token"]
+
+    resp = async_client.get("/roadmaps/", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == status.HTTP_200_OK
+
+    resp = async_client.get("/roadmaps/", headers={"Authorization": "Bearer bad"})
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_async_streaming_export(async_client, auth_headers):
+    resp = async_client.post(
+        "/roadmaps/",
+        json={"title": "Async export", "description": None, "tags": []},
+        headers=auth_headers,
+    )
+    roadmap_id = resp.json()["id"]
+
+    resp = async_client.get(f"/roadmaps/{roadmap_id}/export", headers=auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()["roadmap"]["title"] == "Async export"
+
+
+def test_async_active_user_dependency_uses_async_session():
+    from fastapi.params import Depends
+
+    from app.api.async_routes import (
+        get_current_active_user_async,
+        get_current_user_async,
+    )
+
+    # Без dependency_overrides: цепочка целиком на AsyncSession
+    (param,) = inspect.signature(get_current_active_user_async).parameters.values()
+    assert isinstance(param.default, Depends)
+    assert param.default.dependency is get_current_user_async
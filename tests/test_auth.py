@@ -29,3 +29,61 @@ def test_register_and_login(client):
     token_data = resp.json()
     assert "access_token" in token_data
     assert token_data["token_type"] == "bearer"
+
+
+def test_authenticated_requests_use_principal_cache(
+    client, auth_headers, db_session, test_user
+):
+    from sqlalchemy import event
+
+    from app.models.user import User
+
+    assert client.get("/roadmaps/", headers=auth_headers).status_code == 200
+
+    statements = []
+    engine = db_session.get_bind()
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        assert client.get("/roadmaps/", headers=auth_headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert not any("FROM users" in s for s in statements)
+
+    # Деактивация сбрасывает кэш — следующий запрос видит актуальный статус
+    user = db_session.get(User, test_user.id)
+    user.is_active = False
+    db_session.commit()
+
+    resp = client.get("/roadmaps/", headers=auth_headers)
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_inactive_claim_rejected_without_lookup(client, test_user):
+    from app.core.security import create_access_token
+
+    token = create_access_token(subject=test_user.id, is_active=False)
+    resp = client.get("/roadmaps/", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_login_returns_503_when_hashing_pool_saturated(client, test_user, monkeypatch):
+    from app.core.hashing import hashing_pool
+    from app.core.metrics import password_hash_rejected
+
+    rejected = password_hash_rejected.value()
+    monkeypatch.setattr(hashing_pool, "max_pending", 0)
+    resp = client.post(
+        "/auth/token",
+        data={"username": "test@example.com", "password": "testpassword"},
+    )
+    assert resp.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert resp.headers["Retry-After"] == "1"
+
+    # Единственный источник метрик хэширования — /metrics
+    metrics = client.get("/metrics").text
+    assert f"password_hash_rejected_total {int(rejected) + 1}\n" in metrics
+    assert client.get("/metrics/hashing").status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+
+from fastapi import status
+
+
+def _create_roadmap(client, auth_headers, title="RM"):
+    resp = client.post(
+        "/roadmaps/", json={"title": title, "tags": []}, headers=auth_headers
+    )
+    assert resp.status_code == status.HTTP_201_CREATED
+    return resp.json()["id"]
+
+
+def _create_milestone(client, auth_headers, roadmap_id):
+    resp = client.post(
+        "/milestones/",
+        json={
+            "title": "M",
+            "due_at": (date.today() + timedelta(days=3)).isoformat(),
+            "roadmap_id": roadmap_id,
+        },
+        headers=auth_headers,
+    )
+    assert resp.status_code == status.HTTP_201_CREATED
+    return resp.json()["id"]
+
+
+def _revalidate(client, url, auth_headers, etag):
+    return client.get(url, headers={**auth_headers, "If-None-Match": etag})
+
+
+def test_get_roadmap_not_modified_until_update(client, auth_headers):
+    roadmap_id = _create_roadmap(client, auth_headers)
+    url = f"/roadmaps/{roadmap_id}"
+
+    resp = client.get(url, headers=auth_headers)
+    etag = resp.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert resp.headers["Cache-Control"] == "private, no-cache"
+    last_modified = resp.headers["Last-Modified"]
+
+    resp = _revalidate(client, url, auth_headers, etag)
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+    assert resp.content == b""
+    assert resp.headers["ETag"] == etag
+
+    resp = client.get(url, headers={**auth_headers, "If-Modified-Since": last_modified})
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+
+    client.put(url, json={"title": "Renamed"}, headers=auth_headers)
+    resp = _revalidate(client, url, auth_headers, etag)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()["title"] == "Renamed"
+    assert resp.headers["ETag"] != etag
+
+
+def test_list_etag_changes_on_delete(client, auth_headers):
+    first = _create_roadmap(client, auth_headers, "A")
+    _create_roadmap(client, auth_headers, "B")
+
+    etag = client.get("/roadmaps/", headers=auth_headers).headers["ETag"]
+    assert _revalidate(client, "/roadmaps/", auth_headers, etag).status_code == 304
+
+    client.delete(f"/roadmaps/{first}", headers=auth_headers)
+    resp = _revalidate(client, "/roadmaps/", auth_headers, etag)
+    assert resp.status_code == status.HTTP_200_OK
+    assert [r["title"] for r in resp.json()] == ["B"]
+
+
+def test_milestones_and_export_revalidate(client, auth_headers):
+    roadmap_id = _create_roadmap(client, auth_headers)
+    milestone_id = _create_milestone(client, auth_headers, roadmap_id)
+
+    for url in ["/milestones/", f"/milestones/{milestone_id}"]:
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+        assert _revalidate(client, url, auth_headers, etag).status_code == 304
+
+    export_url = f"/roadmaps/{roadmap_id}/export?format=csv"
+    resp = client.get(export_url, headers=auth_headers)
+    etag = resp.headers["ETag"]
+    assert _revalidate(client, export_url, auth_headers, etag).status_code == 304
+    # Другой формат — другое представление
+    json_url = f"/roadmaps/{roadmap_id}/export"
+    assert _revalidate(client, json_url, auth_headers, etag).status_code == 200
+
+    # Изменение milestone меняет ETag экспорта, хотя сам roadmap не менялся
+    client.put(
+        f"/milestones/{milestone_id}", json={"status": "done"}, headers=auth_headers
+    )
+    assert _revalidate(client, export_url, auth_headers, etag).status_code == 200
+    assert (
+        client.get(
+            "/milestones/",
+            headers={**auth_headers, "If-None-Match": "*"},
+        ).status_code
+        == 304
+    )
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.db.pool import engine_options, install_sqlite_pragmas, pool_snapshot
+
+
+def _engine(tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **engine_options(url))
+    install_sqlite_pragmas(engine)
+    return engine
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    engine = _engine(tmp_path)
+    with engine.connect() as conn:
+        pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert pragma("cache_size") == settings.SQLITE_CACHE_SIZE
+    engine.dispose()
+
+
+def test_pool_snapshot_and_timeouts(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.05)
+    engine = _engine(tmp_path)
+
+    with engine.connect():
+        snapshot = pool_snapshot(engine)
+        assert snapshot["checked_out"] == 1
+        assert snapshot["overflow"] == 0
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    snapshot = pool_snapshot(engine)
+    assert snapshot["checked_out"] == 0
+    assert snapshot["wait"]["count"] == 1
+    assert snapshot["wait"]["rejected"] == 1
+    engine.dispose()
+
+
+def test_db_pool_metrics_endpoint(client):
+    resp = client.get("/metrics/db-pool")
+    assert resp.status_code == 200
+    assert {"pool", "checked_out", "overflow", "wait"} <= set(resp.json()["primary"])
@@ -0,0 +1,47 @@
+from fastapi import status
+
+from app.api.metrics import http_metrics
+from app.core.metrics import registry
+
+
+def _samples(text: str) -> dict[str, float]:
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+def test_prometheus_metrics(client, auth_headers):
+    registry.clear()
+    http_metrics.clear()
+    client.post("/roadmaps/", json={"title": "RM"}, headers=auth_headers)
+    client.get("/roadmaps/", headers=auth_headers)
+    client.get("/roadmaps/", headers=auth_headers)  # из кэша ответов
+    assert client.get("/roadmaps/999", headers=auth_headers).status_code == 404
+    client.post(
+        "/auth/token",
+        data={"username": "test@example.com", "password": "testpassword"},
+    )
+
+    resp = client.get("/metrics")
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(resp.text)
+
+    route = 'method="GET",route="/roadmaps/"'
+    assert samples[f"http_request_duration_seconds_count{{{route}}}"] == 2
+    assert samples[f'http_responses_total{{{route},status="200"}}'] == 2
+    not_found = 'method="GET",route="/roadmaps/{roadmap_id}",status="404"'
+    assert samples[f"http_responses_total{{{not_found}}}"] == 1
+    assert samples['http_requests_in_flight{method="GET"}'] == 1  # сам /metrics
+
+    # SQL относится к маршруту; попадание в кэш ответов запросов не делает
+    assert samples['db_statement_duration_seconds_count{route="/roadmaps/"}'] >= 2
+    assert samples[f"db_statements_per_request_count{{{route}}}"] == 2
+    assert samples[f'db_statements_per_request_bucket{{{route},le="0"}}'] == 1
+
+    assert samples["password_hash_duration_seconds_count"] >= 1
+    assert samples["response_cache_hits_total"] >= 1
+    assert 'db_pool_checked_out{engine="primary"}' in samples
@@ -54,3 +54,231 @@ def test_create_milestone_due_in_past_fails(client, auth_headers):
     assert (
         resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     )  # сработала pydantic-валидация
+
+
+def test_list_milestones_cursor_pagination(client, auth_headers):
+    roadmap_id = create_roadmap(client, auth_headers)
+    for i in range(5):
+        resp = client.post(
+            "/milestones/",
+            json={
+                "title": f"MS{i}",
+                "due_at": (date.today() + timedelta(days=i % 2)).isoformat(),
+                "roadmap_id": roadmap_id,
+            },
+            headers=auth_headers,
+        )
+        assert resp.status_code == status.HTTP_201_CREATED
+
+    resp = client.get("/milestones/?limit=3", headers=auth_headers)
+    first = resp.json()
+    cursor = resp.headers["X-Next-Cursor"]
+    assert len(first) == 3
+
+    resp = client.get(f"/milestones/?limit=3&cursor={cursor}", headers=auth_headers)
+    second = resp.json()
+    assert len(second) == 2
+    assert "X-Next-Cursor" not in resp.headers
+
+    dues = [m["due_at"] for m in first + second]
+    assert dues == sorted(dues)
+    assert len({m["id"] for m in first + second}) == 5
+
+
+def test_batch_create_milestones(client, auth_headers):
+    roadmap_id = create_roadmap(client, auth_headers)
+    due = (date.today() + timedelta(days=2)).isoformat()
+
+    resp = client.post(
+        "/milestones/batch",
+        json={
+            "items": [
+                {"title": "A", "due_at": due, "roadmap_id": roadmap_id},
+                {"title": "B", "due_at": due, "roadmap_id": 999},
+                {"title": "", "due_at": due, "roadmap_id": roadmap_id},
+                {"title": "C", "due_at": due, "roadmap_id": roadmap_id},
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    data = resp.json()
+    assert data["succeeded"] == 2
+    assert data["failed"] == 2
+    assert [r["status"] for r in data["results"]] == [201, 404, 422, 201]
+    assert data["results"][3]["milestone"]["title"] == "C"
+
+    resp = client.get(f"/milestones/?roadmap_id={roadmap_id}", headers=auth_headers)
+    assert {m["title"] for m in resp.json()} == {"A", "C"}
+
+
+def test_batch_update_and_delete_milestones(client, auth_headers):
+    roadmap_id = create_roadmap(client, auth_headers)
+    # строка счётчиков создана до пакетных операций — проверяем инкременты
+    client.get("/stats/", headers=auth_headers)
+    due = (date.today() + timedelta(days=2)).isoformat()
+    resp = client.post(
+        "/milestones/batch",
+        json={
+            "items": [
+                {"title": f"MS{i}", "due_at": due, "roadmap_id": roadmap_id}
+                for i in range(3)
+            ]
+        },
+        headers=auth_headers,
+    )
+    ids = [r["id"] for r in resp.json()["results"]]
+
+    past = (date.today() - timedelta(days=1)).isoformat()
+    resp = client.patch(
+        "/milestones/batch",
+        json={
+            "items": [
+                {"id": ids[0], "status": "done"},
+                {"id": ids[1], "due_at": past},
+                {"id": 999, "title": "nope"},
+            ]
+        },
+        headers=auth_headers,
+    )
+    data = resp.json()
+    assert [r["status"] for r in data["results"]] == [200, 400, 404]
+    assert data["results"][0]["milestone"]["status"] == "done"
+
+    resp = client.request(
+        "DELETE",
+        "/milestones/batch",
+        json={"ids": [ids[0], ids[2], 999]},
+        headers=auth_headers,
+    )
+    assert [r["status"] for r in resp.json()["results"]] == [204, 204, 404]
+
+    remaining = client.get("/milestones/", headers=auth_headers).json()
+    assert [m["id"] for m in remaining] == [ids[1]]
+
+    stats = client.get("/stats/", headers=auth_headers).json()
+    assert stats["total_milestones"] == 1
+    assert stats["milestones_by_status"]["planned"] == 1
+
+
+def test_batch_writes_are_bulk(client, auth_headers):
+    # query_budget(8) в режиме raise: число запросов не зависит от размера пакета
+    roadmap_id = create_roadmap(client, auth_headers)
+    client.get("/stats/", headers=auth_headers)
+    due = (date.today() + timedelta(days=2)).isoformat()
+    resp = client.post(
+        "/milestones/batch",
+        json={
+            "items": [
+                {"title": f"Launch {i}", "due_at": due, "roadmap_id": roadmap_id}
+                for i in range(500)
+            ]
+        },
+        headers=auth_headers,
+    )
+    results = resp.json()["results"]
+    assert [r["milestone"]["title"] for r in results[:2]] == ["Launch 0", "Launch 1"]
+    ids = [r["id"] for r in results]
+
+    resp = client.patch(
+        "/milestones/batch",
+        json={"items": [{"id": id_, "status": "done"} for id_ in ids[:300]]},
+        headers=auth_headers,
+    )
+    assert resp.json()["succeeded"] == 300
+    resp = client.request(
+        "DELETE", "/milestones/batch", json={"ids": ids[400:]}, headers=auth_headers
+    )
+    assert resp.json()["succeeded"] == 100
+
+    stats = client.get("/stats/", headers=auth_headers).json()
+    assert stats["total_milestones"] == 400
+    assert stats["milestones_by_status"] == {
+        "planned": 100,
+        "in_progress": 0,
+        "done": 300,
+        "cancelled": 0,
+    }
+    hits = client.get(
+        "/search/?q=launch&kind=milestone&limit=100", headers=auth_headers
+    ).json()
+    assert len(hits) == 100
+    assert all(hit["id"] in ids[:400] for hit in hits)
+
+
+def test_batch_update_overdue_milestone(client, auth_headers, db_session, test_user):
+    from app.models.milestone import Milestone
+
+    roadmap_id = create_roadmap(client, auth_headers)
+    overdue = Milestone(
+        title="Overdue",
+        due_at=date.today() - timedelta(days=3),
+        roadmap_id=roadmap_id,
+    )
+    db_session.add(overdue)
+    db_session.commit()
+
+    resp = client.patch(
+        "/milestones/batch",
+        json={"items": [{"id": overdue.id, "status": "done"}]},
+        headers=auth_headers,
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    (result,) = resp.json()["results"]
+    assert result["status"] == 200
+    assert result["milestone"]["status"] == "done"
+    assert result["milestone"]["due_at"] == overdue.due_at.isoformat()
+
+
+def test_milestone_owner_id_follows_roadmap(
+    client, auth_headers, db_session, test_user
+):
+    from sqlalchemy import update
+
+    from app.db.migrations import backfill_milestone_owner_id, check_milestone_owner_id
+    from app.models.milestone import Milestone
+    from app.models.roadmap import Roadmap
+    from app.models.user import User
+
+    roadmap_id = create_roadmap(client, auth_headers)
+    resp = client.post(
+        "/milestones/",
+        json={
+            "title": "M",
+            "due_at": (date.today() + timedelta(days=3)).isoformat(),
+            "roadmap_id": roadmap_id,
+        },
+        headers=auth_headers,
+    )
+    milestone_id = resp.json()["id"]
+    assert db_session.get(Milestone, milestone_id).owner_id == test_user.id
+
+    other = User(email="other@example.com", hashed_password="x", is_active=True)
+    db_session.add(other)
+    db_session.commit()
+
+    # Смена владельца через ORM переносит и milestones
+    db_session.get(Roadmap, roadmap_id).owner_id = other.id
+    db_session.commit()
+    db_session.expire_all()
+    assert db_session.get(Milestone, milestone_id).owner_id == other.id
+    assert (
+        client.get(f"/milestones/{milestone_id}", headers=auth_headers).status_code
+        == 404
+    )
+
+    # Массовый update в обход событий находит проверка и чинит backfill
+    engine = db_session.get_bind()
+    with engine.begin() as conn:
+        conn.execute(
+            update(Roadmap.__table__)
+            .where(Roadmap.__table__.c.id == roadmap_id)
+            .values(owner_id=test_user.id)
+        )
+    assert check_milestone_owner_id(engine) == [milestone_id]
+    assert backfill_milestone_owner_id(engine) == 1
+    assert check_milestone_owner_id(engine) == []
+    assert (
+        client.get(f"/milestones/{milestone_id}", headers=auth_headers).status_code
+        == 200
+    )
@@ -0,0 +1,51 @@
+import logging
+from datetime import date
+
+import pytest
+
+from app.api import query_budget
+from app.api.query_budget import QueryBudgetExceeded, QueryTracker, statement_shape
+from app.api.routes.roadmaps import list_roadmaps
+from app.models.milestone import Milestone
+from app.models.roadmap import Roadmap
+
+
+def test_statement_shape_ignores_parameters():
+    assert statement_shape("SELECT *\n FROM t WHERE id IN (?, ?, ?)") == (
+        statement_shape("SELECT * FROM t WHERE id IN (?, ?)")
+    )
+    assert statement_shape("SELECT * FROM t WHERE a = %(a_1)s AND b = $2") == (
+        "SELECT * FROM t WHERE a = ? AND b = ?"
+    )
+
+
+def test_route_over_budget_fails(client, auth_headers, monkeypatch):
+    client.post("/roadmaps/", json={"title": "RM"}, headers=auth_headers)
+    monkeypatch.setattr(list_roadmaps, "query_budget", 1)
+    with pytest.raises(QueryBudgetExceeded, match="GET /roadmaps/ issued 2"):
+        client.get("/roadmaps/?limit=3", headers=auth_headers)
+
+
+def test_lazy_loads_are_reported_as_n_plus_one(db_session, test_user, caplog):
+    for i in range(3):
+        roadmap = Roadmap(title=f"RM{i}", owner_id=test_user.id)
+        roadmap.milestones.append(
+            Milestone(title="M", due_at=date(2030, 1, 1), owner_id=test_user.id)
+        )
+        db_session.add(roadmap)
+    db_session.commit()
+    db_session.expire_all()
+
+    scope = {"type": "http", "method": "GET", "path": "/board"}
+    tracker = QueryTracker(scope, mode="log", repeat_threshold=3)
+    token = query_budget._current_tracker.set(tracker)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.api.query_budget"):
+            for roadmap in db_session.query(Roadmap).all():
+                _ = roadmap.milestones  # lazy load на каждую строку
+    finally:
+        query_budget._current_tracker.reset(token)
+
+    assert tracker.count == 4
+    assert "Possible N+1 in GET /board" in caplog.text
+    assert "FROM milestones" in caplog.text
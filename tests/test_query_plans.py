@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+
+from fastapi import status
+from sqlalchemy import event
+
+from app.db.base import Base
+
+# Полный проход допустим только для FTS5 (индекс внутри модуля) и для
+# подзапросов (anon_N) — они сами ограничены индексным поиском и LIMIT
+_ALLOWED_SCANS = ("VIRTUAL TABLE", "CONSTANT ROW")
+
+
+def _full_scans(conn, statement, params):
+    plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params).all()
+    return [
+        row[-1]
+        for row in plan
+        if row[-1].startswith("SCAN ")
+        and row[-1].split()[1] in Base.metadata.tables
+        and not any(allowed in row[-1] for allowed in _ALLOWED_SCANS)
+    ]
+
+
+def _seed(client, auth_headers):
+    roadmap_ids = []
+    for i in range(3):
+        resp = client.post(
+            "/roadmaps/",
+            json={"title": f"Roadmap {i}", "tags": ["backend", f"t{i}"]},
+            headers=auth_headers,
+        )
+        assert resp.status_code == status.HTTP_201_CREATED
+        roadmap_ids.append(resp.json()["id"])
+        for day in (2, 5):
+            client.post(
+                "/milestones/",
+                json={
+                    "title": f"Milestone {i}-{day}",
+                    "due_at": (date.today() + timedelta(days=day)).isoformat(),
+                    "roadmap_id": roadmap_ids[-1],
+                },
+                headers=auth_headers,
+            )
+    return roadmap_ids
+
+
+def test_hot_queries_use_indexes(client, auth_headers, db_session):
+    roadmap_ids = _seed(client, auth_headers)
+    milestone_id = client.get("/milestones/", headers=auth_headers).json()[0]["id"]
+    engine = db_session.get_bind()
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            statements.append((statement, parameters))
+
+    urls = [
+        "/roadmaps/?limit=2",
+        "/roadmaps/?tag=backend&is_archived=false",
+        "/roadmaps/?tags=backend&tags=t1&tags_match=all",
+        "/roadmaps/?q=roadmap",
+        "/roadmaps/?include=stats",
+        f"/roadmaps/{roadmap_ids[0]}",
+        f"/roadmaps/{roadmap_ids[0]}?include=stats",
+        f"/roadmaps/{roadmap_ids[0]}/export?format=csv",
+        "/roadmaps/export",
+        "/milestones/?limit=2",
+        f"/milestones/?roadmap_id={roadmap_ids[1]}&status=planned",
+        f"/milestones/{milestone_id}",
+        "/stats/",
+        "/search/?q=milestone",
+    ]
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        for url in urls:
+            resp = client.get(url, headers=auth_headers)
+            assert resp.status_code == status.HTTP_200_OK, url
+            # вторая страница — запрос с keyset-условием
+            cursor = resp.headers.get("X-Next-Cursor")
+            if cursor:
+                resp = client.get(f"{url}&cursor={cursor}", headers=auth_headers)
+                assert resp.status_code == status.HTTP_200_OK, url
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert statements
+    with engine.connect() as conn:
+        offenders = {
+            " ".join(statement.split()): scans
+            for statement, params in statements
+            if (scans := _full_scans(conn, statement, params))
+        }
+    assert offenders == {}
+
+
+def test_roadmap_stats_use_covering_index(client, auth_headers, db_session):
+    # Сводка по roadmap (include=stats): due_at и status читаются из индекса
+    _seed(client, auth_headers)
+    engine = db_session.get_bind()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "milestone_stats" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        resp = client.get("/roadmaps/?include=stats", headers=auth_headers)
+        assert resp.status_code == status.HTTP_200_OK
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    ((statement, params),) = statements
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params).all()
+    details = [row[-1] for row in plan]
+    assert any(
+        "COVERING INDEX ix_milestones_roadmap_due_status" in detail
+        for detail in details
+    ), details
@@ -0,0 +1,103 @@
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.routing import ReplicaSet, RoutingSession, reads_from_replica
+from app.db.session import get_db
+from app.models.roadmap import Roadmap
+from app.models.user import User
+
+
+@pytest.fixture()
+def replica_engine(tmp_path, test_user):
+    # Вторая SQLite-база вместо реплики; репликацию пользователя делаем руками
+    engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User).values(
+                id=test_user.id,
+                email=test_user.email,
+                hashed_password=test_user.hashed_password,
+                is_active=True,
+            )
+        )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def replica_client(app, db_session, replica_engine):
+    RoutingSessionLocal = sessionmaker(
+        class_=RoutingSession,
+        bind=db_session.get_bind(),
+        autoflush=False,
+        replicas=ReplicaSet([replica_engine]),
+    )
+
+    def override_get_db(request: Request):
+        db = RoutingSessionLocal(use_replicas=reads_from_replica(request))
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def test_get_reads_from_replica_and_writes_go_to_primary(
+    replica_client, auth_headers, db_session, replica_engine
+):
+    resp = replica_client.post(
+        "/roadmaps/", json={"title": "Primary only", "tags": []}, headers=auth_headers
+    )
+    assert resp.status_code == status.HTTP_201_CREATED
+    roadmap_id = resp.json()["id"]
+    assert db_session.get(Roadmap, roadmap_id) is not None
+
+    # Реплика «отстаёт»: GET её и читает
+    assert replica_client.get("/roadmaps/", headers=auth_headers).json() == []
+    resp = replica_client.get(f"/roadmaps/{roadmap_id}", headers=auth_headers)
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_reads_after_write_stay_on_primary(db_session, replica_engine, test_user):
+    primary = db_session.get_bind()
+    session = RoutingSession(
+        bind=primary, replicas=ReplicaSet([replica_engine]), use_replicas=True
+    )
+    assert session.get_bind() is replica_engine
+
+    session.add(Roadmap(title="RM", owner_id=test_user.id))
+    session.flush()
+    assert session.get_bind() is primary
+    assert session.execute(select(Roadmap.title)).scalars().all() == ["RM"]
+    session.rollback()
+    session.close()
+
+
+def test_replicas_are_used_round_robin(tmp_path):
+    engines = [create_engine(f"sqlite:///{tmp_path / f'r{i}.db'}") for i in range(2)]
+    replicas = ReplicaSet(engines)
+    primary = create_engine("sqlite://")
+    binds = [
+        RoutingSession(bind=primary, replicas=replicas, use_replicas=True).get_bind()
+        for _ in range(4)
+    ]
+    assert binds == engines * 2
+    # Без реплик и для записи — primary
+    assert RoutingSession(bind=primary, replicas=ReplicaSet()).get_bind() is primary
+
+
+def test_stats_rebuild_reads_primary(replica_client, auth_headers):
+    replica_client.post(
+        "/roadmaps/", json={"title": "RM", "tags": []}, headers=auth_headers
+    )
+
+    # Строка счётчиков строится по primary, а не по отстающей реплике
+    resp = replica_client.get("/stats/", headers=auth_headers)
+    assert resp.json()["total_roadmaps"] == 1
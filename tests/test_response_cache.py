@@ -0,0 +1,135 @@
+import time
+
+from fastapi import status
+
+import app.api.response_cache as response_cache_module
+from app.api.response_cache import ResponseCache
+from app.core.cache import RedisBackend
+from app.core.security import create_access_token, get_password_hash
+from app.models.roadmap import Roadmap
+from app.models.user import User
+
+
+class FakeRedis:
+    """mget/set(ex, nx) поверх dict — достаточно для RedisBackend."""
+
+    def __init__(self):
+        self.data = {}
+
+    def _alive(self, key):
+        item = self.data.get(key)
+        if item is None or item[0] < time.monotonic():
+            return None
+        return item[1]
+
+    def mget(self, keys):
+        return [self._alive(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and self._alive(key) is not None:
+            return None
+        self.data[key] = (time.monotonic() + (ex or 3600), value)
+        return True
+
+
+def _create_roadmap(client, auth_headers, title):
+    resp = client.post("/roadmaps/", json={"title": title}, headers=auth_headers)
+    assert resp.status_code == status.HTTP_201_CREATED
+    return resp.json()["id"]
+
+
+def test_list_is_cached_until_write(client, auth_headers, db_session):
+    _create_roadmap(client, auth_headers, "First")
+
+    url = "/roadmaps/?limit=5&is_archived=false"
+    first = client.get(url, headers=auth_headers)
+    assert first.headers["X-Cache"] == "MISS"
+    # Порядок query-параметров не влияет на ключ
+    second = client.get("/roadmaps/?is_archived=false&limit=5", headers=auth_headers)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+    # If-None-Match на попадании — 304 без обработчика
+    resp = client.get(
+        url,
+        headers={**auth_headers, "If-None-Match": first.headers["ETag"]},
+    )
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+    assert resp.headers["X-Cache"] == "HIT"
+
+    # Запись через API сбрасывает кэш пользователя
+    _create_roadmap(client, auth_headers, "Second")
+    resp = client.get(url, headers=auth_headers)
+    assert resp.headers["X-Cache"] == "MISS"
+    assert [r["title"] for r in resp.json()] == ["Second", "First"]
+
+    # ...и коммит любой ORM-сессии тоже
+    roadmap = db_session.query(Roadmap).filter(Roadmap.title == "First").one()
+    roadmap.title = "Renamed"
+    db_session.commit()
+    resp = client.get(url, headers=auth_headers)
+    assert resp.headers["X-Cache"] == "MISS"
+    assert [r["title"] for r in resp.json()] == ["Second", "Renamed"]
+
+    # Другие параметры — другая запись
+    resp = client.get("/roadmaps/?limit=1", headers=auth_headers)
+    assert resp.headers["X-Cache"] == "MISS"
+
+
+def test_cache_is_per_user(client, auth_headers, db_session):
+    _create_roadmap(client, auth_headers, "Mine")
+    other = User(
+        email="other@example.com",
+        hashed_password=get_password_hash("password"),
+        is_active=True,
+    )
+    db_session.add(other)
+    db_session.commit()
+    other_headers = {"Authorization": f"Bearer {create_access_token(subject=other.id)}"}
+
+    assert client.get("/stats/", headers=auth_headers).json()["total_roadmaps"] == 1
+    assert client.get("/stats/", headers=auth_headers).headers["X-Cache"] == "HIT"
+
+    resp = client.get("/stats/", headers=other_headers)
+    assert resp.headers["X-Cache"] == "MISS"
+    assert resp.json()["total_roadmaps"] == 0
+
+    # Без токена кэш не участвует
+    resp = client.get("/stats/")
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+    assert "X-Cache" not in resp.headers
+
+
+def test_export_and_redis_backend(client, auth_headers, monkeypatch):
+    cache = ResponseCache(RedisBackend(FakeRedis()), ttl=30, max_body_bytes=4096)
+    monkeypatch.setattr(response_cache_module, "response_cache", cache)
+    roadmap_id = _create_roadmap(client, auth_headers, "Export me")
+    url = f"/roadmaps/{roadmap_id}/export?format=csv"
+
+    first = client.get(url, headers=auth_headers)
+    second = client.get(url, headers=auth_headers)
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert second.content == first.content
+    assert second.headers["content-type"] == first.headers["content-type"]
+
+    client.post(
+        "/milestones/",
+        json={"title": "M1", "due_at": "2030-01-01", "roadmap_id": roadmap_id},
+        headers=auth_headers,
+    )
+    resp = client.get(url, headers=auth_headers)
+    assert resp.headers["X-Cache"] == "MISS"
+    assert b"M1" in resp.content
+
+    # Тело больше лимита не сохраняется
+    cache.max_body_bytes = 10
+    client.get("/roadmaps/export", headers=auth_headers)
+    resp = client.get("/roadmaps/export", headers=auth_headers)
+    assert resp.headers["X-Cache"] == "MISS"
+
+    metrics = client.get("/metrics/response-cache").json()
+    assert metrics["backend"] == "RedisBackend"
+    assert metrics["hits"] == 1
+    assert metrics["skipped_too_large"] == 2
+    assert metrics["invalidations"] >= 2
@@ -14,9 +14,9 @@ def test_create_and_get_roadmap(client, auth_headers):
     assert resp.status_code == status.HTTP_201_CREATED
     roadmap = resp.json()
     assert roadmap["title"] == "My Roadmap"
-    assert set(roadmap["tags"]) == {"python", "backend"} or set(
+    assert set(roadmap["tags"]) == {"python", "backend"} or {
         t.lower() for t in roadmap["tags"]
-    ) == {"python", "backend"}
+    } == {"python", "backend"}
 
     roadmap_id = roadmap["id"]
 
@@ -44,3 +44,527 @@ def test_list_roadmaps_filter_by_tag(client, auth_headers):
     items = resp.json()
     assert len(items) == 1
     assert items[0]["title"] == "RM1"
+
+
+def test_list_roadmaps_cursor_pagination(client, auth_headers):
+    for i in range(5):
+        client.post(
+            "/roadmaps/",
+            json={"title": f"RM{i}", "description": None, "tags": []},
+            headers=auth_headers,
+        )
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/roadmaps/", params=params, headers=auth_headers)
+        assert resp.status_code == status.HTTP_200_OK
+        items = resp.json()
+        assert len(items) <= 2
+        seen.extend(item["id"] for item in items)
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+def test_list_roadmaps_invalid_cursor(client, auth_headers):
+    resp = client.get("/roadmaps/?cursor=garbage", headers=auth_headers)
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_roadmaps_tag_is_exact_match(client, auth_headers):
+    client.post(
+        "/roadmaps/",
+        json={"title": "Build", "description": None, "tags": ["build"]},
+        headers=auth_headers,
+    )
+    client.post(
+        "/roadmaps/",
+        json={"title": "UI", "description": None, "tags": ["UI"]},
+        headers=auth_headers,
+    )
+
+    resp = client.get("/roadmaps/?tag=ui", headers=auth_headers)
+    assert [item["title"] for item in resp.json()] == ["UI"]
+
+
+def test_list_roadmaps_multi_tag_all_and_any(client, auth_headers):
+    for title, tags in [("A", ["x", "y"]), ("B", ["x"]), ("C", ["z"])]:
+        client.post(
+            "/roadmaps/",
+            json={"title": title, "description": None, "tags": tags},
+            headers=auth_headers,
+        )
+
+    resp = client.get("/roadmaps/?tags=x&tags=y", headers=auth_headers)
+    assert {item["title"] for item in resp.json()} == {"A"}
+
+    resp = client.get("/roadmaps/?tags=y&tags=z&tags_match=any", headers=auth_headers)
+    assert {item["title"] for item in resp.json()} == {"A", "C"}
+
+
+def test_update_roadmap_resyncs_tags(client, auth_headers):
+    resp = client.post(
+        "/roadmaps/",
+        json={"title": "RM", "description": None, "tags": ["old"]},
+        headers=auth_headers,
+    )
+    roadmap_id = resp.json()["id"]
+
+    client.put(f"/roadmaps/{roadmap_id}", json={"tags": ["new"]}, headers=auth_headers)
+
+    assert client.get("/roadmaps/?tag=old", headers=auth_headers).json() == []
+    assert len(client.get("/roadmaps/?tag=new", headers=auth_headers).json()) == 1
+
+
+def test_update_roadmap_rejects_long_tag(client, auth_headers):
+    resp = client.post(
+        "/roadmaps/", json={"title": "RM", "tags": ["ok"]}, headers=auth_headers
+    )
+    roadmap_id = resp.json()["id"]
+
+    resp = client.put(
+        f"/roadmaps/{roadmap_id}", json={"tags": ["x" * 51]}, headers=auth_headers
+    )
+    assert resp.status_code == 422
+    assert client.get(f"/roadmaps/{roadmap_id}", headers=auth_headers).json()[
+        "tags"
+    ] == ["ok"]
+
+
+def test_roadmap_projection_leaves_session_clean(client, auth_headers, db_session):
+    from app.api.projections import ROADMAP_VIEW_COLUMNS, roadmap_views
+    from app.models.roadmap import Roadmap
+
+    resp = client.post(
+        "/roadmaps/", json={"title": "RM", "tags": ["B", "a"]}, headers=auth_headers
+    )
+    assert resp.json()["tags"] == ["a", "b"]
+    roadmap_id = resp.json()["id"]
+    resp = client.put(
+        f"/roadmaps/{roadmap_id}", json={"title": "RM2"}, headers=auth_headers
+    )
+    assert resp.json()["tags"] == ["a", "b"]
+    assert client.get(f"/roadmaps/{roadmap_id}", headers=auth_headers).json()[
+        "tags"
+    ] == ["a", "b"]
+
+    loaded = len(db_session.identity_map)
+    views = roadmap_views(db_session.query(*ROADMAP_VIEW_COLUMNS))
+    assert [view.tags for view in views] == [["a", "b"]]
+    # Колонки, а не сущности: в сессии не прибавилось ни объектов, ни изменений
+    assert len(db_session.identity_map) == loaded
+    assert not db_session.dirty
+    assert db_session.get(Roadmap, roadmap_id).tags == "a,b"
+
+
+def test_backfill_roadmap_tags(db_session, test_user):
+    from app.db.migrations import backfill_roadmap_tags
+    from app.models.roadmap import Roadmap
+    from app.models.roadmap_tag import RoadmapTag
+
+    db_session.add(Roadmap(title="Legacy", tags="a,b", owner_id=test_user.id))
+    db_session.commit()
+
+    engine = db_session.get_bind()
+    assert backfill_roadmap_tags(engine) == 2
+    assert backfill_roadmap_tags(engine) == 0
+    assert {row.tag for row in db_session.query(RoadmapTag).all()} == {"a", "b"}
+
+
+def _roadmap_with_milestones(client, auth_headers, count):
+    from datetime import date, timedelta
+
+    resp = client.post(
+        "/roadmaps/",
+        json={"title": "Export RM", "description": "d", "tags": ["b", "a"]},
+        headers=auth_headers,
+    )
+    roadmap_id = resp.json()["id"]
+    for i in range(count):
+        client.post(
+            "/milestones/",
+            json={
+                "title": f"MS{i}",
+                "due_at": (date.today() + timedelta(days=1)).isoformat(),
+                "sort_order": count - i,
+                "roadmap_id": roadmap_id,
+            },
+            headers=auth_headers,
+        )
+    return roadmap_id
+
+
+def test_export_roadmap_json(client, auth_headers):
+    roadmap_id = _roadmap_with_milestones(client, auth_headers, 3)
+
+    resp = client.get(
+        f"/roadmaps/{roadmap_id}/export?format=json", headers=auth_headers
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    data = resp.json()
+    assert data["roadmap"]["tags"] == ["a", "b"]
+    assert [m["title"] for m in data["milestones"]] == ["MS2", "MS1", "MS0"]
+    assert data["milestones"][0]["status"] == "planned"
+
+
+def test_export_roadmap_json_without_milestones(client, auth_headers):
+    roadmap_id = _roadmap_with_milestones(client, auth_headers, 0)
+
+    resp = client.get(f"/roadmaps/{roadmap_id}/export", headers=auth_headers)
+    assert resp.json()["milestones"] == []
+
+
+def test_export_roadmap_csv_and_ndjson(client, auth_headers):
+    import json
+
+    roadmap_id = _roadmap_with_milestones(client, auth_headers, 2)
+
+    resp = client.get(f"/roadmaps/{roadmap_id}/export?format=csv", headers=auth_headers)
+    assert resp.headers["content-type"].startswith("text/csv")
+    lines = resp.text.strip().splitlines()
+    assert lines[0].startswith("roadmap_id,roadmap_title,milestone_id")
+    assert len(lines) == 3
+
+    resp = client.get(
+        f"/roadmaps/{roadmap_id}/export?format=ndjson", headers=auth_headers
+    )
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["type"] for r in records] == ["roadmap", "milestone", "milestone"]
+    assert records[0]["id"] == roadmap_id
+
+
+def test_export_roadmap_of_other_user_is_404(client, auth_headers):
+    resp = client.get("/roadmaps/999/export", headers=auth_headers)
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_export_all_roadmaps_gzip_ndjson(client, auth_headers):
+    import gzip
+    import json
+
+    first = _roadmap_with_milestones(client, auth_headers, 2)
+    second = _roadmap_with_milestones(client, auth_headers, 0)
+    third = _roadmap_with_milestones(client, auth_headers, 1)
+
+    resp = client.get("/roadmaps/export", headers=auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.headers["content-type"] == "application/gzip"
+    records = [json.loads(line) for line in gzip.decompress(resp.content).splitlines()]
+    assert [(r["type"], r.get("roadmap_id", r["id"])) for r in records] == [
+        ("roadmap", first),
+        ("milestone", first),
+        ("milestone", first),
+        ("roadmap", second),
+        ("roadmap", third),
+        ("milestone", third),
+    ]
+
+
+def test_export_all_roadmaps_zip(client, auth_headers):
+    import io
+    import zipfile
+
+    first = _roadmap_with_milestones(client, auth_headers, 2)
+    second = _roadmap_with_milestones(client, auth_headers, 1)
+
+    resp = client.get("/roadmaps/export?format=zip", headers=auth_headers)
+    assert resp.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(resp.content))
+    assert archive.namelist() == [f"roadmap_{first}.csv", f"roadmap_{second}.csv"]
+    assert len(archive.read(f"roadmap_{first}.csv").decode().splitlines()) == 3
+
+
+def test_delete_roadmap_removes_milestones_in_bulk(client, auth_headers):
+    from datetime import date, timedelta
+
+    # query_budget(11) в режиме raise: milestones удаляются не по одному
+    roadmap_id = client.post(
+        "/roadmaps/", json={"title": "Launch", "tags": ["a"]}, headers=auth_headers
+    ).json()["id"]
+    due = (date.today() + timedelta(days=2)).isoformat()
+    client.post(
+        "/milestones/batch",
+        json={
+            "items": [
+                {"title": f"Launch {i}", "due_at": due, "roadmap_id": roadmap_id}
+                for i in range(40)
+            ]
+        },
+        headers=auth_headers,
+    )
+
+    resp = client.delete(f"/roadmaps/{roadmap_id}", headers=auth_headers)
+    assert resp.status_code == status.HTTP_204_NO_CONTENT
+
+    stats = client.get("/stats/", headers=auth_headers).json()
+    assert stats["total_roadmaps"] == 0
+    assert stats["total_milestones"] == 0
+    assert stats["milestones_by_status"]["planned"] == 0
+    assert client.get("/search/?q=launch", headers=auth_headers).json() == []
+
+
+def test_import_roundtrip_json_csv_ndjson(client, auth_headers):
+    roadmap_id = _roadmap_with_milestones(client, auth_headers, 3)
+
+    for fmt in ("json", "csv", "ndjson"):
+        exported = client.get(
+            f"/roadmaps/{roadmap_id}/export?format={fmt}", headers=auth_headers
+        ).content
+        resp = client.post(
+            "/roadmaps/import",
+            files={"file": (f"roadmap.{fmt}", exported)},
+            headers=auth_headers,
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        report = resp.json()
+        assert report["format"] == fmt
+        assert report["roadmaps_created"] == 1
+        assert report["milestones_created"] == 3
+        assert report["failed"] == 0
+
+    stats = client.get("/stats/", headers=auth_headers).json()
+    assert stats["total_roadmaps"] == 4
+    assert stats["total_milestones"] == 12
+
+
+def test_import_bulk_export_archive(client, auth_headers):
+    _roadmap_with_milestones(client, auth_headers, 2)
+    _roadmap_with_milestones(client, auth_headers, 1)
+    archive = client.get("/roadmaps/export", headers=auth_headers).content
+
+    resp = client.post(
+        "/roadmaps/import",
+        files={"file": ("roadmaps.ndjson.gz", archive)},
+        headers=auth_headers,
+    )
+    report = resp.json()
+    assert report["roadmaps_created"] == 2
+    assert report["milestones_created"] == 3
+
+
+def test_import_reports_row_errors(client, auth_headers):
+    from datetime import date, timedelta
+
+    future = (date.today() + timedelta(days=3)).isoformat()
+    past = (date.today() - timedelta(days=3)).isoformat()
+    lines = [
+        '{"type": "roadmap", "id": 1, "title": "Imported"}',
+        f'{{"type": "milestone", "title": "ok", "due_at": "{future}"}}',
+        f'{{"type": "milestone", "title": "old", "due_at": "{past}"}}',
+        (
+            f'{{"type": "milestone", "roadmap_id": 42, "title": "orphan", '
+            f'"due_at": "{future}"}}'
+        ),
+        "not json",
+        f'{{"type": "milestone", "title": "never read", "due_at": "{future}"}}',
+    ]
+    resp = client.post(
+        "/roadmaps/import?format=ndjson",
+        files={"file": ("upload", "\n".join(lines))},
+        headers=auth_headers,
+    )
+    report = resp.json()
+    assert report["milestones_created"] == 1
+    assert report["failed"] == 3
+    assert report["aborted"] is True
+    assert [e["position"] for e in report["errors"]] == ["line 3", "line 4", "line 5"]
+
+
+def test_import_inserts_milestones_in_chunks(client, auth_headers, monkeypatch):
+    import json
+    from datetime import date, timedelta
+
+    monkeypatch.setattr("app.api.routes.roadmaps.IMPORT_CHUNK_SIZE", 4)
+    due = (date.today() + timedelta(days=3)).isoformat()
+    lines = [json.dumps({"type": "roadmap", "id": 1, "title": "Imported"})] + [
+        json.dumps({"type": "milestone", "title": f"Launch {i}", "due_at": due})
+        for i in range(10)
+    ]
+    resp = client.post(
+        "/roadmaps/import?format=ndjson",
+        files={"file": ("upload", "\n".join(lines))},
+        headers=auth_headers,
+    )
+    assert resp.json()["milestones_created"] == 10
+
+    # bulk insert идёт в обход ORM-событий: счётчики и индекс обновлены вручную
+    stats = client.get("/stats/", headers=auth_headers).json()
+    assert stats["total_milestones"] == 10
+    assert stats["milestones_by_status"]["planned"] == 10
+    hits = client.get("/search/?q=launch&kind=milestone", headers=auth_headers)
+    assert len(hits.json()) == 10
+
+
+def test_import_json_value_too_large(client, auth_headers, monkeypatch):
+    monkeypatch.setattr("app.api.importing._MAX_VALUE_SIZE", 1024)
+    document = '{"roadmap": {"id": 1, "title": "Imported"}, "milestones": [{"title": "'
+    document += "x" * 200_000
+
+    resp = client.post(
+        "/roadmaps/import?format=json",
+        files={"file": ("upload", document)},
+        headers=auth_headers,
+    )
+    report = resp.json()
+    assert report["roadmaps_created"] == 1
+    assert report["aborted"] is True
+    assert report["errors"] == [
+        {"position": "milestones[0]", "error": "JSON value is too large"}
+    ]
+
+
+def test_import_ndjson_line_too_large(client, auth_headers, monkeypatch):
+    monkeypatch.setattr("app.api.importing._MAX_VALUE_SIZE", 1024)
+    document = '{"type": "roadmap", "id": 1, "title": "Imported"}\n'
+    document += '{"type": "milestone", "title": "' + "x" * 200_000
+
+    resp = client.post(
+        "/roadmaps/import?format=ndjson",
+        files={"file": ("upload", document)},
+        headers=auth_headers,
+    )
+    report = resp.json()
+    assert report["roadmaps_created"] == 1
+    assert report["aborted"] is True
+    assert report["errors"] == [{"position": "line 2", "error": "Line is too large"}]
+
+
+def test_import_unknown_format(client, auth_headers):
+    resp = client.post(
+        "/roadmaps/import",
+        files={"file": ("roadmap.txt", b"whatever")},
+        headers=auth_headers,
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_roadmaps_include_milestones_and_stats(client, auth_headers):
+    from datetime import date, timedelta
+
+    ids = [_roadmap_with_milestones(client, auth_headers, n) for n in (0, 1, 3, 3, 3)]
+    resp = client.get(f"/milestones/?roadmap_id={ids[-1]}", headers=auth_headers)
+    done_id = resp.json()[0]["id"]
+    client.put(f"/milestones/{done_id}", json={"status": "done"}, headers=auth_headers)
+
+    # Без include ответ прежний
+    plain = client.get("/roadmaps/", headers=auth_headers).json()
+    assert "milestones" not in plain[0] and "stats" not in plain[0]
+
+    # Пять roadmaps, но число запросов постоянно (query_budget в режиме raise)
+    resp = client.get(
+        "/roadmaps/?include=milestones,stats&milestones_limit=2", headers=auth_headers
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    by_id = {item["id"]: item for item in resp.json()}
+    assert by_id[ids[0]]["milestones"] == []
+    assert by_id[ids[0]]["stats"]["total_milestones"] == 0
+    last = by_id[ids[-1]]
+    # Первые по sort_order, не больше milestones_limit; полный счёт — в stats
+    assert [m["title"] for m in last["milestones"]] == ["MS2", "MS1"]
+    assert last["stats"] == {
+        "total_milestones": 3,
+        "milestones_by_status": {
+            "planned": 2,
+            "in_progress": 0,
+            "done": 1,
+            "cancelled": 0,
+        },
+        "overdue_milestones": 0,
+        "next_due_at": (date.today() + timedelta(days=1)).isoformat(),
+    }
+
+
+def test_get_roadmap_include_milestones(client, auth_headers):
+    roadmap_id = _roadmap_with_milestones(client, auth_headers, 2)
+    url = f"/roadmaps/{roadmap_id}?include=milestones"
+
+    resp = client.get(url, headers=auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    assert [m["title"] for m in resp.json()["milestones"]] == ["MS1", "MS0"]
+    assert "stats" not in resp.json()
+    etag = resp.headers["ETag"]
+    assert (
+        client.get(f"/roadmaps/{roadmap_id}", headers=auth_headers).headers["ETag"]
+        != etag
+    )
+
+    # Новый milestone меняет ответ со включением, хотя roadmap не менялся
+    assert (
+        client.get(url, headers={**auth_headers, "If-None-Match": etag}).status_code
+        == status.HTTP_304_NOT_MODIFIED
+    )
+    milestone_id = resp.json()["milestones"][0]["id"]
+    client.put(f"/milestones/{milestone_id}", json={"title": "X"}, headers=auth_headers)
+    resp = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()["milestones"][0]["title"] == "X"
+
+    resp = client.get(f"/roadmaps/{roadmap_id}?include=owner", headers=auth_headers)
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_roadmap_stats_progress_rollup(client, auth_headers, db_session, test_user):
+    from datetime import date, timedelta
+
+    from app.models.milestone import Milestone, MilestoneStatus
+    from app.models.roadmap import Roadmap
+
+    today = date.today()
+    roadmap = Roadmap(title="Progress", owner_id=test_user.id)
+    # Через API дедлайн в прошлом не создать — пишем напрямую
+    roadmap.milestones = [
+        Milestone(title="late", due_at=today - timedelta(days=3)),
+        Milestone(
+            title="late, in progress",
+            due_at=today - timedelta(days=1),
+            status=MilestoneStatus.IN_PROGRESS,
+        ),
+        Milestone(
+            title="late, done",
+            due_at=today - timedelta(days=5),
+            status=MilestoneStatus.DONE,
+        ),
+        Milestone(
+            title="late, cancelled",
+            due_at=today - timedelta(days=2),
+            status=MilestoneStatus.CANCELLED,
+        ),
+        Milestone(
+            title="soon, cancelled",
+            due_at=today + timedelta(days=1),
+            status=MilestoneStatus.CANCELLED,
+        ),
+        Milestone(title="next", due_at=today + timedelta(days=2)),
+        Milestone(title="later", due_at=today + timedelta(days=30)),
+    ]
+    db_session.add(roadmap)
+    db_session.commit()
+
+    expected = {
+        "total_milestones": 7,
+        "milestones_by_status": {
+            "planned": 3,
+            "in_progress": 1,
+            "done": 1,
+            "cancelled": 2,
+        },
+        # Просроченные — как в /stats (всё, кроме done);
+        # ближайший дедлайн — только среди незавершённых
+        "overdue_milestones": 3,
+        "next_due_at": (today + timedelta(days=2)).isoformat(),
+    }
+    (item,) = client.get("/roadmaps/?include=stats", headers=auth_headers).json()
+    assert item["stats"] == expected
+    assert "milestones" not in item
+    resp = client.get(f"/roadmaps/{roadmap.id}?include=stats", headers=auth_headers)
+    assert resp.json()["stats"] == expected
+    stats = client.get("/stats/", headers=auth_headers).json()
+    assert stats["overdue_milestones"] == expected["overdue_milestones"]
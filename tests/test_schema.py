@@ -0,0 +1,275 @@
+from datetime import date
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from fastapi.testclient import TestClient
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    inspect,
+    text,
+)
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.security import create_access_token
+from app.db import schema
+from app.db.base import utcnow
+from app.db.session import get_db
+from app.main import create_app
+from app.models import Base
+
+
+def _baseline_metadata() -> MetaData:
+    """Схема, которую строил Base.metadata.create_all до перехода на Alembic."""
+    metadata = MetaData()
+    Table(
+        "users",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("email", String(255), unique=True, index=True, nullable=False),
+        Column("hashed_password", String(255), nullable=False),
+        Column("full_name", String(255), nullable=True),
+        Column("is_active", Boolean, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+    )
+    Table(
+        "roadmaps",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column(
+            "owner_id",
+            Integer,
+            ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        Column("title", String(255), nullable=False, index=True),
+        Column("description", String, nullable=True),
+        Column("tags", String, nullable=True),
+        Column("is_archived", Boolean, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+    )
+    Table(
+        "milestones",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column(
+            "roadmap_id",
+            Integer,
+            ForeignKey("roadmaps.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        Column("title", String(255), nullable=False, index=True),
+        Column("description", String, nullable=True),
+        Column("due_at", Date, nullable=False),
+        Column(
+            "status",
+            Enum(
+                "PLANNED", "IN_PROGRESS", "DONE", "CANCELLED", name="milestone_status"
+            ),
+            nullable=False,
+        ),
+        Column("sort_order", Integer, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+    )
+    return metadata
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_migrations_match_models(engine):
+    schema.upgrade(engine)
+    schema.verify_schema(engine)
+
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn, opts={"include_object": schema.include_object, "compare_type": True}
+        )
+        assert compare_metadata(context, Base.metadata) == []
+
+    schema.downgrade(engine, "base")
+    assert set(inspect(engine).get_table_names()) == {"alembic_version"}
+
+
+def test_upgrade_database_created_before_owner_id(engine):
+    schema.upgrade(engine, "0001_baseline")
+    now = utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO users (id, email, hashed_password, is_active, created_at) "
+                "VALUES (7, 'a@example.com', 'x', 1, :now)"
+            ),
+            {"now": now},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO roadmaps (id, owner_id, title, is_archived, created_at, "
+                "updated_at) VALUES (3, 7, 'RM', 0, :now, :now)"
+            ),
+            {"now": now},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO milestones (id, roadmap_id, title, due_at, status, "
+                "sort_order, created_at, updated_at) "
+                "VALUES (5, 3, 'M', :due, 'PLANNED', 0, :now, :now)"
+            ),
+            {"now": now, "due": date.today()},
+        )
+
+    schema.upgrade(engine)
+
+    with engine.connect() as conn:
+        owner_id = conn.execute(text("SELECT owner_id FROM milestones")).scalar()
+    assert owner_id == 7
+    indexes = {ix["name"] for ix in inspect(engine).get_indexes("milestones")}
+    assert "ix_milestones_owner_due_id_status" in indexes
+    assert "ix_milestones_roadmap_due_status" in indexes
+    assert "ix_milestones_title" not in indexes
+
+
+def test_startup_refuses_unmigrated_database(engine, monkeypatch):
+    monkeypatch.setattr("app.main.engine", engine)
+    with pytest.raises(schema.SchemaVersionError), TestClient(create_app()):
+        pass
+
+    schema.upgrade(engine)
+    with TestClient(create_app()) as client:
+        assert client.get("/healthz").status_code == 200
+
+
+def test_upgrade_rebuilds_search_index_scoped_by_owner(engine):
+    from app.models import search
+
+    schema.upgrade(engine, "0004_milestone_owner_id")
+    now = utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO users (id, email, hashed_password, is_active, created_at) "
+                "VALUES (7, 'a@example.com', 'x', 1, :now)"
+            ),
+            {"now": now},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO roadmaps (id, owner_id, title, is_archived, created_at, "
+                "updated_at) VALUES (3, 7, 'Launch plan', 0, :now, :now)"
+            ),
+            {"now": now},
+        )
+
+    schema.upgrade(engine)
+
+    with engine.connect() as conn:
+        ddl = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE name = 'search_fts'")
+        ).scalar()
+    assert "owner_id UNINDEXED" not in ddl
+    with Session(engine) as db:
+        assert [hit.id for hit in search.search(db, 7, "launch")] == [3]
+        assert search.search(db, 8, "launch") == []
+
+
+def test_baseline_revision_matches_create_all_schema(engine):
+    schema.upgrade(engine, "0001_baseline")
+
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn, opts={"include_object": schema.include_object, "compare_type": True}
+        )
+        assert compare_metadata(context, _baseline_metadata()) == []
+
+
+def test_upgrade_database_created_by_create_all(engine, monkeypatch):
+    from datetime import timedelta
+
+    _baseline_metadata().create_all(engine)
+    now = utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO users (id, email, hashed_password, is_active, created_at) "
+                "VALUES (7, 'a@example.com', 'x', 1, :now)"
+            ),
+            {"now": now},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO roadmaps (id, owner_id, title, tags, is_archived, "
+                "created_at, updated_at) "
+                "VALUES (3, 7, 'Launch plan', 'python,fastapi', 0, :now, :now)"
+            ),
+            {"now": now},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO milestones (id, roadmap_id, title, due_at, status, "
+                "sort_order, created_at, updated_at) VALUES "
+                "(5, 3, 'Beta launch', :due, 'PLANNED', 0, :now, :now), "
+                "(6, 3, 'Alpha', :due, 'DONE', 1, :now, :now)"
+            ),
+            {"now": now, "due": date.today() - timedelta(days=1)},
+        )
+
+    schema.stamp(engine, "0001_baseline")
+    schema.upgrade(engine)
+    schema.verify_schema(engine)
+    with engine.connect() as conn:
+        counters = conn.execute(
+            text(
+                "SELECT total_roadmaps, total_milestones, milestones_planned "
+                "FROM user_stats WHERE user_id = 7"
+            )
+        ).one()
+    assert tuple(counters) == (1, 2, 1)
+
+    monkeypatch.setattr("app.main.engine", engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+    def override_get_db():
+        with SessionLocal() as db:
+            yield db
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_get_db
+    headers = {"Authorization": f"Bearer {create_access_token(subject=7)}"}
+    with TestClient(app) as client:
+        stats = client.get("/stats/", headers=headers).json()
+        assert stats["total_roadmaps"] == 1
+        assert stats["total_milestones"] == 2
+        assert stats["milestones_by_status"]["done"] == 1
+        assert stats["overdue_milestones"] == 1
+
+        resp = client.get("/roadmaps/?tag=fastapi", headers=headers)
+        assert [roadmap["id"] for roadmap in resp.json()] == [3]
+        hits = client.get("/search/?q=launch", headers=headers).json()
+        assert {(hit["kind"], hit["id"]) for hit in hits} == {
+            ("roadmap", 3),
+            ("milestone", 5),
+        }
+
+        resp = client.post(
+            "/roadmaps/", json={"title": "Next", "tags": ["python"]}, headers=headers
+        )
+        assert resp.status_code == 201
+        resp = client.get("/roadmaps/?tag=python", headers=headers)
+        assert len(resp.json()) == 2
+        assert client.get("/stats/", headers=headers).json()["total_roadmaps"] == 2
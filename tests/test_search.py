@@ -0,0 +1,142 @@
+from datetime import date, timedelta
+
+from fastapi import status
+
+
+def _create_roadmap(client, auth_headers, title, description=None):
+    resp = client.post(
+        "/roadmaps/",
+        json={"title": title, "description": description, "tags": []},
+        headers=auth_headers,
+    )
+    assert resp.status_code == status.HTTP_201_CREATED
+    return resp.json()["id"]
+
+
+def test_search_roadmaps_and_milestones(client, auth_headers):
+    roadmap_id = _create_roadmap(
+        client, auth_headers, "Backend platform", "Payments and billing"
+    )
+    _create_roadmap(client, auth_headers, "Mobile app")
+    client.post(
+        "/milestones/",
+        json={
+            "title": "Billing v2",
+            "description": "Migrate invoices",
+            "due_at": (date.today() + timedelta(days=5)).isoformat(),
+            "roadmap_id": roadmap_id,
+        },
+        headers=auth_headers,
+    )
+
+    resp = client.get("/search/?q=billing", headers=auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    hits = resp.json()
+    assert {(h["kind"], h["roadmap_id"]) for h in hits} == {
+        ("roadmap", roadmap_id),
+        ("milestone", roadmap_id),
+    }
+    # совпадение в заголовке ранжируется выше, чем в описании
+    assert hits[0]["kind"] == "milestone"
+
+    resp = client.get("/search/?q=bill&kind=roadmap", headers=auth_headers)
+    assert [h["id"] for h in resp.json()] == [roadmap_id]
+
+
+def test_search_index_follows_updates_and_deletes(client, auth_headers):
+    roadmap_id = _create_roadmap(client, auth_headers, "Old title")
+
+    client.put(
+        f"/roadmaps/{roadmap_id}", json={"title": "Fresh title"}, headers=auth_headers
+    )
+    assert client.get("/search/?q=old", headers=auth_headers).json() == []
+    assert len(client.get("/search/?q=fresh", headers=auth_headers).json()) == 1
+
+    client.delete(f"/roadmaps/{roadmap_id}", headers=auth_headers)
+    assert client.get("/search/?q=fresh", headers=auth_headers).json() == []
+
+
+def test_list_roadmaps_q_uses_search_index(client, auth_headers):
+    _create_roadmap(client, auth_headers, "Q1 goals", "Hiring plan")
+    _create_roadmap(client, auth_headers, "Q2 goals")
+
+    resp = client.get("/roadmaps/?q=hiring", headers=auth_headers)
+    assert [item["title"] for item in resp.json()] == ["Q1 goals"]
+
+
+def test_search_is_scoped_to_owner(client, auth_headers, db_session):
+    from app.core.security import create_access_token
+    from app.models.user import User
+
+    _create_roadmap(client, auth_headers, "Secret roadmap")
+
+    other = User(email="other@example.com", hashed_password="x", is_active=True)
+    db_session.add(other)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(subject=other.id)}"}
+
+    assert client.get("/search/?q=secret", headers=headers).json() == []
+
+
+def test_search_index_follows_owner_change(client, auth_headers, db_session):
+    from app.core.security import create_access_token
+    from app.models.milestone import Milestone
+    from app.models.roadmap import Roadmap
+    from app.models.user import User
+
+    roadmap_id = _create_roadmap(client, auth_headers, "Handover roadmap")
+    client.post(
+        "/milestones/",
+        json={
+            "title": "Handover milestone",
+            "due_at": (date.today() + timedelta(days=5)).isoformat(),
+            "roadmap_id": roadmap_id,
+        },
+        headers=auth_headers,
+    )
+    kept_id = _create_roadmap(client, auth_headers, "Kept roadmap")
+
+    other = User(email="other@example.com", hashed_password="x", is_active=True)
+    db_session.add(other)
+    db_session.commit()
+    other_headers = {"Authorization": f"Bearer {create_access_token(subject=other.id)}"}
+
+    db_session.get(Roadmap, roadmap_id).owner_id = other.id
+    db_session.commit()
+
+    def kinds(headers):
+        hits = client.get("/search/?q=handover", headers=headers).json()
+        return sorted(h["kind"] for h in hits)
+
+    assert kinds(auth_headers) == []
+    assert kinds(other_headers) == ["milestone", "roadmap"]
+
+    # milestone, перенесённый в roadmap другого владельца, уходит вместе с ним
+    milestone = db_session.query(Milestone).filter_by(roadmap_id=roadmap_id).one()
+    milestone.roadmap_id = kept_id
+    db_session.commit()
+
+    assert kinds(other_headers) == ["roadmap"]
+    assert kinds(auth_headers) == ["milestone"]
+
+
+def test_rebuild_search_index(client, auth_headers, db_session):
+    from sqlalchemy import text
+
+    from app.db.migrations import rebuild_search_index
+
+    _create_roadmap(client, auth_headers, "Reindexed roadmap")
+    engine = db_session.get_bind()
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM search_fts"))
+    assert client.get("/search/?q=reindexed", headers=auth_headers).json() == []
+
+    assert rebuild_search_index(engine) == 1
+    assert len(client.get("/search/?q=reindexed", headers=auth_headers).json()) == 1
+
+
+def test_list_roadmaps_ignores_q_without_words(client, auth_headers):
+    _create_roadmap(client, auth_headers, "Q1 goals")
+
+    resp = client.get("/roadmaps/?q=%2B%2B%21", headers=auth_headers)
+    assert [item["title"] for item in resp.json()] == ["Q1 goals"]
@@ -0,0 +1,50 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api import serialization
+from app.api.utils import tags_string_to_list
+from app.models.milestone import Milestone
+from app.models.roadmap import Roadmap
+from app.schemas.milestone import MilestoneRead
+from app.schemas.roadmap import RoadmapRead
+
+
+def _seed(client, auth_headers):
+    roadmap_id = client.post(
+        "/roadmaps/",
+        json={"title": "Платформа", "tags": ["Backend", "infra"]},
+        headers=auth_headers,
+    ).json()["id"]
+    client.post(
+        "/milestones/",
+        json={"title": "M1", "due_at": "2030-01-01", "roadmap_id": roadmap_id},
+        headers=auth_headers,
+    )
+
+
+def test_fast_path_matches_response_models(
+    client, auth_headers, db_session, monkeypatch
+):
+    _seed(client, auth_headers)
+    expected_roadmaps = []
+    for rm in db_session.query(Roadmap):
+        data = {field: getattr(rm, field) for field in RoadmapRead.__fields__}
+        data["tags"] = tags_string_to_list(data["tags"])
+        expected_roadmaps.append(jsonable_encoder(RoadmapRead(**data)))
+    assert expected_roadmaps[0]["tags"] == ["backend", "infra"]
+    expected_milestones = [
+        jsonable_encoder(MilestoneRead.from_orm(m)) for m in db_session.query(Milestone)
+    ]
+
+    # orjson и запасной stdlib json дают одинаковый результат
+    for encoder in (serialization.orjson, None):
+        monkeypatch.setattr(serialization, "orjson", encoder)
+        # новый URL на каждый проход — мимо кэша ответов
+        suffix = f"?limit={10 if encoder else 11}"
+        roadmaps = client.get("/roadmaps/" + suffix, headers=auth_headers)
+        milestones = client.get("/milestones/" + suffix, headers=auth_headers)
+        assert roadmaps.headers["content-type"] == "application/json"
+        assert "ETag" in roadmaps.headers
+        assert json.loads(roadmaps.content) == expected_roadmaps
+        assert json.loads(milestones.content) == expected_milestones
@@ -65,3 +65,149 @@ def test_stats_with_data(client, auth_headers, db_session, test_user):
     assert data["total_milestones"] == 2
     assert data["overdue_milestones"] == 1
     assert data["upcoming_milestones_7d"] == 1
+
+
+def test_stats_counters_follow_writes(client, auth_headers):
+    # Первый запрос строит строку user_stats, дальше счётчики инкрементальные
+    resp = client.get("/stats/", headers=auth_headers)
+    assert resp.json()["total_roadmaps"] == 0
+
+    rm_resp = client.post(
+        "/roadmaps/",
+        json={"title": "RM", "description": None, "tags": []},
+        headers=auth_headers,
+    )
+    roadmap_id = rm_resp.json()["id"]
+
+    ms_ids = []
+    for i in range(2):
+        resp = client.post(
+            "/milestones/",
+            json={
+                "title": f"MS{i}",
+                "due_at": (date.today() + timedelta(days=30)).isoformat(),
+                "roadmap_id": roadmap_id,
+            },
+            headers=auth_headers,
+        )
+        ms_ids.append(resp.json()["id"])
+
+    client.put(
+        f"/milestones/{ms_ids[0]}", json={"status": "done"}, headers=auth_headers
+    )
+
+    data = client.get("/stats/", headers=auth_headers).json()
+    assert data["total_roadmaps"] == 1
+    assert data["total_milestones"] == 2
+    assert data["milestones_by_status"]["planned"] == 1
+    assert data["milestones_by_status"]["done"] == 1
+
+    client.delete(f"/roadmaps/{roadmap_id}", headers=auth_headers)
+
+    data = client.get("/stats/", headers=auth_headers).json()
+    assert data["total_roadmaps"] == 0
+    assert data["total_milestones"] == 0
+    assert all(cnt == 0 for cnt in data["milestones_by_status"].values())
+
+
+def test_stats_row_created_by_first_write_counts_existing_data(
+    client, auth_headers, db_session, test_user
+):
+    from sqlalchemy import insert
+
+    from app.models.roadmap import Roadmap
+    from app.models.user_stats import UserStats
+
+    # Строка, записанная в обход событий (данные до появления user_stats)
+    with db_session.get_bind().begin() as conn:
+        conn.execute(
+            insert(Roadmap.__table__).values(owner_id=test_user.id, title="Old")
+        )
+
+    # Первая запись после этого создаёт строку пересчётом, а не теряет счётчик
+    client.post("/roadmaps/", json={"title": "New", "tags": []}, headers=auth_headers)
+    assert db_session.get(UserStats, test_user.id).total_roadmaps == 2
+
+    data = client.get("/stats/", headers=auth_headers).json()
+    assert data["total_roadmaps"] == 2
+
+
+def test_stats_row_created_once_for_a_multi_row_flush(db_session, test_user):
+    from app.models.milestone import Milestone, MilestoneStatus
+    from app.models.roadmap import Roadmap
+    from app.models.user_stats import UserStats
+
+    def counters():
+        db_session.expire_all()
+        stats = db_session.get(UserStats, test_user.id)
+        return stats.total_roadmaps, stats.total_milestones, stats.milestones_planned
+
+    # Строки счётчиков нет, в одном flush несколько строк пользователя
+    assert db_session.get(UserStats, test_user.id) is None
+    db_session.add_all(
+        [
+            Roadmap(title="A", owner_id=test_user.id),
+            Roadmap(title="B", owner_id=test_user.id),
+        ]
+    )
+    db_session.commit()
+    assert counters() == (2, 0, 0)
+
+    roadmap = Roadmap(
+        title="C",
+        owner_id=test_user.id,
+        milestones=[
+            Milestone(title=str(i), due_at=date.today(), status=MilestoneStatus.PLANNED)
+            for i in range(3)
+        ],
+    )
+    db_session.add(roadmap)
+    db_session.commit()
+    assert counters() == (3, 3, 3)
+
+    db_session.query(UserStats).delete()
+    db_session.commit()
+    db_session.delete(roadmap)
+    db_session.commit()
+    assert counters() == (2, 0, 0)
+
+
+def test_stats_follow_roadmap_owner_change(client, auth_headers, db_session, test_user):
+    from app.core.security import create_access_token
+    from app.models.roadmap import Roadmap
+    from app.models.user import User
+
+    roadmap_id = client.post(
+        "/roadmaps/", json={"title": "RM", "tags": []}, headers=auth_headers
+    ).json()["id"]
+    for status_ in ("planned", "done"):
+        client.post(
+            "/milestones/",
+            json={
+                "title": status_,
+                "due_at": (date.today() + timedelta(days=3)).isoformat(),
+                "status": status_,
+                "roadmap_id": roadmap_id,
+            },
+            headers=auth_headers,
+        )
+    other = User(email="other@example.com", hashed_password="x", is_active=True)
+    db_session.add(other)
+    db_session.commit()
+    other_headers = {"Authorization": f"Bearer {create_access_token(subject=other.id)}"}
+    # строки user_stats есть у обоих
+    assert client.get("/stats/", headers=other_headers).json()["total_roadmaps"] == 0
+
+    db_session.get(Roadmap, roadmap_id).owner_id = other.id
+    db_session.commit()
+
+    data = client.get("/stats/", headers=auth_headers).json()
+    assert data["total_roadmaps"] == 0
+    assert data["total_milestones"] == 0
+    assert all(cnt == 0 for cnt in data["milestones_by_status"].values())
+
+    data = client.get("/stats/", headers=other_headers).json()
+    assert data["total_roadmaps"] == 1
+    assert data["total_milestones"] == 2
+    assert data["milestones_by_status"]["planned"] == 1
+    assert data["milestones_by_status"]["done"] == 1